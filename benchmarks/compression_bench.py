@@ -0,0 +1,58 @@
+"""Замер CPU/трафика для сжатия ответов на полезной нагрузке, похожей на /all_tracks.
+
+Запуск: PYTHONPATH=src python benchmarks/compression_bench.py [--rows 50000]
+"""
+import argparse
+import json
+import time
+from datetime import date, time as dtime
+
+from project.core.compression import BROTLI, GZIP, ZSTD, compress, supported_encodings
+
+
+def make_payload(rows: int) -> bytes:
+    tracks = [
+        {
+            "id": i,
+            "track_name": f"Track number {i}",
+            "release_date": date(2000 + i % 24, 1 + i % 12, 1 + i % 28).isoformat(),
+            "duration": dtime(0, 2 + i % 5, i % 60).isoformat(),
+            "artist_id": i % 977,
+            "genre_id": i % 31,
+        }
+        for i in range(rows)
+    ]
+    return json.dumps(tracks).encode()
+
+
+def bench(body: bytes, encoding: str, level: int, repeat: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress(body, encoding, level)
+    elapsed = (time.perf_counter() - started) / repeat
+    return elapsed, len(compressed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--levels", default="1,3,6,9")
+    args = parser.parse_args()
+
+    body = make_payload(args.rows)
+    print(f"payload: {len(body) / 1024 / 1024:.2f} MiB, {args.rows} rows")
+    print(f"{'encoding':<8} {'level':>5} {'ms':>9} {'MiB/s':>8} {'size KiB':>10} {'ratio':>6}")
+
+    for encoding in supported_encodings(f"{GZIP},{BROTLI},{ZSTD}"):
+        for level in (int(level) for level in args.levels.split(",")):
+            elapsed, size = bench(body, encoding, level, args.repeat)
+            throughput = len(body) / 1024 / 1024 / elapsed
+            print(
+                f"{encoding:<8} {level:>5} {elapsed * 1000:>9.1f} {throughput:>8.1f} "
+                f"{size / 1024:>10.1f} {len(body) / size:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Время холодного импорта приложения (`import main`) по данным `python -X importtime`.
+
+Каждый прогон выполняется в отдельном процессе. Скрипт печатает медиану
+и самые тяжёлые модули и завершается с кодом 1, если медиана превышает --target-ms.
+
+Запуск: python benchmarks/startup_bench.py [--runs 7] [--target-ms 700]
+(нужны переменные окружения приложения, как для uvicorn)
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def import_main() -> dict[str, tuple[int, int]]:
+    """Импортирует main в чистом процессе и возвращает {модуль: (self_us, cumulative_us)}."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR), "PYTHONDONTWRITEBYTECODE": ""}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--target-ms", type=float, default=700.0)
+    args = parser.parse_args()
+
+    runs = [import_main() for _ in range(args.runs)]
+    totals = [run["main"][1] / 1000 for run in runs]
+    median = statistics.median(totals)
+
+    print(f"import main: median {median:.1f} ms, min {min(totals):.1f} ms, max {max(totals):.1f} ms")
+    print(f"\n{'module':<60} {'self ms':>9} {'cumul ms':>9}")
+    last = runs[-1]
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{name:<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+    if median > args.target_ms:
+        print(f"\nFAIL: median {median:.1f} ms exceeds target {args.target_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
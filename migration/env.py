@@ -2,6 +2,7 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import text
 
 from alembic import context
 
@@ -21,6 +22,11 @@ if config.config_file_name is not None:
 from src.project.infrastructure.postgres.database import *
 target_metadata = Base.metadata
 
+# Схема станции: alembic -x schema=station_b upgrade head.
+# Миграции создают объекты без схемы, search_path направляет их в схему станции,
+# alembic_version у каждой станции своя.
+migration_schema = context.get_x_argument(as_dictionary=True).get("schema")
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -65,8 +71,15 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        if migration_schema:
+            quoted = connection.dialect.identifier_preparer.quote_schema(migration_schema)
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {quoted}"))
+            connection.execute(text(f"SET search_path TO {quoted}"))
+            connection.commit()
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            version_table_schema=migration_schema,
         )
 
         with context.begin_transaction():
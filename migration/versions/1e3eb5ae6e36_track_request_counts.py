@@ -0,0 +1,167 @@
+"""track request counts
+
+Revision ID: 1e3eb5ae6e36
+Revises: ef9bf10a3290
+Create Date: 2026-10-19 21:32:07.148833
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e3eb5ae6e36'
+down_revision: Union[str, None] = 'ef9bf10a3290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTER_TRIGGERS = (
+    ('insert', 'AFTER INSERT', 'NEW TABLE AS new_rows'),
+    ('delete', 'AFTER DELETE', 'OLD TABLE AS old_rows'),
+    ('update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+)
+
+# Уменьшение счётчиков перед удалением секции; %I — имя секции.
+EXPIRE_TRACKS = """
+    'UPDATE tracks AS track
+     SET requests_count = track.requests_count - expired.total, updated_at = now()
+     FROM (SELECT track_id, count(*) AS total FROM %I GROUP BY track_id) AS expired
+     WHERE track.id = expired.track_id'
+"""
+EXPIRE_SUMMARY = """
+    'UPDATE track_request_counts AS summary
+     SET requests_count = summary.requests_count - expired.total
+     FROM (SELECT track_id, count(*) AS total FROM %I GROUP BY track_id) AS expired
+     WHERE summary.track_id = expired.track_id'
+"""
+
+
+def create_drop_partitions_function(expire_sql: str) -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION drop_song_requests_partitions(keep_months integer) RETURNS integer AS $$
+        DECLARE
+            cutoff date := (date_trunc('month', current_date) - make_interval(months => keep_months))::date;
+            partition_name text;
+            dropped integer := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('song_requests_partitions'));
+
+            FOR partition_name IN
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = 'song_requests'::regclass
+                  AND child.relname ~ '^song_requests_p[0-9]{{6}}$'
+                ORDER BY child.relname
+            LOOP
+                CONTINUE WHEN to_date(right(partition_name, 6), 'YYYYMM') + interval '1 month' > cutoff;
+
+                EXECUTE format({expire_sql.strip()}, partition_name);
+                EXECUTE format('ALTER TABLE song_requests DETACH PARTITION %I', partition_name);
+                EXECUTE format('DROP TABLE %I', partition_name);
+                dropped := dropped + 1;
+            END LOOP;
+
+            RETURN dropped;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def create_counter_triggers(function_call: str) -> None:
+    for name, event, transition in COUNTER_TRIGGERS:
+        op.execute(
+            f"""
+            CREATE TRIGGER song_requests_requests_count_{name}
+            {event} ON song_requests
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION {function_call}
+            """
+        )
+
+
+def drop_counter_triggers() -> None:
+    for name, _, _ in COUNTER_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS song_requests_requests_count_{name} ON song_requests")
+
+
+def upgrade() -> None:
+    # Счётчик заявок меняется на каждую заявку. В строке трека он менял бы updated_at — версию и ETag трека —
+    # и блокировал бы строку популярного трека, поэтому он живёт в отдельной таблице.
+    op.create_table(
+        'track_request_counts',
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('requests_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('track_id'),
+    )
+    op.execute(
+        """
+        INSERT INTO track_request_counts (track_id, requests_count)
+        SELECT id, requests_count FROM tracks WHERE requests_count <> 0
+        """
+    )
+
+    # Как maintain_counter(), но строку сводной таблицы создаёт при первом изменении;
+    # ключи упорядочены, чтобы параллельные вставки блокировали строки в одном порядке.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION maintain_summary_counter() RETURNS trigger AS $$
+        DECLARE
+            summary_table text := TG_ARGV[0];
+            counter_column text := TG_ARGV[1];
+            key_column text := TG_ARGV[2];
+            deltas text;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                deltas := format('SELECT %1$I AS id, 1 AS delta FROM new_rows', key_column);
+            ELSIF TG_OP = 'DELETE' THEN
+                deltas := format('SELECT %1$I AS id, -1 AS delta FROM old_rows', key_column);
+            ELSE
+                deltas := format(
+                    'SELECT %1$I AS id, 1 AS delta FROM new_rows UNION ALL SELECT %1$I, -1 FROM old_rows',
+                    key_column
+                );
+            END IF;
+
+            EXECUTE format(
+                'INSERT INTO %1$I AS summary (%3$I, %2$I)
+                 SELECT id, delta FROM (SELECT id, sum(delta) AS delta FROM (%4$s) AS deltas
+                                        WHERE id IS NOT NULL GROUP BY id) AS change
+                 WHERE change.delta <> 0
+                 ORDER BY id
+                 ON CONFLICT (%3$I) DO UPDATE SET %2$I = summary.%2$I + excluded.%2$I',
+                summary_table, counter_column, key_column, deltas
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    drop_counter_triggers()
+    create_counter_triggers("maintain_summary_counter('track_request_counts', 'requests_count', 'track_id')")
+    create_drop_partitions_function(EXPIRE_SUMMARY)
+    op.drop_column('tracks', 'requests_count')
+
+
+def downgrade() -> None:
+    op.add_column('tracks', sa.Column('requests_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE tracks AS track
+        SET requests_count = summary.requests_count
+        FROM track_request_counts AS summary
+        WHERE track.id = summary.track_id
+        """
+    )
+    create_drop_partitions_function(EXPIRE_TRACKS)
+    drop_counter_triggers()
+    create_counter_triggers("maintain_counter('tracks', 'requests_count', 'track_id', 'touch')")
+    op.execute("DROP FUNCTION IF EXISTS maintain_summary_counter()")
+    op.drop_table('track_request_counts')
@@ -0,0 +1,44 @@
+"""foreign key indexes
+
+Revision ID: 3f37aad28715
+Revises: 38d23af776d3
+Create Date: 2026-10-19 14:21:19.664203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f37aad28715'
+down_revision: Union[str, None] = '38d23af776d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FOREIGN_KEY_COLUMNS = (
+    ('host_program_pair', 'program_id'),
+    ('host_program_pair', 'host_id'),
+    ('artists', 'genre_id'),
+    ('tracks', 'artist_id'),
+    ('tracks', 'genre_id'),
+    ('album', 'artist_id'),
+    ('album', 'track_id'),
+    ('song_requests', 'program_id'),
+    ('song_requests', 'track_id'),
+    ('playlists', 'program_id'),
+    ('playlist_and_track_pair', 'playlist_id'),
+    ('playlist_and_track_pair', 'track_id'),
+)
+
+
+def upgrade() -> None:
+    for table, column in FOREIGN_KEY_COLUMNS:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in FOREIGN_KEY_COLUMNS:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -0,0 +1,67 @@
+"""idempotency keys
+
+Revision ID: 4b79e4ebdedf
+Revises: 6d9153e87c19
+Create Date: 2026-10-19 16:27:55.140362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b79e4ebdedf'
+down_revision: Union[str, None] = '6d9153e87c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('scope', sa.String(length=100), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response', postgresql.JSONB(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_created_at'), 'idempotency_keys', ['created_at'], unique=False)
+
+    # Повторы клиентов уже успели создать дубликаты пар: оставляем самую раннюю.
+    op.execute(
+        """
+        DELETE FROM playlist_and_track_pair AS pair
+        USING playlist_and_track_pair AS kept
+        WHERE pair.playlist_id = kept.playlist_id
+          AND pair.track_id = kept.track_id
+          AND pair.id > kept.id
+        """
+    )
+    # Уникальный индекс начинается с playlist_id и заменяет отдельный индекс по нему.
+    op.drop_index(op.f('ix_playlist_and_track_pair_playlist_id'), table_name='playlist_and_track_pair')
+    op.create_unique_constraint(
+        'uq_playlist_and_track_pair_playlist_id_track_id',
+        'playlist_and_track_pair',
+        ['playlist_id', 'track_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_playlist_and_track_pair_playlist_id_track_id',
+        'playlist_and_track_pair',
+        type_='unique',
+    )
+    op.create_index(
+        op.f('ix_playlist_and_track_pair_playlist_id'),
+        'playlist_and_track_pair',
+        ['playlist_id'],
+        unique=False,
+    )
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,232 @@
+"""track neighbours
+
+Revision ID: 54f5bc800c79
+Revises: 566b0b3fc672
+Create Date: 2026-10-19 18:12:47.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '54f5bc800c79'
+down_revision: Union[str, None] = '566b0b3fc672'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (таблица, запрос корзин (program_id, day) по таблице переходов rows, запрос треков по rows или None)
+DIRTY_SOURCES = (
+    ('song_requests', 'SELECT program_id, request_date FROM {rows}', 'SELECT track_id FROM {rows}'),
+    (
+        'playlist_and_track_pair',
+        'SELECT p.program_id, p.playlist_date FROM {rows} AS pair JOIN playlists AS p ON p.id = pair.playlist_id',
+        'SELECT track_id FROM {rows}',
+    ),
+    ('playlists', 'SELECT program_id, playlist_date FROM {rows}', None),
+)
+DIRTY_TRIGGERS = (
+    ('insert', 'AFTER INSERT', 'NEW TABLE AS new_rows'),
+    ('delete', 'AFTER DELETE', 'OLD TABLE AS old_rows'),
+    ('update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'track_neighbours',
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.SmallInteger(), nullable=False),
+        sa.Column('neighbour_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['neighbour_id'], ['tracks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('track_id', 'rank'),
+    )
+    op.create_index(op.f('ix_track_neighbours_neighbour_id'), 'track_neighbours', ['neighbour_id'], unique=False)
+    op.create_table(
+        'track_neighbours_dirty',
+        sa.Column('program_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('program_id', 'day'),
+    )
+    op.create_table(
+        'track_neighbours_dirty_tracks',
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('track_id'),
+    )
+
+    # Корзина — эфир одной программы за один день: треки из её плейлистов и заявок.
+    op.execute(
+        """
+        CREATE VIEW track_baskets AS
+        SELECT p.program_id, p.playlist_date AS day, pair.track_id
+        FROM playlist_and_track_pair AS pair
+        JOIN playlists AS p ON p.id = pair.playlist_id
+        UNION
+        SELECT program_id, request_date, track_id
+        FROM song_requests
+        """
+    )
+
+    # Изменение плейлистов и заявок помечает затронутые корзины; соседей их треков
+    # пересчитывает refresh_track_neighbours(). Трек, убранный из корзины, в ней уже не найти,
+    # поэтому треки старых строк помечаются отдельно.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION mark_track_baskets_dirty() RETURNS trigger AS $$
+        DECLARE
+            baskets text := TG_ARGV[0];
+            tracks text := TG_ARGV[1];
+            changed text;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                changed := format(baskets, 'new_rows');
+            ELSIF TG_OP = 'DELETE' THEN
+                changed := format(baskets, 'old_rows');
+            ELSE
+                changed := format(baskets, 'new_rows') || ' UNION ' || format(baskets, 'old_rows');
+            END IF;
+
+            EXECUTE 'INSERT INTO track_neighbours_dirty (program_id, day) '
+                || changed
+                || ' ON CONFLICT DO NOTHING';
+
+            IF tracks IS NOT NULL AND TG_OP <> 'INSERT' THEN
+                EXECUTE 'INSERT INTO track_neighbours_dirty_tracks (track_id) '
+                    || format(tracks, 'old_rows')
+                    || ' ON CONFLICT DO NOTHING';
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table, baskets, tracks in DIRTY_SOURCES:
+        arguments = ', '.join(
+            "'" + query.replace('{rows}', '%1$I').replace("'", "''") + "'"
+            for query in (baskets, tracks) if query is not None
+        )
+        for name, event, transition in DIRTY_TRIGGERS:
+            op.execute(
+                f"""
+                CREATE TRIGGER {table}_track_baskets_{name}
+                {event} ON {table}
+                REFERENCING {transition}
+                FOR EACH STATEMENT EXECUTE FUNCTION mark_track_baskets_dirty({arguments})
+                """
+            )
+
+    # Сходство — косинусная мера по корзинам: совместные корзины / sqrt(корзины A * корзины B).
+    # Пересчитываются только треки из взятых в работу корзин и помеченные треки; rebuild пересчитывает все.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_track_neighbours(top_k integer, max_baskets integer, rebuild boolean)
+        RETURNS integer AS $$
+        DECLARE
+            dirty integer[];
+            claimed integer;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('track_neighbours'));
+
+            IF rebuild THEN
+                DELETE FROM track_neighbours_dirty;
+                GET DIAGNOSTICS claimed = ROW_COUNT;
+                DELETE FROM track_neighbours_dirty_tracks;
+                SELECT array_agg(DISTINCT track_id) INTO dirty FROM track_baskets;
+                DELETE FROM track_neighbours;
+            ELSE
+                WITH picked AS (
+                    DELETE FROM track_neighbours_dirty AS d
+                    USING (
+                        SELECT program_id, day FROM track_neighbours_dirty
+                        ORDER BY day DESC, program_id
+                        LIMIT max_baskets
+                    ) AS batch
+                    WHERE d.program_id = batch.program_id AND d.day = batch.day
+                    RETURNING d.program_id, d.day
+                ),
+                picked_tracks AS (
+                    DELETE FROM track_neighbours_dirty_tracks AS d
+                    USING (
+                        SELECT track_id FROM track_neighbours_dirty_tracks
+                        ORDER BY track_id
+                        LIMIT max_baskets
+                    ) AS batch
+                    WHERE d.track_id = batch.track_id
+                    RETURNING d.track_id
+                )
+                SELECT
+                    (SELECT count(*) FROM picked) + (SELECT count(*) FROM picked_tracks),
+                    (
+                        SELECT array_agg(DISTINCT track_id)
+                        FROM (
+                            SELECT b.track_id
+                            FROM picked
+                            JOIN track_baskets AS b ON b.program_id = picked.program_id AND b.day = picked.day
+                            UNION
+                            SELECT track_id FROM picked_tracks
+                        ) AS tracks
+                    )
+                INTO claimed, dirty;
+                DELETE FROM track_neighbours WHERE track_id = ANY(dirty);
+            END IF;
+
+            IF dirty IS NULL THEN
+                RETURN claimed;
+            END IF;
+
+            WITH together AS (
+                SELECT a.track_id, b.track_id AS neighbour_id, count(*) AS baskets
+                FROM track_baskets AS a
+                JOIN track_baskets AS b
+                  ON b.program_id = a.program_id AND b.day = a.day AND b.track_id <> a.track_id
+                WHERE a.track_id = ANY(dirty)
+                GROUP BY a.track_id, b.track_id
+            ),
+            totals AS (
+                SELECT track_id, count(*) AS baskets
+                FROM track_baskets
+                WHERE track_id IN (SELECT neighbour_id FROM together UNION SELECT track_id FROM together)
+                GROUP BY track_id
+            ),
+            ranked AS (
+                SELECT
+                    together.track_id,
+                    together.neighbour_id,
+                    together.baskets / sqrt(own.baskets::float8 * other.baskets) AS score,
+                    row_number() OVER (
+                        PARTITION BY together.track_id
+                        ORDER BY together.baskets / sqrt(own.baskets::float8 * other.baskets) DESC, together.neighbour_id
+                    ) AS rank
+                FROM together
+                JOIN totals AS own ON own.track_id = together.track_id
+                JOIN totals AS other ON other.track_id = together.neighbour_id
+            )
+            INSERT INTO track_neighbours (track_id, rank, neighbour_id, score)
+            SELECT track_id, rank, neighbour_id, score FROM ranked WHERE rank <= top_k;
+
+            RETURN claimed;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    # Существующие данные попадают в очередь и считаются первым же проходом фоновой задачи.
+    op.execute("INSERT INTO track_neighbours_dirty (program_id, day) SELECT DISTINCT program_id, day FROM track_baskets")
+
+
+def downgrade() -> None:
+    for table, _, _ in DIRTY_SOURCES:
+        for name, _, _ in DIRTY_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_track_baskets_{name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS refresh_track_neighbours(integer, integer, boolean)")
+    op.execute("DROP FUNCTION IF EXISTS mark_track_baskets_dirty()")
+    op.execute("DROP VIEW IF EXISTS track_baskets")
+    op.drop_table('track_neighbours_dirty_tracks')
+    op.drop_table('track_neighbours_dirty')
+    op.drop_index(op.f('ix_track_neighbours_neighbour_id'), table_name='track_neighbours')
+    op.drop_table('track_neighbours')
@@ -0,0 +1,49 @@
+"""playlist positions
+
+Revision ID: 566b0b3fc672
+Revises: 4b79e4ebdedf
+Create Date: 2026-10-19 17:05:31.662480
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '566b0b3fc672'
+down_revision: Union[str, None] = '4b79e4ebdedf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    op.add_column('playlist_and_track_pair', sa.Column('position', sa.BigInteger(), nullable=True))
+    # Текущий порядок неизвестен, поэтому пары нумеруются в порядке добавления.
+    op.execute(
+        f"""
+        UPDATE playlist_and_track_pair AS pair
+        SET position = ordered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY playlist_id ORDER BY id) * {POSITION_GAP} AS position
+            FROM playlist_and_track_pair
+        ) AS ordered
+        WHERE pair.id = ordered.id
+        """
+    )
+    op.alter_column('playlist_and_track_pair', 'position', nullable=False)
+    op.create_index(
+        'ix_playlist_and_track_pair_playlist_id_position',
+        'playlist_and_track_pair',
+        ['playlist_id', 'position'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_playlist_and_track_pair_playlist_id_position', table_name='playlist_and_track_pair')
+    op.drop_column('playlist_and_track_pair', 'position')
@@ -0,0 +1,26 @@
+"""playlists airtime index
+
+Revision ID: 5c84c2ef9863
+Revises: 3f37aad28715
+Create Date: 2026-10-19 16:48:02.517340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c84c2ef9863'
+down_revision: Union[str, None] = '3f37aad28715'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_playlists_playlist_date_airtime', 'playlists', ['playlist_date', 'airtime'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_playlists_playlist_date_airtime', table_name='playlists')
@@ -0,0 +1,265 @@
+"""partition song_requests
+
+Revision ID: 6d9153e87c19
+Revises: 7b20cfef07cd
+Create Date: 2026-10-19 15:48:12.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d9153e87c19'
+down_revision: Union[str, None] = '7b20cfef07cd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS_AHEAD = 3
+INDEXED_COLUMNS = ('program_id', 'track_id', 'request_date')
+COUNTER_TRIGGERS = (
+    ('insert', 'AFTER INSERT', 'NEW TABLE AS new_rows'),
+    ('delete', 'AFTER DELETE', 'OLD TABLE AS old_rows'),
+    ('update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+)
+
+
+def create_notify_function(table_name: str) -> None:
+    """notify_catalog_change() из 95972752d781 с именем таблицы из выражения table_name."""
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+        DECLARE
+            table_name text := {table_name};
+            row_data jsonb;
+            program_id integer;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_data := to_jsonb(OLD);
+            ELSE
+                row_data := to_jsonb(NEW);
+            END IF;
+
+            IF table_name = 'playlist_and_track_pair' THEN
+                SELECT p.program_id INTO program_id
+                FROM playlists p
+                WHERE p.id = (row_data ->> 'playlist_id')::integer;
+            ELSE
+                program_id := (row_data ->> 'program_id')::integer;
+            END IF;
+
+            PERFORM pg_notify(
+                'catalog_changes',
+                json_build_object(
+                    'schema', TG_TABLE_SCHEMA,
+                    'table', table_name,
+                    'op', TG_OP,
+                    'id', (row_data ->> 'id')::integer,
+                    'program_id', program_id
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def create_song_requests_triggers(notify_arguments: str) -> None:
+    op.execute(
+        f"""
+        CREATE TRIGGER song_requests_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON song_requests
+        FOR EACH ROW EXECUTE FUNCTION notify_catalog_change({notify_arguments});
+        """
+    )
+    for name, event, transition in COUNTER_TRIGGERS:
+        op.execute(
+            f"""
+            CREATE TRIGGER song_requests_requests_count_{name}
+            {event} ON song_requests
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION maintain_counter('tracks', 'requests_count', 'track_id', 'touch')
+            """
+        )
+
+
+def replace_song_requests(create_table_sql: str, table_name: str) -> None:
+    """Переливает song_requests в новую таблицу table_name и подменяет ею старую."""
+    op.execute("ALTER SEQUENCE song_requests_id_seq OWNED BY NONE")
+    op.execute(create_table_sql)
+    # Триггеров на новой таблице ещё нет: перенос строк не трогает счётчики и не шлёт уведомлений.
+    op.execute(
+        f"""
+        INSERT INTO {table_name} (id, program_id, track_id, request_time, request_date)
+        SELECT id, program_id, track_id, request_time, request_date FROM song_requests
+        """
+    )
+    op.execute("DROP TABLE song_requests")
+    op.execute(f"ALTER TABLE {table_name} RENAME TO song_requests")
+    op.execute(f"ALTER TABLE song_requests RENAME CONSTRAINT {table_name}_pkey TO song_requests_pkey")
+    for column in ('program_id', 'track_id'):
+        op.execute(
+            f"ALTER TABLE song_requests RENAME CONSTRAINT {table_name}_{column}_fkey TO song_requests_{column}_fkey"
+        )
+    op.execute("ALTER SEQUENCE song_requests_id_seq OWNED BY song_requests.id")
+
+
+def upgrade() -> None:
+    replace_song_requests(
+        """
+        CREATE TABLE song_requests_partitioned (
+            id integer NOT NULL DEFAULT nextval('song_requests_id_seq'),
+            program_id integer NOT NULL REFERENCES programs (id),
+            track_id integer NOT NULL REFERENCES tracks (id),
+            request_time time NOT NULL,
+            request_date date NOT NULL,
+            PRIMARY KEY (id, request_date)
+        ) PARTITION BY RANGE (request_date);
+
+        CREATE TABLE song_requests_default PARTITION OF song_requests_partitioned DEFAULT;
+        """,
+        'song_requests_partitioned',
+    )
+    for column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_song_requests_{column}'), 'song_requests', [column], unique=False)
+
+    # Месячные секции song_requests_pYYYYMM: с текущего месяца на months_ahead вперёд и для тех
+    # месяцев, строки которых лежат в DEFAULT-секции. Сплошной ряд от самой ранней даты не строится:
+    # одна заявка с датой из 1900 года иначе породила бы полторы тысячи секций.
+    # Строки из DEFAULT переносятся в новую секцию при её создании; DEFAULT на время
+    # переноса отсоединяется, поэтому триггеры родителя не срабатывают.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_song_requests_partitions(months_ahead integer) RETURNS integer AS $$
+        DECLARE
+            month_start date;
+            months date[];
+            first_month date := date_trunc('month', current_date)::date;
+            last_month date := (date_trunc('month', current_date) + make_interval(months => months_ahead))::date;
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('song_requests_partitions'));
+
+            -- Месяцы собираются заранее: открытый по DEFAULT курсор не дал бы её отсоединить.
+            SELECT array_agg(month ORDER BY month) INTO months
+            FROM (
+                SELECT generate_series(first_month, last_month, interval '1 month')::date AS month
+                UNION
+                SELECT DISTINCT date_trunc('month', request_date)::date FROM song_requests_default
+            ) AS wanted;
+
+            FOREACH month_start IN ARRAY months LOOP
+                partition_name := 'song_requests_p' || to_char(month_start, 'YYYYMM');
+
+                IF to_regclass(partition_name) IS NULL THEN
+                    IF EXISTS (
+                        SELECT 1 FROM song_requests_default
+                        WHERE request_date >= month_start AND request_date < month_start + interval '1 month'
+                    ) THEN
+                        ALTER TABLE song_requests DETACH PARTITION song_requests_default;
+                        EXECUTE format(
+                            'CREATE TABLE %I (LIKE song_requests INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                            partition_name
+                        );
+                        EXECUTE format(
+                            'WITH moved AS (
+                                DELETE FROM song_requests_default
+                                WHERE request_date >= $1 AND request_date < $1 + interval ''1 month''
+                                RETURNING *
+                             )
+                             INSERT INTO %I SELECT * FROM moved',
+                            partition_name
+                        ) USING month_start;
+                        EXECUTE format(
+                            'ALTER TABLE song_requests ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                            partition_name, month_start, (month_start + interval '1 month')::date
+                        );
+                        ALTER TABLE song_requests ATTACH PARTITION song_requests_default DEFAULT;
+                    ELSE
+                        EXECUTE format(
+                            'CREATE TABLE %I PARTITION OF song_requests FOR VALUES FROM (%L) TO (%L)',
+                            partition_name, month_start, (month_start + interval '1 month')::date
+                        );
+                    END IF;
+                    created := created + 1;
+                END IF;
+            END LOOP;
+
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Удаление секции не вызывает DELETE-триггеров, поэтому tracks.requests_count уменьшается здесь.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION drop_song_requests_partitions(keep_months integer) RETURNS integer AS $$
+        DECLARE
+            cutoff date := (date_trunc('month', current_date) - make_interval(months => keep_months))::date;
+            partition_name text;
+            dropped integer := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('song_requests_partitions'));
+
+            FOR partition_name IN
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = 'song_requests'::regclass
+                  AND child.relname ~ '^song_requests_p[0-9]{6}$'
+                ORDER BY child.relname
+            LOOP
+                CONTINUE WHEN to_date(right(partition_name, 6), 'YYYYMM') + interval '1 month' > cutoff;
+
+                EXECUTE format(
+                    'UPDATE tracks AS track
+                     SET requests_count = track.requests_count - expired.total, updated_at = now()
+                     FROM (SELECT track_id, count(*) AS total FROM %I GROUP BY track_id) AS expired
+                     WHERE track.id = expired.track_id',
+                    partition_name
+                );
+                EXECUTE format('ALTER TABLE song_requests DETACH PARTITION %I', partition_name);
+                EXECUTE format('DROP TABLE %I', partition_name);
+                dropped := dropped + 1;
+            END LOOP;
+
+            RETURN dropped;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(f"SELECT ensure_song_requests_partitions({PARTITIONS_AHEAD})")
+
+    # Строковый триггер клонируется на каждую секцию, и TG_TABLE_NAME в нём — имя секции,
+    # поэтому логическое имя таблицы передаётся аргументом.
+    create_notify_function("coalesce(TG_ARGV[0], TG_TABLE_NAME)")
+    create_song_requests_triggers("'song_requests'")
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS drop_song_requests_partitions(integer)")
+    op.execute("DROP FUNCTION IF EXISTS ensure_song_requests_partitions(integer)")
+
+    replace_song_requests(
+        """
+        CREATE TABLE song_requests_plain (
+            id integer NOT NULL DEFAULT nextval('song_requests_id_seq'),
+            program_id integer NOT NULL REFERENCES programs (id),
+            track_id integer NOT NULL REFERENCES tracks (id),
+            request_time time NOT NULL,
+            request_date date NOT NULL,
+            PRIMARY KEY (id)
+        )
+        """,
+        'song_requests_plain',
+    )
+    for column in ('program_id', 'track_id'):
+        op.create_index(op.f(f'ix_song_requests_{column}'), 'song_requests', [column], unique=False)
+
+    create_notify_function("TG_TABLE_NAME")
+    create_song_requests_triggers("")
@@ -0,0 +1,149 @@
+"""track listing
+
+Revision ID: 79c76cc8dfb1
+Revises: f7c944736865
+Create Date: 2026-10-19 18:40:21.614093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '79c76cc8dfb1'
+down_revision: Union[str, None] = 'f7c944736865'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LISTING_INCLUDE = (
+    'release_date', 'duration', 'artist_id', 'artist_name', 'genre_id', 'genre_name', 'album_id', 'album_name',
+)
+
+# (таблица, имя, событие, таблицы переходов, запрос id затронутых треков)
+# Удаление трека убирает строку каскадом по внешнему ключу.
+LISTING_TRIGGERS = (
+    ('tracks', 'insert', 'AFTER INSERT', 'NEW TABLE AS new_rows', 'SELECT id FROM new_rows'),
+    (
+        'tracks', 'update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        'SELECT n.id FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id '
+        'WHERE (n.track_name, n.release_date, n.duration, n.artist_id, n.genre_id) '
+        'IS DISTINCT FROM (o.track_name, o.release_date, o.duration, o.artist_id, o.genre_id)',
+    ),
+    (
+        'artists', 'update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        'SELECT t.id FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id JOIN tracks AS t ON t.artist_id = n.id '
+        'WHERE n.artist_name IS DISTINCT FROM o.artist_name',
+    ),
+    (
+        'genres', 'update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        'SELECT t.id FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id JOIN tracks AS t ON t.genre_id = n.id '
+        'WHERE n.genre_name IS DISTINCT FROM o.genre_name',
+    ),
+    ('album', 'insert', 'AFTER INSERT', 'NEW TABLE AS new_rows', 'SELECT track_id FROM new_rows'),
+    ('album', 'delete', 'AFTER DELETE', 'OLD TABLE AS old_rows', 'SELECT track_id FROM old_rows'),
+    (
+        'album', 'update', 'AFTER UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        'SELECT track_id FROM new_rows UNION SELECT track_id FROM old_rows',
+    ),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'track_listing',
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('track_name', sa.String(length=255), nullable=False),
+        sa.Column('release_date', sa.Date(), nullable=False),
+        sa.Column('duration', sa.Time(), nullable=False),
+        sa.Column('artist_id', sa.Integer(), nullable=True),
+        sa.Column('artist_name', sa.String(length=255), nullable=True),
+        sa.Column('genre_id', sa.Integer(), nullable=True),
+        sa.Column('genre_name', sa.String(length=255), nullable=True),
+        sa.Column('album_id', sa.Integer(), nullable=True),
+        sa.Column('album_name', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('track_id'),
+    )
+    # Все выбираемые колонки лежат в индексе: страница читается одним index-only проходом.
+    op.create_index(
+        'ix_track_listing_track_name_track_id',
+        'track_listing',
+        ['track_name', 'track_id'],
+        unique=False,
+        postgresql_include=list(LISTING_INCLUDE),
+    )
+
+    # У трека может быть несколько альбомов, в списке показывается первый по id.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_track_listing(track_ids integer[]) RETURNS void AS $$
+            INSERT INTO track_listing (
+                track_id, track_name, release_date, duration,
+                artist_id, artist_name, genre_id, genre_name, album_id, album_name
+            )
+            SELECT t.id, t.track_name, t.release_date, t.duration,
+                   t.artist_id, a.artist_name, t.genre_id, g.genre_name, al.id, al.album_name
+            FROM tracks AS t
+            LEFT JOIN artists AS a ON a.id = t.artist_id
+            LEFT JOIN genres AS g ON g.id = t.genre_id
+            LEFT JOIN LATERAL (
+                SELECT id, album_name FROM album WHERE album.track_id = t.id ORDER BY id LIMIT 1
+            ) AS al ON true
+            WHERE t.id = ANY(track_ids)
+            ON CONFLICT (track_id) DO UPDATE SET
+                track_name = EXCLUDED.track_name,
+                release_date = EXCLUDED.release_date,
+                duration = EXCLUDED.duration,
+                artist_id = EXCLUDED.artist_id,
+                artist_name = EXCLUDED.artist_name,
+                genre_id = EXCLUDED.genre_id,
+                genre_name = EXCLUDED.genre_name,
+                album_id = EXCLUDED.album_id,
+                album_name = EXCLUDED.album_name;
+        $$ LANGUAGE sql;
+        """
+    )
+    # Триггеры уровня оператора: импорт каталога пересобирает затронутые строки одним запросом.
+    # Обновления счётчиков в tracks сюда не доходят: запрос отбирает только изменённые колонки.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_track_listing() RETURNS trigger AS $$
+        DECLARE
+            track_ids integer[];
+        BEGIN
+            EXECUTE 'SELECT array_agg(DISTINCT id) FROM (' || TG_ARGV[0] || ') AS changed (id)' INTO track_ids;
+            IF track_ids IS NOT NULL THEN
+                PERFORM refresh_track_listing(track_ids);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table, name, event, transition, track_ids in LISTING_TRIGGERS:
+        argument = track_ids.replace("'", "''")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_track_listing_{name}
+            {event} ON {table}
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION sync_track_listing('{argument}')
+            """
+        )
+
+    op.execute("SELECT refresh_track_listing(ARRAY(SELECT id FROM tracks))")
+    # VACUUM заполняет карту видимости, без неё index-only проход читает и таблицу.
+    with op.get_context().autocommit_block():
+        op.execute("VACUUM ANALYZE track_listing")
+
+
+def downgrade() -> None:
+    for table, name, _, _, _ in LISTING_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_track_listing_{name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS sync_track_listing()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_track_listing(integer[])")
+    op.drop_index('ix_track_listing_track_name_track_id', table_name='track_listing')
+    op.drop_table('track_listing')
@@ -0,0 +1,111 @@
+"""entity counters
+
+Revision ID: 7b20cfef07cd
+Revises: 5c84c2ef9863
+Create Date: 2026-10-19 15:02:41.318027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b20cfef07cd'
+down_revision: Union[str, None] = '5c84c2ef9863'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (родительская таблица, счётчик, дочерняя таблица, внешний ключ, есть ли у родителя updated_at)
+COUNTERS = (
+    ('artists', 'tracks_count', 'tracks', 'artist_id', False),
+    ('tracks', 'requests_count', 'song_requests', 'track_id', True),
+    ('programs', 'playlists_count', 'playlists', 'program_id', True),
+)
+
+
+def upgrade() -> None:
+    for parent, counter, child, fk_column, _ in COUNTERS:
+        op.add_column(parent, sa.Column(counter, sa.Integer(), server_default='0', nullable=False))
+        op.execute(
+            f"""
+            UPDATE {parent} AS parent
+            SET {counter} = counted.total
+            FROM (SELECT {fk_column} AS id, count(*) AS total FROM {child} GROUP BY {fk_column}) AS counted
+            WHERE parent.id = counted.id
+            """
+        )
+
+    # Триггеры уровня оператора с таблицами переходов: массовое удаление (каскад)
+    # обновляет каждого родителя один раз, а не на каждую дочернюю строку.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION maintain_counter() RETURNS trigger AS $$
+        DECLARE
+            parent_table text := TG_ARGV[0];
+            counter_column text := TG_ARGV[1];
+            fk_column text := TG_ARGV[2];
+            touch text := CASE WHEN TG_ARGV[3] = 'touch' THEN ', updated_at = now()' ELSE '' END;
+            deltas text;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                deltas := format('SELECT %1$I AS id, 1 AS delta FROM new_rows', fk_column);
+            ELSIF TG_OP = 'DELETE' THEN
+                deltas := format('SELECT %1$I AS id, -1 AS delta FROM old_rows', fk_column);
+            ELSE
+                deltas := format(
+                    'SELECT %1$I AS id, 1 AS delta FROM new_rows UNION ALL SELECT %1$I, -1 FROM old_rows',
+                    fk_column
+                );
+            END IF;
+
+            EXECUTE format(
+                'UPDATE %1$I AS parent SET %2$I = parent.%2$I + change.delta%3$s
+                 FROM (SELECT id, sum(delta) AS delta FROM (%4$s) AS deltas
+                       WHERE id IS NOT NULL GROUP BY id) AS change
+                 WHERE parent.id = change.id AND change.delta <> 0',
+                parent_table, counter_column, touch, deltas
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    for parent, counter, child, fk_column, has_version in COUNTERS:
+        arguments = f"'{parent}', '{counter}', '{fk_column}', '{'touch' if has_version else 'keep'}'"
+        op.execute(
+            f"""
+            CREATE TRIGGER {child}_{counter}_insert
+            AFTER INSERT ON {child}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION maintain_counter({arguments})
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {child}_{counter}_delete
+            AFTER DELETE ON {child}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION maintain_counter({arguments})
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {child}_{counter}_update
+            AFTER UPDATE ON {child}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION maintain_counter({arguments})
+            """
+        )
+
+
+def downgrade() -> None:
+    for parent, counter, child, _, _ in COUNTERS:
+        for event in ('insert', 'delete', 'update'):
+            op.execute(f"DROP TRIGGER IF EXISTS {child}_{counter}_{event} ON {child}")
+        op.drop_column(parent, counter)
+
+    op.execute("DROP FUNCTION IF EXISTS maintain_counter()")
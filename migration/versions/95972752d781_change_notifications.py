@@ -0,0 +1,74 @@
+"""change notifications
+
+Revision ID: 95972752d781
+Revises: e9f0c98c5379
+Create Date: 2026-10-19 11:40:07.918254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '95972752d781'
+down_revision: Union[str, None] = 'e9f0c98c5379'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFIED_TABLES = ('song_requests', 'playlists', 'playlist_and_track_pair')
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+        DECLARE
+            row_data jsonb;
+            program_id integer;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_data := to_jsonb(OLD);
+            ELSE
+                row_data := to_jsonb(NEW);
+            END IF;
+
+            IF TG_TABLE_NAME = 'playlist_and_track_pair' THEN
+                SELECT p.program_id INTO program_id
+                FROM playlists p
+                WHERE p.id = (row_data ->> 'playlist_id')::integer;
+            ELSE
+                program_id := (row_data ->> 'program_id')::integer;
+            END IF;
+
+            PERFORM pg_notify(
+                'catalog_changes',
+                json_build_object(
+                    'schema', TG_TABLE_SCHEMA,
+                    'table', TG_TABLE_NAME,
+                    'op', TG_OP,
+                    'id', (row_data ->> 'id')::integer,
+                    'program_id', program_id
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table in NOTIFIED_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_catalog_change();
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in NOTIFIED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS notify_catalog_change();")
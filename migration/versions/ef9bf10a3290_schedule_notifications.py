@@ -0,0 +1,38 @@
+"""schedule notifications
+
+Revision ID: ef9bf10a3290
+Revises: 79c76cc8dfb1
+Create Date: 2026-10-19 21:04:18.512306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ef9bf10a3290'
+down_revision: Union[str, None] = '79c76cc8dfb1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFIED_TABLES = ('programs', 'host_program_pair')
+
+
+def upgrade() -> None:
+    # Программы и ведущие входят в эфирную сетку: воркеры сбрасывают её кэш по этим событиям.
+    for table in NOTIFIED_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_catalog_change();
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in NOTIFIED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table};")
@@ -0,0 +1,38 @@
+"""reference notifications
+
+Revision ID: f7c944736865
+Revises: 54f5bc800c79
+Create Date: 2026-10-19 18:12:44.305918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c944736865'
+down_revision: Union[str, None] = '54f5bc800c79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOTIFIED_TABLES = ('genres', 'hosts')
+
+
+def upgrade() -> None:
+    # Воркеры держат снимки справочников в памяти и обновляют их по этим событиям.
+    for table in NOTIFIED_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_catalog_change();
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in NOTIFIED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table};")
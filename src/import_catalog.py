@@ -0,0 +1,71 @@
+"""Массовый импорт справочника (жанры, исполнители, треки, альбомы) из CSV/NDJSON.
+
+Файлы грузятся через COPY во временные таблицы, проверяются и сливаются по id
+в порядке зависимостей в одной транзакции; повторный запуск с теми же файлами ничего не меняет.
+
+Запуск из src: python import_catalog.py --genres genres.csv --artists artists.ndjson --tracks tracks.csv
+(CSV с заголовком; .ndjson/.jsonl — по объекту JSON на строку; нужны переменные окружения приложения)
+Каталог станции: --station <имя из STATIONS> или --schema <схема>; без них — POSTGRES_SCHEMA.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+from project.core.config import settings
+from project.core.exceptions import Error, ForeignKeyViolationError
+from project.core.station import use_station
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.repository.catalog_import_repo import (
+    CatalogImportRepository,
+    ImportSource,
+    format_for_filename,
+)
+
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def run(paths: dict[str, Path], schema: str) -> dict[str, int]:
+    repository = CatalogImportRepository()
+    sources = {name: ImportSource(read_file(path), format_for_filename(path.name)) for name, path in paths.items()}
+    try:
+        with use_station(schema):
+            async with database.session() as session:
+                return await repository.import_catalog(session=session, sources=sources)
+    finally:
+        await database.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    station = parser.add_mutually_exclusive_group()
+    station.add_argument("--station", choices=sorted(settings.STATIONS))
+    station.add_argument("--schema")
+    entity_names = CatalogImportRepository().entity_names
+    for name in entity_names:
+        parser.add_argument(f"--{name}", type=Path)
+    args = parser.parse_args()
+
+    paths = {name: getattr(args, name) for name in entity_names if getattr(args, name) is not None}
+    if not paths:
+        parser.error("at least one file is required")
+    schema = settings.STATIONS[args.station] if args.station else args.schema or settings.POSTGRES_SCHEMA
+
+    try:
+        merged = asyncio.run(run(paths, schema))
+    except (Error, ForeignKeyViolationError) as error:
+        raise SystemExit(error.message)
+
+    for name, count in merged.items():
+        print(f"{name}: {count} rows merged")
+
+
+if __name__ == "__main__":
+    main()
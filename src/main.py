@@ -1,11 +1,16 @@
 import asyncio
 import logging
-import uvicorn
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from project.core.config import settings
+from project.core.compression import CompressionMiddleware
+from project.core.deadline import CancelOnDisconnectMiddleware
+from project.core.profiling import ProfilingMiddleware
+from project.core.station import StationMiddleware
 from project.api.program_router import program_router
 from project.api.hosts_router import host_router
 from project.api.albums_router import albums_router
@@ -19,11 +24,62 @@ from project.api.host_program_router import host_program_pair_router
 from project.api.user_router import user_router
 
 from project.api.auth_router import auth_router
+from project.api.errors import register_exception_handlers
+from project.api.change_feed_router import change_feed_router
+from project.api.jobs_router import jobs_router
+from project.api.metrics_router import metrics_router
+from project.api.schedule_router import schedule_router
+from project.api.export_router import export_router
+from project.api.import_router import import_router
+from project.api.profiling_router import profiling_router
+from project.api.depends import (
+    database,
+    idempotency_cleanup,
+    job_worker,
+    loop_watchdog,
+    partition_maintenance,
+    reference_snapshot,
+    reference_snapshot_refresh,
+    track_neighbours_refresh,
+)
+from project.resource.auth import get_password_context
+from project.infrastructure.postgres.listener import change_feed
 
 
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if settings.LOOP_WATCHDOG_ENABLED:
+        await loop_watchdog.start()
+    database.connect()
+    password_context = asyncio.create_task(asyncio.to_thread(get_password_context))
+    await change_feed.start()
+    if settings.JOBS_ENABLED:
+        await job_worker.start()
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        await partition_maintenance.start()
+    await idempotency_cleanup.start()
+    if settings.REFERENCE_SNAPSHOT_ENABLED:
+        await reference_snapshot_refresh.start()
+    if settings.TRACK_NEIGHBOURS_ENABLED:
+        await track_neighbours_refresh.start()
+    await password_context
+    try:
+        yield
+    finally:
+        await track_neighbours_refresh.stop()
+        await reference_snapshot_refresh.stop()
+        await reference_snapshot.stop()
+        await idempotency_cleanup.stop()
+        await partition_maintenance.stop()
+        await job_worker.stop()
+        await change_feed.stop()
+        await database.dispose()
+        await loop_watchdog.stop()
+
+
 def create_app() -> FastAPI:
     app_options = {}
     if settings.ENV.lower() == "prod":
@@ -34,7 +90,8 @@ def create_app() -> FastAPI:
     if settings.LOG_LEVEL in ["DEBUG", "INFO"]:
         app_options["debug"] = True
 
-    app = FastAPI(root_path=settings.ROOT_PATH, **app_options)
+    app = FastAPI(root_path=settings.ROOT_PATH, lifespan=lifespan, **app_options)
+    register_exception_handlers(app)
     app.add_middleware(
         CORSMiddleware,  # type: ignore
         allow_origins=settings.ORIGINS,
@@ -42,6 +99,17 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(
+        CompressionMiddleware,  # type: ignore
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        levels=settings.compression_levels,
+        encodings=settings.COMPRESSION_ENCODINGS,
+    )
+    # Профилировщик должен работать в той же задаче, что и обработчик, поэтому он внутри CancelOnDisconnect.
+    app.add_middleware(ProfilingMiddleware)  # type: ignore
+    app.add_middleware(CancelOnDisconnectMiddleware)  # type: ignore
+    # Станция выставляется снаружи, чтобы задача обработчика унаследовала её вместе с контекстом.
+    app.add_middleware(StationMiddleware)  # type: ignore
 
     app.include_router(program_router, tags=["Program"])
     app.include_router(host_router, tags=["Host"])
@@ -55,6 +123,13 @@ def create_app() -> FastAPI:
     app.include_router(playlist_and_track_pair_router, tags=["PlaylistAndTrackPair"])
     app.include_router(user_router, tags=["User"])
     app.include_router(auth_router, tags=["Auth"])
+    app.include_router(change_feed_router, tags=["ChangeFeed"])
+    app.include_router(jobs_router, tags=["Job"])
+    app.include_router(schedule_router, tags=["Schedule"])
+    app.include_router(export_router, tags=["Export"])
+    app.include_router(import_router, tags=["Import"])
+    app.include_router(profiling_router, tags=["Profiling"])
+    app.include_router(metrics_router, tags=["Metrics"])
 
     return app
 
@@ -63,6 +138,8 @@ app = create_app()
 
 
 async def run() -> None:
+    import uvicorn
+
     config = uvicorn.Config("main:app", host="0.0.0.0", port=8000, reload=False)
     server = uvicorn.Server(config=config)
     tasks = (
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, HTTPException, status
 from project.api.depends import database
 from project.api.depends import albums_repo
-from project.schemas.models import AlbumCreateUpdateSchema, AlbumSchema
-from project.core.exceptions import Error, ForeignKeyViolationError, NotFound
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.schemas.models import AlbumCreateUpdateSchema, AlbumSchema, MultiGetSchema
+from project.core.exceptions import Error, ForeignKeyViolationError, NotFound, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 albums_router = APIRouter()
 
@@ -11,13 +14,26 @@ albums_router = APIRouter()
     response_model=list[AlbumSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_albums() -> list[AlbumSchema]:
-    async with database.session() as session:
-        all_albums = await albums_repo.get_all_albums(session)
+    all_albums = await database.read(albums_repo.get_all)
     
     return all_albums
 
 
+@albums_router.get(
+    "/albums",
+    response_model=MultiGetSchema[AlbumSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_albums_by_ids(ids: str) -> MultiGetSchema[AlbumSchema]:
+    album_ids = parse_ids(ids)
+    albums = await database.read(albums_repo.get_many_by_ids, ids=album_ids)
+
+    return in_request_order(album_ids, albums)
+
+
 @albums_router.get(
     "/album/{id}",
     response_model=AlbumSchema,
@@ -25,8 +41,7 @@ async def get_all_albums() -> list[AlbumSchema]:
 )
 async def get_album_by_id(album_id: int) -> AlbumSchema:
     try:
-        async with database.session() as session:
-            album = await albums_repo.get_album_by_id(session=session, album_id=album_id)
+        album = await database.read(albums_repo.get_by_id, entity_id=album_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -38,14 +53,22 @@ async def get_album_by_id(album_id: int) -> AlbumSchema:
     response_model=AlbumSchema,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_album(album_dto: AlbumCreateUpdateSchema):
+async def add_album(album_dto: AlbumCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_album = await albums_repo.create_album(session=session, album=album_dto)
+            new_album = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_album",
+                dto=album_dto,
+                create=albums_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_album
 
@@ -58,10 +81,10 @@ async def add_album(album_dto: AlbumCreateUpdateSchema):
 async def update_album(album_id: int, album_dto: AlbumCreateUpdateSchema):
     try:
         async with database.session() as session:
-            updated_album = await albums_repo.update_album(
+            updated_album = await albums_repo.update(
                 session=session,
-                album_id=album_id,
-                album=album_dto,
+                entity_id=album_id,
+                dto=album_dto,
             )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
@@ -78,7 +101,7 @@ async def update_album(album_id: int, album_dto: AlbumCreateUpdateSchema):
 async def delete_album(album_id: int):
     try:
         async with database.session() as session:
-            album = await albums_repo.delete_album(session=session, album_id=album_id)
+            album = await albums_repo.delete(session=session, entity_id=album_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
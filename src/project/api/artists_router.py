@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
 from project.api.depends import database
-from project.api.depends import artists_repo
-from project.schemas.models import ArtistCreateUpdateSchema, ArtistSchema
-from project.core.exceptions import Error, NotFound, ForeignKeyViolationError
+from project.api.depends import artists_repo, jobs_repo, job_worker
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.api.job_handlers import CASCADE_DELETE_ARTIST
+from project.schemas.models import ArtistCreateUpdateSchema, ArtistSchema, CascadeDeleteSchema, JobSchema, MultiGetSchema
+from project.core.exceptions import Error, NotFound, ForeignKeyViolationError, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 artists_router = APIRouter()
 
@@ -11,13 +16,26 @@ artists_router = APIRouter()
     response_model=list[ArtistSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_artists() -> list[ArtistSchema]:
-    async with database.session() as session:
-        all_artists = await artists_repo.get_all_artists(session)
+    all_artists = await database.read(artists_repo.get_all)
     
     return all_artists
 
 
+@artists_router.get(
+    "/artists",
+    response_model=MultiGetSchema[ArtistSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_artists_by_ids(ids: str) -> MultiGetSchema[ArtistSchema]:
+    artist_ids = parse_ids(ids)
+    artists = await database.read(artists_repo.get_many_by_ids, ids=artist_ids)
+
+    return in_request_order(artist_ids, artists)
+
+
 @artists_router.get(
     "/artist/{id}",
     response_model=ArtistSchema,
@@ -25,8 +43,7 @@ async def get_all_artists() -> list[ArtistSchema]:
 )
 async def get_artist_by_id(artist_id: int) -> ArtistSchema:
     try:
-        async with database.session() as session:
-            artist = await artists_repo.get_artist_by_id(session=session, artist_id=artist_id)
+        artist = await database.read(artists_repo.get_by_id, entity_id=artist_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -38,14 +55,22 @@ async def get_artist_by_id(artist_id: int) -> ArtistSchema:
     response_model=ArtistSchema,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_artist(artist_dto: ArtistCreateUpdateSchema):
+async def add_artist(artist_dto: ArtistCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_artist = await artists_repo.create_artist(session=session, artist=artist_dto)
+            new_artist = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_artist",
+                dto=artist_dto,
+                create=artists_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_artist
 
@@ -58,10 +83,10 @@ async def add_artist(artist_dto: ArtistCreateUpdateSchema):
 async def update_artist(artist_id: int, artist_dto: ArtistCreateUpdateSchema):
     try:
         async with database.session() as session:
-            updated_artist = await artists_repo.update_artist(
+            updated_artist = await artists_repo.update(
                 session=session,
-                artist_id=artist_id,
-                artist=artist_dto,
+                entity_id=artist_id,
+                dto=artist_dto,
             )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
@@ -74,11 +99,21 @@ async def update_artist(artist_id: int, artist_dto: ArtistCreateUpdateSchema):
 @artists_router.delete(
     "/delete_artist/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_200_OK: {"model": CascadeDeleteSchema}, status.HTTP_202_ACCEPTED: {"model": JobSchema}},
 )
-async def delete_artist(artist_id: int):
+async def delete_artist(artist_id: int, cascade: bool = False, background: bool = False):
+    if cascade and background:
+        async with database.session() as session:
+            job = await jobs_repo.enqueue_job(session=session, kind=CASCADE_DELETE_ARTIST, payload={"artist_id": artist_id})
+        job_worker.wake()
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.model_dump(mode="json"))
+
     try:
         async with database.session() as session:
-            artist = await artists_repo.delete_artist(session=session, artist_id=artist_id)
+            if cascade:
+                report = await artists_repo.delete_artist_cascade(session=session, artist_id=artist_id)
+                return JSONResponse(content=CascadeDeleteSchema(deleted=report).model_dump())
+            artist = await artists_repo.delete(session=session, entity_id=artist_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
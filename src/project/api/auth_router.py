@@ -7,9 +7,10 @@ from jose import jwt
 
 from project.core.config import settings
 from project.core.exceptions import NotFound
+from project.core.station import station_schema
 from project.schemas.auth import Token
 from project.api.depends import database, user_repo
-from project.resource.auth import verify_password
+from project.resource.auth import verify_password_async
 
 
 auth_router = APIRouter()
@@ -20,10 +21,9 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     try:
-        async with database.session() as session:
-            user = await user_repo.get_user_by_username(session=session, username=form_data.username)
+        user = await database.read(user_repo.get_user_by_username, username=form_data.username)
 
-        if not verify_password(plain_password=form_data.password, hashed_password=user.password):
+        if not await verify_password_async(plain_password=form_data.password, hashed_password=user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный пароль",
@@ -37,7 +37,7 @@ async def login_for_access_token(
         )
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    token_data = {"sub": user.username}
+    token_data = {"sub": user.username, "station": station_schema()}
 
     to_encode = token_data.copy()
     if access_token_expires:
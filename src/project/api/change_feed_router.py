@@ -0,0 +1,64 @@
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, WebSocket
+from fastapi.responses import StreamingResponse
+
+from project.core.config import settings
+from project.infrastructure.postgres.listener import change_feed
+
+
+change_feed_router = APIRouter()
+
+
+def parse_tables(tables: str | None) -> frozenset[str] | None:
+    if not tables:
+        return None
+    return frozenset(table.strip() for table in tables.split(",") if table.strip())
+
+
+@change_feed_router.get("/changes")
+async def stream_changes(
+    program_id: int | None = None,
+    tables: str | None = None,
+) -> StreamingResponse:
+    async def event_stream() -> AsyncIterator[bytes]:
+        with change_feed.subscribe(program_id=program_id, tables=parse_tables(tables)) as subscription:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SEC)
+                except TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield event.sse
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@change_feed_router.websocket("/ws/changes")
+async def websocket_changes(
+    websocket: WebSocket,
+    program_id: int | None = None,
+    tables: str | None = None,
+) -> None:
+    await websocket.accept()
+    with change_feed.subscribe(program_id=program_id, tables=parse_tables(tables)) as subscription:
+        async def forward_events() -> None:
+            while True:
+                event = await subscription.get()
+                await websocket.send_text(event.data)
+
+        async def wait_for_disconnect() -> None:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        tasks = {asyncio.create_task(forward_events()), asyncio.create_task(wait_for_disconnect())}
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from project.core.exceptions import PreconditionFailed
+
+
+def make_etag(entity: str, entity_id: int, version: datetime) -> str:
+    micros = int(version.timestamp() * 1_000_000)
+    return f'"{entity}-{entity_id}-{micros}"'
+
+
+def validator_headers(etag: str, version: datetime) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(version.astimezone(timezone.utc), usegmt=True),
+    }
+
+
+def is_not_modified(request: Request, etag: str, version: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return version.replace(microsecond=0) <= since
+
+    return False
+
+
+def has_conditions(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def not_modified_response(etag: str, version: datetime) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, version))
+
+
+def parse_if_match(if_match: str | None, entity: str, entity_id: int) -> datetime | None:
+    """Достаёт версию строки из If-Match; None, если заголовок не передан."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    prefix = f'"{entity}-{entity_id}-'
+    tag = if_match.strip().removeprefix("W/")
+    if not (tag.startswith(prefix) and tag.endswith('"')):
+        raise PreconditionFailed(message=f"ETag {tag} does not match {entity} {entity_id}")
+
+    try:
+        micros = int(tag[len(prefix):-1])
+    except ValueError:
+        raise PreconditionFailed(message=f"Malformed ETag {tag}")
+
+    return datetime.fromtimestamp(micros // 1_000_000, tz=timezone.utc).replace(microsecond=micros % 1_000_000)
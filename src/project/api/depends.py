@@ -1,4 +1,6 @@
-from typing import Annotated
+from datetime import timedelta
+from functools import partial
+from typing import Annotated, AsyncIterator, Callable
 
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
@@ -7,9 +9,13 @@ from project.schemas.auth import TokenData
 from project.schemas.user import UserSchema
 from project.core.config import settings
 from project.core.exceptions import CredentialsException
+from project.core.single_flight import SingleFlight
+from project.core.cache import ExpiringCache
+from project.core.loop_watchdog import LoopWatchdog
+from project.core.station import every_station, station_schema
 from project.resource.auth import oauth2_scheme
 
-from project.infrastructure.postgres.database import PostgresDatabase
+from project.infrastructure.postgres.database import database
 from project.infrastructure.postgres.repository.program_repo import ProgramsRepository
 from project.infrastructure.postgres.repository.hosts_repo import HostsRepository
 from project.infrastructure.postgres.repository.host_program_repo import HostProgramPairRepository
@@ -21,6 +27,19 @@ from project.infrastructure.postgres.repository.song_request_repo import SongReq
 from project.infrastructure.postgres.repository.playlist_repo import PlaylistsRepository
 from project.infrastructure.postgres.repository.playlist_track_repo import PlaylistAndTrackPairRepository
 from project.infrastructure.postgres.repository.user_repo import UserRepository
+from project.infrastructure.postgres.repository.jobs_repo import JobsRepository
+from project.infrastructure.postgres.repository.schedule_repo import ScheduleRepository
+from project.infrastructure.postgres.repository.counters_repo import CountersRepository
+from project.infrastructure.postgres.repository.idempotency_repo import IdempotencyRepository
+from project.infrastructure.postgres.repository.catalog_import_repo import CatalogImportRepository
+from project.infrastructure.postgres.repository.track_neighbours_repo import TrackNeighboursRepository
+from project.infrastructure.postgres.repository.track_listing_repo import TrackListingRepository
+from project.infrastructure.postgres.listener import ChangeEvent, change_feed
+from project.infrastructure.jobs import JobWorker
+from project.infrastructure.periodic import PeriodicTask
+from project.infrastructure.postgres.partitions import maintain_song_requests_partitions
+from project.infrastructure.postgres.track_neighbours import refresh_track_neighbours
+from project.infrastructure.postgres.reference_snapshot import ReferenceSnapshot
 
 
 
@@ -35,8 +54,86 @@ song_requests_repo = SongRequestsRepository()
 playlists_repo = PlaylistsRepository()
 playlist_track_repo = PlaylistAndTrackPairRepository()
 user_repo = UserRepository()
+jobs_repo = JobsRepository()
+schedule_repo = ScheduleRepository()
+counters_repo = CountersRepository()
+idempotency_repo = IdempotencyRepository()
+catalog_import_repo = CatalogImportRepository()
+track_neighbours_repo = TrackNeighboursRepository()
+track_listing_repo = TrackListingRepository()
 
-database = PostgresDatabase()
+job_worker = JobWorker(database=database, repository=jobs_repo)
+
+
+async def _purge_idempotency_keys() -> None:
+    async with database.session() as session:
+        await idempotency_repo.purge_expired(session=session, ttl=timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SEC))
+
+
+partition_maintenance = PeriodicTask(
+    name="partition-maintenance",
+    interval_sec=settings.PARTITION_MAINTENANCE_INTERVAL_SEC,
+    action=every_station(partial(maintain_song_requests_partitions, database=database, repository=song_requests_repo)),
+)
+idempotency_cleanup = PeriodicTask(
+    name="idempotency-cleanup",
+    interval_sec=settings.IDEMPOTENCY_CLEANUP_INTERVAL_SEC,
+    action=every_station(_purge_idempotency_keys),
+)
+track_neighbours_refresh = PeriodicTask(
+    name="track-neighbours-refresh",
+    interval_sec=settings.TRACK_NEIGHBOURS_REFRESH_INTERVAL_SEC,
+    action=every_station(partial(refresh_track_neighbours, database=database, repository=track_neighbours_repo)),
+)
+
+reference_snapshot = ReferenceSnapshot(
+    database=database,
+    repositories={"genres": genres_repo, "hosts": hosts_repo},
+)
+reference_snapshot_refresh = PeriodicTask(
+    name="reference-snapshot-refresh",
+    interval_sec=settings.REFERENCE_SNAPSHOT_REFRESH_INTERVAL_SEC,
+    action=reference_snapshot.refresh_all,
+)
+
+loop_watchdog = LoopWatchdog(
+    interval_sec=settings.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+    threshold_sec=settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+)
+
+single_flight = SingleFlight()
+schedule_cache = ExpiringCache(name="schedule")
+
+
+# Таблицы, из которых собирается эфирная сетка: их изменение в любом воркере сбрасывает её кэш.
+SCHEDULE_TABLES = frozenset({"playlists", "programs", "hosts", "host_program_pair"})
+
+
+def _on_catalog_change(event: ChangeEvent) -> None:
+    if event.change.table in SCHEDULE_TABLES:
+        schedule_cache.clear()
+    if settings.REFERENCE_SNAPSHOT_ENABLED:
+        reference_snapshot.invalidate(event.change.schema_name, event.change.table)
+
+
+change_feed.add_callback(_on_catalog_change)
+
+
+async def invalidates_schedule() -> AsyncIterator[None]:
+    """Сбрасывает кэш эфирной сетки после записи, влияющей на расписание."""
+    yield
+    schedule_cache.clear()
+
+
+def refreshes_reference(table: str) -> Callable[[], AsyncIterator[None]]:
+    """Обновляет снимок справочника после записи, чтобы этот же воркер сразу отдавал новые данные."""
+
+    async def dependency() -> AsyncIterator[None]:
+        yield
+        if settings.REFERENCE_SNAPSHOT_ENABLED:
+            await reference_snapshot.refresh(table)
+
+    return dependency
 
 AUTH_EXCEPTION_MESSAGE = "Невозможно проверить данные для авторизации"
 
@@ -53,15 +150,14 @@ async def get_current_user(
         username: str = payload.get("sub")
         if username is None:
             raise CredentialsException(detail=AUTH_EXCEPTION_MESSAGE)
+        # Пользователи у каждой станции свои: токен одной станции не действует в другой.
+        if payload.get("station", settings.POSTGRES_SCHEMA) != station_schema():
+            raise CredentialsException(detail=AUTH_EXCEPTION_MESSAGE)
         token_data = TokenData(username=username)
     except JWTError:
         raise CredentialsException(detail=AUTH_EXCEPTION_MESSAGE)
 
-    async with database.session() as session:
-        user = await user_repo.get_user_by_username(
-            session=session,
-            username=token_data.username,
-        )
+    user = await database.read(user_repo.get_user_by_username, username=token_data.username)
 
     if user is None:
         raise CredentialsException(detail=AUTH_EXCEPTION_MESSAGE)
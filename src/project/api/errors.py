@@ -0,0 +1,33 @@
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from project.core.config import settings
+from project.core.exceptions import DatabaseError, DatabaseUnavailable, DeadlineExceeded
+
+
+async def database_unavailable_handler(request: Request, error: DatabaseUnavailable) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": error.message},
+        headers={"Retry-After": str(settings.POSTGRES_RECONNECT_INTERVAL_SEC)},
+    )
+
+
+async def database_error_handler(request: Request, error: DatabaseError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": error.message},
+    )
+
+
+async def deadline_exceeded_handler(request: Request, error: DeadlineExceeded) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": error.message},
+    )
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+    app.add_exception_handler(DatabaseUnavailable, database_unavailable_handler)
+    app.add_exception_handler(DatabaseError, database_error_handler)
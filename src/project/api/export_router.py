@@ -0,0 +1,79 @@
+from contextlib import AsyncExitStack
+from datetime import date
+from typing import AsyncIterator
+
+from fastapi import APIRouter, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from starlette.types import Receive, Scope, Send
+
+from project.api.depends import database, playlist_track_repo, song_requests_repo
+from project.infrastructure.postgres.copy_export import copy_to_csv
+
+
+export_router = APIRouter()
+
+
+class _ExportResponse(StreamingResponse):
+    """Закрывает сессию и COPY после отправки, даже если тело так и не начали читать."""
+
+    def __init__(self, content: AsyncIterator[bytes], cleanup: AsyncExitStack, **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self._cleanup = cleanup
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._cleanup.aclose()
+
+
+async def _stream_csv(query: Select, filename: str) -> StreamingResponse:
+    # Первый кусок читается до ответа: ошибки подключения и запроса ещё успевают стать 503/500,
+    # а не оборванным телом с кодом 200.
+    async with AsyncExitStack() as stack:
+        session = await stack.enter_async_context(database.session())
+        chunks = copy_to_csv(session, query)
+        stack.push_async_callback(chunks.aclose)
+        first_chunk = await anext(chunks, b"")
+        cleanup = stack.pop_all()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    return _ExportResponse(
+        body(),
+        cleanup,
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@export_router.get(
+    "/export/song_requests.csv",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_song_requests(
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> StreamingResponse:
+    query = song_requests_repo.export_query(date_from=date_from, date_to=date_to)
+
+    return await _stream_csv(query, "song_requests.csv")
+
+
+@export_router.get(
+    "/export/playlist_tracks.csv",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_playlist_tracks(
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> StreamingResponse:
+    query = playlist_track_repo.export_query(date_from=date_from, date_to=date_to)
+
+    return await _stream_csv(query, "playlist_tracks.csv")
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, status
-from project.api.depends import database
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from project.api.depends import database, reference_snapshot, refreshes_reference
 from project.api.depends import genres_repo
-from project.schemas.models import GenreCreateUpdateSchema, GenreSchema
-from project.core.exceptions import Error, NotFound
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.schemas.models import GenreCreateUpdateSchema, GenreSchema, MultiGetSchema
+from project.core.exceptions import Error, NotFound, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 genres_router = APIRouter()
 
@@ -11,22 +14,45 @@ genres_router = APIRouter()
     response_model=list[GenreSchema],
     status_code=status.HTTP_200_OK,
 )
-async def get_all_genres() -> list[GenreSchema]:
-    async with database.session() as session:
-        all_genres = await genres_repo.get_all_genres(session)
+@with_deadline()
+async def get_all_genres(request: Request) -> list[GenreSchema]:
+    snapshot = reference_snapshot.get("genres")
+    if snapshot is not None:
+        return snapshot.all.to_response(request)
+
+    all_genres = await database.read(genres_repo.get_all)
     
     return all_genres
 
 
+@genres_router.get(
+    "/genres",
+    response_model=MultiGetSchema[GenreSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_genres_by_ids(ids: str) -> MultiGetSchema[GenreSchema]:
+    genre_ids = parse_ids(ids)
+    snapshot = reference_snapshot.get("genres")
+    if snapshot is not None:
+        return Response(snapshot.get_many(genre_ids), media_type="application/json")
+
+    genres = await database.read(genres_repo.get_many_by_ids, ids=genre_ids)
+
+    return in_request_order(genre_ids, genres)
+
+
 @genres_router.get(
     "/genre/{id}",
     response_model=GenreSchema,
     status_code=status.HTTP_200_OK,
 )
 async def get_genre_by_id(genre_id: int) -> GenreSchema:
+    snapshot = reference_snapshot.get("genres")
     try:
-        async with database.session() as session:
-            genre = await genres_repo.get_genre_by_id(session=session, genre_id=genre_id)
+        if snapshot is not None:
+            return Response(snapshot.get(genre_id), media_type="application/json")
+        genre = await database.read(genres_repo.get_by_id, entity_id=genre_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -37,13 +63,22 @@ async def get_genre_by_id(genre_id: int) -> GenreSchema:
     "/add_genre",
     response_model=GenreSchema,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(refreshes_reference("genres"))],
 )
-async def add_genre(genre_dto: GenreCreateUpdateSchema):
+async def add_genre(genre_dto: GenreCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_genre = await genres_repo.create_genre(session=session, genre=genre_dto)
-    except Error as error:
+            new_genre = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_genre",
+                dto=genre_dto,
+                create=genres_repo.create,
+            )
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_genre
 
@@ -52,14 +87,15 @@ async def add_genre(genre_dto: GenreCreateUpdateSchema):
     "/update_genre/{id}",
     response_model=GenreSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(refreshes_reference("genres"))],
 )
 async def update_genre(genre_id: int, genre_dto: GenreCreateUpdateSchema):
     try:
         async with database.session() as session:
-            updated_genre = await genres_repo.update_genre(
+            updated_genre = await genres_repo.update(
                 session=session,
-                genre_id=genre_id,
-                genre=genre_dto,
+                entity_id=genre_id,
+                dto=genre_dto,
             )
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -70,11 +106,12 @@ async def update_genre(genre_id: int, genre_dto: GenreCreateUpdateSchema):
 @genres_router.delete(
     "/delete_genre/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(refreshes_reference("genres"))],
 )
 async def delete_genre(genre_id: int):
     try:
         async with database.session() as session:
-            genre = await genres_repo.delete_genre(session=session, genre_id=genre_id)
+            genre = await genres_repo.delete(session=session, entity_id=genre_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, status
-from project.api.depends import database
+from fastapi import APIRouter, HTTPException, status, Depends
+from project.api.depends import database, invalidates_schedule
 from project.api.depends import host_program_repo
-from project.schemas.models import HostProgramPairCreateUpdateSchema, HostProgramPairSchema
-from project.core.exceptions import Error, NotFound, ForeignKeyViolationError
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.schemas.models import HostProgramPairCreateUpdateSchema, HostProgramPairSchema, MultiGetSchema
+from project.core.exceptions import Error, NotFound, ForeignKeyViolationError, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 host_program_pair_router = APIRouter()
 
@@ -11,13 +14,26 @@ host_program_pair_router = APIRouter()
     response_model=list[HostProgramPairSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_host_program_pairs() -> list[HostProgramPairSchema]:
-    async with database.session() as session:
-        all_host_program_pairs = await host_program_repo.get_all_pairs(session)
+    all_host_program_pairs = await database.read(host_program_repo.get_all)
     
     return all_host_program_pairs
 
 
+@host_program_pair_router.get(
+    "/host_program_pairs",
+    response_model=MultiGetSchema[HostProgramPairSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_host_program_pairs_by_ids(ids: str) -> MultiGetSchema[HostProgramPairSchema]:
+    pair_ids = parse_ids(ids)
+    host_program_pairs = await database.read(host_program_repo.get_many_by_ids, ids=pair_ids)
+
+    return in_request_order(pair_ids, host_program_pairs)
+
+
 @host_program_pair_router.get(
     "/host_program_pair/{id}",
     response_model=HostProgramPairSchema,
@@ -25,8 +41,7 @@ async def get_all_host_program_pairs() -> list[HostProgramPairSchema]:
 )
 async def get_host_program_pair_by_id(pair_id: int) -> HostProgramPairSchema:
     try:
-        async with database.session() as session:
-            pair = await host_program_repo.get_pair_by_id(session=session, pair_id=pair_id)
+        pair = await database.read(host_program_repo.get_by_id, entity_id=pair_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -37,15 +52,24 @@ async def get_host_program_pair_by_id(pair_id: int) -> HostProgramPairSchema:
     "/add_host_program_pair",
     response_model=HostProgramPairSchema,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def add_host_program_pair(pair_dto: HostProgramPairCreateUpdateSchema):
+async def add_host_program_pair(pair_dto: HostProgramPairCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_pair = await host_program_repo.create_pair(session=session, pair=pair_dto)
+            new_pair = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_host_program_pair",
+                dto=pair_dto,
+                create=host_program_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_pair
 
@@ -54,14 +78,15 @@ async def add_host_program_pair(pair_dto: HostProgramPairCreateUpdateSchema):
     "/update_host_program_pair/{id}",
     response_model=HostProgramPairSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(invalidates_schedule)],
 )
 async def update_host_program_pair(pair_id: int, pair_dto: HostProgramPairCreateUpdateSchema):
     try:
         async with database.session() as session:
-            updated_pair = await host_program_repo.update_pair(
+            updated_pair = await host_program_repo.update(
                 session=session,
-                pair_id=pair_id,
-                pair=pair_dto,
+                entity_id=pair_id,
+                dto=pair_dto,
             )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
@@ -74,11 +99,12 @@ async def update_host_program_pair(pair_id: int, pair_dto: HostProgramPairCreate
 @host_program_pair_router.delete(
     "/delete_host_program_pair/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(invalidates_schedule)],
 )
 async def delete_host_program_pair(pair_id: int):
     try:
         async with database.session() as session:
-            pair = await host_program_repo.delete_pair(session=session, pair_id=pair_id)
+            pair = await host_program_repo.delete(session=session, entity_id=pair_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
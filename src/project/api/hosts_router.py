@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, status
-from project.api.depends import database
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from project.api.depends import database, invalidates_schedule, reference_snapshot, refreshes_reference
 from project.api.depends import hosts_repo
-from project.schemas.models import HostCreateUpdateSchema, HostSchema
-from project.core.exceptions import Error, NotFound
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.schemas.models import HostCreateUpdateSchema, HostSchema, MultiGetSchema
+from project.core.exceptions import Error, NotFound, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 host_router = APIRouter()
 
@@ -11,22 +14,45 @@ host_router = APIRouter()
     response_model=list[HostSchema],
     status_code=status.HTTP_200_OK,
 )
-async def get_all_hosts() -> list[HostSchema]:
-    async with database.session() as session:
-        all_hosts = await hosts_repo.get_all_hosts(session)
+@with_deadline()
+async def get_all_hosts(request: Request) -> list[HostSchema]:
+    snapshot = reference_snapshot.get("hosts")
+    if snapshot is not None:
+        return snapshot.all.to_response(request)
+
+    all_hosts = await database.read(hosts_repo.get_all)
     
     return all_hosts
 
 
+@host_router.get(
+    "/hosts",
+    response_model=MultiGetSchema[HostSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_hosts_by_ids(ids: str) -> MultiGetSchema[HostSchema]:
+    host_ids = parse_ids(ids)
+    snapshot = reference_snapshot.get("hosts")
+    if snapshot is not None:
+        return Response(snapshot.get_many(host_ids), media_type="application/json")
+
+    hosts = await database.read(hosts_repo.get_many_by_ids, ids=host_ids)
+
+    return in_request_order(host_ids, hosts)
+
+
 @host_router.get(
     "/host/{id}",
     response_model=HostSchema,
     status_code=status.HTTP_200_OK,
 )
 async def get_host_by_id(host_id: int) -> HostSchema:
+    snapshot = reference_snapshot.get("hosts")
     try:
-        async with database.session() as session:
-            host = await hosts_repo.get_host_by_id(session=session, host_id=host_id)
+        if snapshot is not None:
+            return Response(snapshot.get(host_id), media_type="application/json")
+        host = await database.read(hosts_repo.get_by_id, entity_id=host_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -37,13 +63,22 @@ async def get_host_by_id(host_id: int) -> HostSchema:
     "/add_host",
     response_model=HostSchema,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(refreshes_reference("hosts"))],
 )
-async def add_host(host_dto: HostCreateUpdateSchema):
+async def add_host(host_dto: HostCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_host = await hosts_repo.create_host(session=session, host=host_dto)
-    except Error as error:
+            new_host = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_host",
+                dto=host_dto,
+                create=hosts_repo.create,
+            )
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_host
 
@@ -52,14 +87,15 @@ async def add_host(host_dto: HostCreateUpdateSchema):
     "/update_host/{id}",
     response_model=HostSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(refreshes_reference("hosts")), Depends(invalidates_schedule)],
 )
 async def update_host(host_id: int, host_dto: HostCreateUpdateSchema):
     try:
         async with database.session() as session:
-            updated_host = await hosts_repo.update_host(
+            updated_host = await hosts_repo.update(
                 session=session,
-                host_id=host_id,
-                host=host_dto,
+                entity_id=host_id,
+                dto=host_dto,
             )
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -70,11 +106,12 @@ async def update_host(host_id: int, host_dto: HostCreateUpdateSchema):
 @host_router.delete(
     "/delete_host/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(refreshes_reference("hosts")), Depends(invalidates_schedule)],
 )
 async def delete_host(host_id: int):
     try:
         async with database.session() as session:
-            host = await hosts_repo.delete_host(session=session, host_id=host_id)
+            host = await hosts_repo.delete(session=session, entity_id=host_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -0,0 +1,59 @@
+import hashlib
+from datetime import timedelta
+from typing import Annotated, Awaitable, Callable
+
+from fastapi import Header, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.api.depends import idempotency_repo
+from project.core.config import settings
+from project.core.exceptions import IdempotencyKeyReused
+
+
+IdempotencyKeyHeader = Annotated[str | None, Header(alias="Idempotency-Key", max_length=255)]
+
+
+async def create_once(
+    session: AsyncSession,
+    key: str | None,
+    scope: str,
+    dto: BaseModel,
+    create: Callable[..., Awaitable[BaseModel]],
+) -> BaseModel | JSONResponse:
+    """Создаёт запись не более одного раза на Idempotency-Key.
+
+    Ключ и созданная запись фиксируются в одной транзакции, повтор получает
+    сохранённый ответ без обращения к целевой таблице.
+    """
+    if key is None:
+        return await create(session=session, dto=dto)
+
+    request_hash = hashlib.sha256(dto.model_dump_json().encode()).hexdigest()
+    stored = await idempotency_repo.claim_key(
+        session=session,
+        scope=scope,
+        key=key,
+        request_hash=request_hash,
+        ttl=timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SEC),
+    )
+    if stored is not None:
+        if stored.request_hash != request_hash or stored.response is None:
+            raise IdempotencyKeyReused(message=f"Idempotency key {key!r} was already used for another request")
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.response,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    created = await create(session=session, dto=dto)
+    await idempotency_repo.save_response(
+        session=session,
+        scope=scope,
+        key=key,
+        status_code=status.HTTP_201_CREATED,
+        response=created.model_dump(mode="json"),
+    )
+
+    return created
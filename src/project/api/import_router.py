@@ -0,0 +1,49 @@
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+
+from project.api.depends import catalog_import_repo, check_for_admin_access, database, get_current_user
+from project.infrastructure.postgres.repository.catalog_import_repo import ImportSource, format_for_filename
+from project.schemas.models import CatalogImportSchema
+from project.schemas.user import UserSchema
+from project.core.exceptions import Error, ForeignKeyViolationError
+
+
+import_router = APIRouter()
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _read_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+@import_router.post(
+    "/import_catalog",
+    response_model=CatalogImportSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def import_catalog(
+    genres: UploadFile | None = None,
+    artists: UploadFile | None = None,
+    tracks: UploadFile | None = None,
+    albums: UploadFile | None = None,
+    current_user: UserSchema = Depends(get_current_user),
+) -> CatalogImportSchema:
+    check_for_admin_access(user=current_user)
+    uploads = {"genres": genres, "artists": artists, "tracks": tracks, "albums": albums}
+    sources = {
+        name: ImportSource(_read_upload(upload), format_for_filename(upload.filename))
+        for name, upload in uploads.items()
+        if upload is not None
+    }
+    try:
+        async with database.session() as session:
+            merged = await catalog_import_repo.import_catalog(session=session, sources=sources)
+    except ForeignKeyViolationError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except Error as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
+
+    return CatalogImportSchema(merged=merged)
@@ -0,0 +1,40 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.api.depends import artists_repo, counters_repo, programs_repo, track_neighbours_repo
+from project.core.config import settings
+from project.infrastructure.jobs import job_handler
+
+
+CASCADE_DELETE_PROGRAM = "cascade_delete_program"
+CASCADE_DELETE_ARTIST = "cascade_delete_artist"
+RECONCILE_COUNTERS = "reconcile_counters"
+REBUILD_TRACK_NEIGHBOURS = "rebuild_track_neighbours"
+
+
+@job_handler(CASCADE_DELETE_PROGRAM)
+async def cascade_delete_program(session: AsyncSession, payload: dict) -> dict:
+    deleted = await programs_repo.delete_program_cascade(session=session, program_id=payload["program_id"])
+    return {"deleted": deleted}
+
+
+@job_handler(CASCADE_DELETE_ARTIST)
+async def cascade_delete_artist(session: AsyncSession, payload: dict) -> dict:
+    deleted = await artists_repo.delete_artist_cascade(session=session, artist_id=payload["artist_id"])
+    return {"deleted": deleted}
+
+
+@job_handler(RECONCILE_COUNTERS)
+async def reconcile_counters(session: AsyncSession, payload: dict) -> dict:
+    fixed = await counters_repo.reconcile_counters(session=session)
+    return {"fixed": fixed}
+
+
+@job_handler(REBUILD_TRACK_NEIGHBOURS)
+async def rebuild_track_neighbours(session: AsyncSession, payload: dict) -> dict:
+    baskets = await track_neighbours_repo.refresh(
+        session=session,
+        top_k=settings.TRACK_NEIGHBOURS_TOP_K,
+        max_baskets=0,
+        rebuild=True,
+    )
+    return {"baskets": baskets}
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from project.api.depends import database, get_current_user, check_for_admin_access
+from project.api.depends import jobs_repo, job_worker
+from project.api.job_handlers import REBUILD_TRACK_NEIGHBOURS, RECONCILE_COUNTERS
+from project.schemas.models import JobSchema
+from project.schemas.user import UserSchema
+from project.core.exceptions import NotFound
+from project.core.deadline import with_deadline
+
+
+jobs_router = APIRouter()
+
+
+@jobs_router.get(
+    "/all_jobs",
+    response_model=list[JobSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_all_jobs(job_status: str | None = None, limit: int = 100) -> list[JobSchema]:
+    all_jobs = await database.read(jobs_repo.get_all_jobs, status=job_status, limit=limit)
+
+    return all_jobs
+
+
+@jobs_router.get(
+    "/job/{job_id}",
+    response_model=JobSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_job_by_id(job_id: int) -> JobSchema:
+    try:
+        job = await database.read(jobs_repo.get_job_by_id, job_id=job_id)
+    except NotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    return job
+
+
+@jobs_router.post(
+    "/reconcile_counters",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def reconcile_counters(
+    current_user: UserSchema = Depends(get_current_user),
+) -> JobSchema:
+    check_for_admin_access(user=current_user)
+    async with database.session() as session:
+        job = await jobs_repo.enqueue_job(session=session, kind=RECONCILE_COUNTERS)
+    job_worker.wake()
+
+    return job
+
+
+@jobs_router.post(
+    "/rebuild_track_neighbours",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def rebuild_track_neighbours(
+    current_user: UserSchema = Depends(get_current_user),
+) -> JobSchema:
+    check_for_admin_access(user=current_user)
+    async with database.session() as session:
+        job = await jobs_repo.enqueue_job(session=session, kind=REBUILD_TRACK_NEIGHBOURS)
+    job_worker.wake()
+
+    return job
@@ -0,0 +1,35 @@
+from typing import Sequence
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from project.core.config import settings
+
+
+def parse_ids(ids: str) -> list[int]:
+    """Разбирает ?ids=1,2,3 без дублей, сохраняя порядок из запроса."""
+    try:
+        parsed = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be a comma-separated list of integers",
+        )
+
+    if not parsed:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="ids must not be empty")
+    if len(parsed) > settings.MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.MULTI_GET_MAX_IDS} ids can be requested at once",
+        )
+
+    return parsed
+
+
+def in_request_order(ids: Sequence[int], items: Sequence[BaseModel]) -> dict:
+    by_id = {item.id: item for item in items}
+    return {
+        "items": [by_id[entity_id] for entity_id in ids if entity_id in by_id],
+        "missing": [entity_id for entity_id in ids if entity_id not in by_id],
+    }
@@ -1,8 +1,16 @@
 from fastapi import APIRouter, HTTPException, status
 from project.api.depends import database
 from project.api.depends import playlist_track_repo
-from project.schemas.models import PlaylistAndTrackPairCreateUpdateSchema, PlaylistAndTrackPairSchema
-from project.core.exceptions import Error, ForeignKeyViolationError, NotFound
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.schemas.models import (
+    PlaylistAndTrackPairCreateUpdateSchema,
+    PlaylistAndTrackPairSchema,
+    PlaylistTrackMoveSchema,
+    MultiGetSchema,
+)
+from project.core.exceptions import Error, ForeignKeyViolationError, NotFound, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 playlist_and_track_pair_router = APIRouter()
 
@@ -11,13 +19,26 @@ playlist_and_track_pair_router = APIRouter()
     response_model=list[PlaylistAndTrackPairSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_pairs() -> list[PlaylistAndTrackPairSchema]:
-    async with database.session() as session:
-        all_pairs = await playlist_track_repo.get_all_pairs(session)
+    all_pairs = await database.read(playlist_track_repo.get_all)
     
     return all_pairs
 
 
+@playlist_and_track_pair_router.get(
+    "/pairs",
+    response_model=MultiGetSchema[PlaylistAndTrackPairSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_pairs_by_ids(ids: str) -> MultiGetSchema[PlaylistAndTrackPairSchema]:
+    pair_ids = parse_ids(ids)
+    pairs = await database.read(playlist_track_repo.get_many_by_ids, ids=pair_ids)
+
+    return in_request_order(pair_ids, pairs)
+
+
 @playlist_and_track_pair_router.get(
     "/pair/{id}",
     response_model=PlaylistAndTrackPairSchema,
@@ -25,8 +46,7 @@ async def get_all_pairs() -> list[PlaylistAndTrackPairSchema]:
 )
 async def get_pair_by_id(pair_id: int) -> PlaylistAndTrackPairSchema:
     try:
-        async with database.session() as session:
-            pair = await playlist_track_repo.get_pair_by_id(session=session, pair_id=pair_id)
+        pair = await database.read(playlist_track_repo.get_by_id, entity_id=pair_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -38,14 +58,22 @@ async def get_pair_by_id(pair_id: int) -> PlaylistAndTrackPairSchema:
     response_model=PlaylistAndTrackPairSchema,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_pair(pair_dto: PlaylistAndTrackPairCreateUpdateSchema):
+async def add_pair(pair_dto: PlaylistAndTrackPairCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_pair = await playlist_track_repo.create_pair(session=session, pair=pair_dto)
+            new_pair = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_pair",
+                dto=pair_dto,
+                create=playlist_track_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_pair
 
@@ -58,12 +86,12 @@ async def add_pair(pair_dto: PlaylistAndTrackPairCreateUpdateSchema):
 async def update_pair(pair_id: int, pair_dto: PlaylistAndTrackPairCreateUpdateSchema):
     try:
         async with database.session() as session:
-            updated_pair = await playlist_track_repo.update_pair(
+            updated_pair = await playlist_track_repo.update(
                 session=session,
-                pair_id=pair_id,
-                pair=pair_dto,
+                entity_id=pair_id,
+                dto=pair_dto,
             )
-    except ForeignKeyViolationError as error:
+    except (ForeignKeyViolationError, AlreadyExists, Error) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -78,8 +106,40 @@ async def update_pair(pair_id: int, pair_dto: PlaylistAndTrackPairCreateUpdateSc
 async def delete_pair(pair_id: int):
     try:
         async with database.session() as session:
-            pair = await playlist_track_repo.delete_pair(session=session, pair_id=pair_id)
+            pair = await playlist_track_repo.delete(session=session, entity_id=pair_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
     return pair
+
+
+@playlist_and_track_pair_router.get(
+    "/playlist/{playlist_id}/order",
+    response_model=list[PlaylistAndTrackPairSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_playlist_order(playlist_id: int) -> list[PlaylistAndTrackPairSchema]:
+    pairs = await database.read(playlist_track_repo.get_playlist_order, playlist_id=playlist_id)
+
+    return pairs
+
+
+@playlist_and_track_pair_router.patch(
+    "/playlist/{playlist_id}/order",
+    response_model=list[PlaylistAndTrackPairSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def move_playlist_track(playlist_id: int, move_dto: PlaylistTrackMoveSchema) -> list[PlaylistAndTrackPairSchema]:
+    try:
+        async with database.session() as session:
+            pairs = await playlist_track_repo.move_pair(
+                session=session,
+                playlist_id=playlist_id,
+                pair_id=move_dto.pair_id,
+                after_pair_id=move_dto.after_pair_id,
+            )
+    except NotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    return pairs
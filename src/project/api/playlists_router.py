@@ -1,8 +1,30 @@
-from fastapi import APIRouter, HTTPException, status
-from project.api.depends import database
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Header, Request, Response, status, Depends
+from fastapi.responses import JSONResponse
+from project.api.depends import database, single_flight, invalidates_schedule
 from project.api.depends import playlists_repo
-from project.schemas.models import PlaylistCreateUpdateSchema, PlaylistSchema
-from project.core.exceptions import Error, ForeignKeyViolationError, NotFound
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.api.conditional import (
+    has_conditions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    parse_if_match,
+    validator_headers,
+)
+from project.core.compression import PrecompressedBody
+from project.schemas.models import (
+    CascadeDeleteSchema,
+    PlaylistCreateUpdateSchema,
+    PlaylistSchema,
+    PlaylistStatsSchema,
+    MultiGetSchema,
+)
+from project.core.exceptions import Error, ForeignKeyViolationError, NotFound, PreconditionFailed, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 playlists_router = APIRouter()
 
@@ -11,41 +33,92 @@ playlists_router = APIRouter()
     response_model=list[PlaylistSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_playlists() -> list[PlaylistSchema]:
-    async with database.session() as session:
-        all_playlists = await playlists_repo.get_all_playlists(session)
+    all_playlists = await database.read(playlists_repo.get_all)
     
     return all_playlists
 
 
+@playlists_router.get(
+    "/playlists",
+    response_model=MultiGetSchema[PlaylistSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_playlists_by_ids(ids: str) -> MultiGetSchema[PlaylistSchema]:
+    playlist_ids = parse_ids(ids)
+    playlists = await database.read(playlists_repo.get_many_by_ids, ids=playlist_ids)
+
+    return in_request_order(playlist_ids, playlists)
+
+
+async def _load_playlist(playlist_id: int) -> tuple[PrecompressedBody, datetime]:
+    playlist = await database.read(playlists_repo.get_by_id, entity_id=playlist_id)
+
+    return PrecompressedBody(playlist.model_dump_json().encode()), playlist.updated_at
+
+
+async def _load_playlist_version(playlist_id: int) -> datetime:
+    return await database.read(playlists_repo.get_version, entity_id=playlist_id)
+
+
 @playlists_router.get(
     "/playlist/{id}",
     response_model=PlaylistSchema,
     status_code=status.HTTP_200_OK,
 )
-async def get_playlist_by_id(playlist_id: int) -> PlaylistSchema:
+async def get_playlist_by_id(playlist_id: int, request: Request) -> PlaylistSchema:
     try:
-        async with database.session() as session:
-            playlist = await playlists_repo.get_playlist_by_id(session=session, playlist_id=playlist_id)
+        if has_conditions(request):
+            version = await single_flight.do(("playlist_version", playlist_id), lambda: _load_playlist_version(playlist_id))
+            etag = make_etag("playlist", playlist_id, version)
+            if is_not_modified(request, etag, version):
+                return not_modified_response(etag, version)
+        body, version = await single_flight.do(("playlist", playlist_id), lambda: _load_playlist(playlist_id))
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
-    return playlist
+    return body.to_response(request, headers=validator_headers(make_etag("playlist", playlist_id, version), version))
+
+
+@playlists_router.get(
+    "/playlist/{playlist_id}/stats",
+    response_model=PlaylistStatsSchema,
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_playlist_stats(playlist_id: int) -> PlaylistStatsSchema:
+    try:
+        stats = await database.read(playlists_repo.get_playlist_stats, playlist_id=playlist_id)
+    except NotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    return stats
 
 
 @playlists_router.post(
     "/add_playlist",
     response_model=PlaylistSchema,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def add_playlist(playlist_dto: PlaylistCreateUpdateSchema):
+async def add_playlist(playlist_dto: PlaylistCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_playlist = await playlists_repo.create_playlist(session=session, playlist=playlist_dto)
+            new_playlist = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_playlist",
+                dto=playlist_dto,
+                create=playlists_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_playlist
 
@@ -54,29 +127,49 @@ async def add_playlist(playlist_dto: PlaylistCreateUpdateSchema):
     "/update_playlist/{id}",
     response_model=PlaylistSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def update_playlist(playlist_id: int, playlist_dto: PlaylistCreateUpdateSchema):
+async def update_playlist(
+    playlist_id: int,
+    playlist_dto: PlaylistCreateUpdateSchema,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
+):
     try:
+        expected_version = parse_if_match(if_match, "playlist", playlist_id)
         async with database.session() as session:
-            updated_playlist = await playlists_repo.update_playlist(
+            updated_playlist = await playlists_repo.update(
                 session=session,
-                playlist_id=playlist_id,
-                playlist=playlist_dto,
+                entity_id=playlist_id,
+                dto=playlist_dto,
+                expected_version=expected_version,
             )
+    except ForeignKeyViolationError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except PreconditionFailed as error:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=error.message)
 
+    response.headers.update(
+        validator_headers(make_etag("playlist", updated_playlist.id, updated_playlist.updated_at), updated_playlist.updated_at)
+    )
     return updated_playlist
 
 
 @playlists_router.delete(
     "/delete_playlist/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_200_OK: {"model": CascadeDeleteSchema}},
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def delete_playlist(playlist_id: int):
+async def delete_playlist(playlist_id: int, cascade: bool = False):
     try:
         async with database.session() as session:
-            playlist = await playlists_repo.delete_playlist(session=session, playlist_id=playlist_id)
+            if cascade:
+                report = await playlists_repo.delete_playlist_cascade(session=session, playlist_id=playlist_id)
+                return JSONResponse(content=CascadeDeleteSchema(deleted=report).model_dump())
+            playlist = await playlists_repo.delete(session=session, entity_id=playlist_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
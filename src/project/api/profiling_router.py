@@ -0,0 +1,94 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from project.api.depends import check_for_admin_access, get_current_user
+from project.core.profiling import route_profiler
+from project.schemas.models import ProfilingConfigSchema, ProfilingStatusSchema
+from project.schemas.user import UserSchema
+
+
+profiling_router = APIRouter(prefix="/admin/profiling")
+
+
+def _status() -> ProfilingStatusSchema:
+    return ProfilingStatusSchema(
+        endpoint=route_profiler.endpoint,
+        sample_rate=route_profiler.sample_rate,
+        interval_ms=route_profiler.interval_sec * 1000,
+        trace_allocations=route_profiler.traces_allocations,
+        profiled_requests=route_profiler.profiled_requests,
+        samples=route_profiler.samples,
+    )
+
+
+@profiling_router.get(
+    "",
+    response_model=ProfilingStatusSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_profiling_status(
+    current_user: UserSchema = Depends(get_current_user),
+) -> ProfilingStatusSchema:
+    check_for_admin_access(user=current_user)
+
+    return _status()
+
+
+@profiling_router.put(
+    "",
+    response_model=ProfilingStatusSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def enable_profiling(
+    config: ProfilingConfigSchema,
+    request: Request,
+    current_user: UserSchema = Depends(get_current_user),
+) -> ProfilingStatusSchema:
+    check_for_admin_access(user=current_user)
+    endpoints = {getattr(route, "name", None) for route in request.app.routes}
+    if config.endpoint not in endpoints:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown endpoint {config.endpoint}")
+
+    await route_profiler.enable(
+        endpoint=config.endpoint,
+        sample_rate=config.sample_rate,
+        interval_ms=config.interval_ms,
+        trace_allocations=config.trace_allocations,
+    )
+    return _status()
+
+
+@profiling_router.delete(
+    "",
+    response_model=ProfilingStatusSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def disable_profiling(
+    current_user: UserSchema = Depends(get_current_user),
+) -> ProfilingStatusSchema:
+    """Останавливает сбор; собранные стеки остаются доступны до следующего включения."""
+    check_for_admin_access(user=current_user)
+    await route_profiler.disable()
+
+    return _status()
+
+
+@profiling_router.get("/cpu", response_class=PlainTextResponse)
+async def get_cpu_profile(
+    current_user: UserSchema = Depends(get_current_user),
+) -> str:
+    check_for_admin_access(user=current_user)
+
+    return route_profiler.folded_stacks()
+
+
+@profiling_router.get("/allocations", response_class=PlainTextResponse)
+async def get_allocations_profile(
+    current_user: UserSchema = Depends(get_current_user),
+) -> str:
+    check_for_admin_access(user=current_user)
+
+    # Снимок кучи занимает заметное время, event loop его не ждёт.
+    return await asyncio.to_thread(route_profiler.folded_allocations)
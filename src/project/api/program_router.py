@@ -1,9 +1,26 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-
-from project.api.depends import database
-from project.api.depends import programs_repo
-from project.schemas.models import ProgramCreateUpdateSchema, ProgramSchema
-from project.core.exceptions import Error, NotFound, AlreadyExists
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Header, Request, Response, status, Depends
+from fastapi.responses import JSONResponse
+
+from project.api.depends import database, single_flight, invalidates_schedule
+from project.api.depends import programs_repo, jobs_repo, job_worker
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.api.job_handlers import CASCADE_DELETE_PROGRAM
+from project.api.conditional import (
+    has_conditions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    parse_if_match,
+    validator_headers,
+)
+from project.core.compression import PrecompressedBody
+from project.schemas.models import CascadeDeleteSchema, JobSchema, ProgramCreateUpdateSchema, ProgramSchema, MultiGetSchema
+from project.core.exceptions import Error, NotFound, AlreadyExists, PreconditionFailed, IdempotencyKeyReused
+from project.core.deadline import with_deadline
 
 
 program_router = APIRouter()
@@ -13,26 +30,53 @@ program_router = APIRouter()
     response_model=list[ProgramSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_programs() -> list[ProgramSchema]:
-    async with database.session() as session:
-        all_programs = await programs_repo.get_all_programs(session)
+    all_programs = await database.read(programs_repo.get_all)
     
     return all_programs
 
 
+@program_router.get(
+    "/programs",
+    response_model=MultiGetSchema[ProgramSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_programs_by_ids(ids: str) -> MultiGetSchema[ProgramSchema]:
+    program_ids = parse_ids(ids)
+    programs = await database.read(programs_repo.get_many_by_ids, ids=program_ids)
+
+    return in_request_order(program_ids, programs)
+
+
+async def _load_program(program_id: int) -> tuple[PrecompressedBody, datetime]:
+    program = await database.read(programs_repo.get_by_id, entity_id=program_id)
+
+    return PrecompressedBody(program.model_dump_json().encode()), program.updated_at
+
+
+async def _load_program_version(program_id: int) -> datetime:
+    return await database.read(programs_repo.get_version, entity_id=program_id)
+
+
 @program_router.get(
     "/program/{id}",
     response_model=ProgramSchema,
     status_code=status.HTTP_200_OK,
 )
-async def get_program_by_id(program_id: int) -> ProgramSchema:
+async def get_program_by_id(program_id: int, request: Request) -> ProgramSchema:
     try:
-        async with database.session() as session:
-            program = await programs_repo.get_program_by_id(session=session, program_id=program_id)
+        if has_conditions(request):
+            version = await single_flight.do(("program_version", program_id), lambda: _load_program_version(program_id))
+            etag = make_etag("program", program_id, version)
+            if is_not_modified(request, etag, version):
+                return not_modified_response(etag, version)
+        body, version = await single_flight.do(("program", program_id), lambda: _load_program(program_id))
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
-    return program
+    return body.to_response(request, headers=validator_headers(make_etag("program", program_id, version), version))
 
 
 
@@ -40,13 +84,22 @@ async def get_program_by_id(program_id: int) -> ProgramSchema:
     "/add_program",
     response_model=ProgramSchema,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def add_program(program_dto: ProgramCreateUpdateSchema):
+async def add_program(program_dto: ProgramCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_program = await programs_repo.create_program(session=session, program=program_dto)
-    except Error as error:
+            new_program = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_program",
+                dto=program_dto,
+                create=programs_repo.create,
+            )
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_program
 
@@ -55,29 +108,53 @@ async def add_program(program_dto: ProgramCreateUpdateSchema):
     "/update_program/{id}",
     response_model=ProgramSchema,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def update_program(program_id: int, program_dto: ProgramCreateUpdateSchema):
+async def update_program(
+    program_id: int,
+    program_dto: ProgramCreateUpdateSchema,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
+):
     try:
+        expected_version = parse_if_match(if_match, "program", program_id)
         async with database.session() as session:
-            updated_program = await programs_repo.update_program(
+            updated_program = await programs_repo.update(
                 session=session,
-                program_id=program_id,
-                program=program_dto,
+                entity_id=program_id,
+                dto=program_dto,
+                expected_version=expected_version,
             )
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except PreconditionFailed as error:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=error.message)
 
+    response.headers.update(
+        validator_headers(make_etag("program", updated_program.id, updated_program.updated_at), updated_program.updated_at)
+    )
     return updated_program
 
 
 @program_router.delete(
     "/delete_program/{id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_200_OK: {"model": CascadeDeleteSchema}, status.HTTP_202_ACCEPTED: {"model": JobSchema}},
+    dependencies=[Depends(invalidates_schedule)],
 )
-async def delete_program(program_id: int):
+async def delete_program(program_id: int, cascade: bool = False, background: bool = False):
+    if cascade and background:
+        async with database.session() as session:
+            job = await jobs_repo.enqueue_job(session=session, kind=CASCADE_DELETE_PROGRAM, payload={"program_id": program_id})
+        job_worker.wake()
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.model_dump(mode="json"))
+
     try:
         async with database.session() as session:
-            program = await programs_repo.delete_program(session=session, program_id=program_id)
+            if cascade:
+                report = await programs_repo.delete_program_cascade(session=session, program_id=program_id)
+                return JSONResponse(content=CascadeDeleteSchema(deleted=report).model_dump())
+            program = await programs_repo.delete(session=session, entity_id=program_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
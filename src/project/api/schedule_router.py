@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request, status
+
+from project.api.depends import database, schedule_cache, schedule_repo, single_flight
+from project.core.compression import PrecompressedBody
+from project.core.config import settings
+from project.schemas.models import ScheduleNowSchema, ScheduleSlotSchema
+from project.core.deadline import with_deadline
+
+
+schedule_router = APIRouter()
+
+NOW_CACHE_KEY = "now"
+
+
+@schedule_router.get(
+    "/schedule",
+    response_model=list[ScheduleSlotSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_schedule(
+    schedule_date: Annotated[date | None, Query(alias="date")] = None,
+) -> list[ScheduleSlotSchema]:
+    day = schedule_date or date.today()
+    slots = await database.read(schedule_repo.get_slots, date_from=day, date_to=day)
+
+    return slots
+
+
+async def _load_schedule_now() -> PrecompressedBody:
+    generation = schedule_cache.generation
+    now = datetime.now()
+    # Вчерашний день нужен для передач, начавшихся до полуночи.
+    slots = await database.read(
+        schedule_repo.get_slots,
+        date_from=now.date() - timedelta(days=1),
+        date_to=now.date() + timedelta(days=1),
+    )
+
+    current = None
+    upcoming = None
+    for slot in slots:
+        if slot.starts_at <= now < slot.ends_at:
+            current = slot
+        elif slot.starts_at > now and upcoming is None:
+            upcoming = slot
+
+    # Ответ не меняется до конца текущего слота или начала следующего.
+    ttl = settings.SCHEDULE_CACHE_MAX_SEC
+    for boundary in (current and current.ends_at, upcoming and upcoming.starts_at):
+        if boundary:
+            ttl = min(ttl, (boundary - now).total_seconds())
+
+    body = PrecompressedBody(ScheduleNowSchema(current=current, next=upcoming).model_dump_json().encode())
+    schedule_cache.set(NOW_CACHE_KEY, body, ttl_sec=ttl, generation=generation)
+    return body
+
+
+@schedule_router.get(
+    "/schedule/now",
+    response_model=ScheduleNowSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_schedule_now(request: Request) -> ScheduleNowSchema:
+    body = schedule_cache.get(NOW_CACHE_KEY)
+    if body is None:
+        body = await single_flight.do(("schedule_now", NOW_CACHE_KEY), _load_schedule_now)
+
+    return body.to_response(request)
@@ -1,23 +1,72 @@
+from datetime import date
+
 from fastapi import APIRouter, HTTPException, status
 from project.api.depends import database
 from project.api.depends import song_requests_repo
-from project.schemas.models import SongRequestCreateUpdateSchema, SongRequestSchema
-from project.core.exceptions import Error, ForeignKeyViolationError, NotFound
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.schemas.models import SongRequestCreateUpdateSchema, SongRequestSchema, MultiGetSchema
+from project.core.exceptions import Error, ForeignKeyViolationError, NotFound, AlreadyExists, IdempotencyKeyReused
+from project.core.deadline import with_deadline
+from project.core.config import settings
 
 song_requests_router = APIRouter()
 
+
+def _add_months(month_start: date, months: int) -> date:
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+async def _check_request_date(request_date: date) -> None:
+    """Дата заявки должна попадать в окно секций: иначе строка уйдёт в DEFAULT или в удаляемый месяц.
+
+    Текущий месяц берётся по часам базы, как в ensure/drop_song_requests_partitions: часы и часовой пояс
+    приложения на границе месяца могут с ними расходиться.
+    """
+    current_month = await database.read(song_requests_repo.get_current_month)
+    if request_date >= _add_months(current_month, settings.SONG_REQUESTS_PARTITIONS_AHEAD + 1):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"request_date {request_date} is too far in the future",
+        )
+    if settings.SONG_REQUESTS_RETENTION_MONTHS > 0 and request_date < _add_months(
+        current_month, -settings.SONG_REQUESTS_RETENTION_MONTHS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"request_date {request_date} is older than the retention window",
+        )
+
+
 @song_requests_router.get(
     "/all_requests",
     response_model=list[SongRequestSchema],
     status_code=status.HTTP_200_OK,
 )
-async def get_all_requests() -> list[SongRequestSchema]:
-    async with database.session() as session:
-        all_requests = await song_requests_repo.get_all_song_requests(session)
+@with_deadline()
+async def get_all_requests(
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[SongRequestSchema]:
+    all_requests = await database.read(song_requests_repo.get_all, date_from=date_from, date_to=date_to)
     
     return all_requests
 
 
+@song_requests_router.get(
+    "/requests",
+    response_model=MultiGetSchema[SongRequestSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_requests_by_ids(ids: str) -> MultiGetSchema[SongRequestSchema]:
+    request_ids = parse_ids(ids)
+    requests = await database.read(song_requests_repo.get_many_by_ids, ids=request_ids)
+
+    return in_request_order(request_ids, requests)
+
+
 @song_requests_router.get(
     "/request/{id}",
     response_model=SongRequestSchema,
@@ -25,8 +74,7 @@ async def get_all_requests() -> list[SongRequestSchema]:
 )
 async def get_request_by_id(request_id: int) -> SongRequestSchema:
     try:
-        async with database.session() as session:
-            request = await song_requests_repo.get_song_request_by_id(session=session, song_request_id=request_id)
+        request = await database.read(song_requests_repo.get_by_id, entity_id=request_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -38,14 +86,23 @@ async def get_request_by_id(request_id: int) -> SongRequestSchema:
     response_model=SongRequestSchema,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_request(request_dto: SongRequestCreateUpdateSchema):
+async def add_request(request_dto: SongRequestCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
+    await _check_request_date(request_dto.request_date)
     try:
         async with database.session() as session:
-            new_request = await song_requests_repo.create_song_request(session=session, song_request=request_dto)
+            new_request = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_request",
+                dto=request_dto,
+                create=song_requests_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_request
 
@@ -56,12 +113,13 @@ async def add_request(request_dto: SongRequestCreateUpdateSchema):
     status_code=status.HTTP_200_OK,
 )
 async def update_request(request_id: int, request_dto: SongRequestCreateUpdateSchema):
+    await _check_request_date(request_dto.request_date)
     try:
         async with database.session() as session:
-            updated_request = await song_requests_repo.update_song_request(
+            updated_request = await song_requests_repo.update(
                 session=session,
-                request_id=request_id,
-                song_request_id=request_dto,
+                entity_id=request_id,
+                dto=request_dto,
             )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
@@ -78,7 +136,7 @@ async def update_request(request_id: int, request_dto: SongRequestCreateUpdateSc
 async def delete_request(request_id: int):
     try:
         async with database.session() as session:
-            request = await song_requests_repo.delete_song_request(session=session, song_request_id=request_id)
+            request = await song_requests_repo.delete(session=session, entity_id=request_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
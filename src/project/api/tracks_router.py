@@ -1,51 +1,172 @@
-from fastapi import APIRouter, HTTPException, status
+import base64
+import json
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response, status
 from project.api.depends import database
-from project.api.depends import tracks_repo
-from project.schemas.models import TrackCreateUpdateSchema, TrackSchema
-from project.core.exceptions import Error, ForeignKeyViolationError, NotFound
+from project.api.depends import track_listing_repo, track_neighbours_repo, tracks_repo
+from project.api.multi_get import in_request_order, parse_ids
+from project.api.idempotency import IdempotencyKeyHeader, create_once
+from project.api.conditional import (
+    has_conditions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    parse_if_match,
+    validator_headers,
+)
+from project.schemas.models import (
+    MultiGetSchema,
+    SimilarTrackSchema,
+    TrackCreateUpdateSchema,
+    TrackListingPageSchema,
+    TrackRequestsCountSchema,
+    TrackSchema,
+)
+from project.core.exceptions import Error, ForeignKeyViolationError, NotFound, PreconditionFailed, AlreadyExists, IdempotencyKeyReused
+from project.core.config import settings
+from project.core.deadline import with_deadline
 
 tracks_router = APIRouter()
 
+
+def _encode_cursor(track_name: str, track_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([track_name, track_id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        track_name, track_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        track_name = track_id = None
+    if not isinstance(track_name, str) or not isinstance(track_id, int):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
+
+    return track_name, track_id
+
+
 @tracks_router.get(
     "/all_tracks",
     response_model=list[TrackSchema],
     status_code=status.HTTP_200_OK,
 )
+@with_deadline()
 async def get_all_tracks() -> list[TrackSchema]:
-    async with database.session() as session:
-        all_tracks = await tracks_repo.get_all_tracks(session)
+    all_tracks = await database.read(tracks_repo.get_all)
     
     return all_tracks
 
 
+@tracks_router.get(
+    "/tracks",
+    response_model=MultiGetSchema[TrackSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_tracks_by_ids(ids: str) -> MultiGetSchema[TrackSchema]:
+    track_ids = parse_ids(ids)
+    tracks = await database.read(tracks_repo.get_many_by_ids, ids=track_ids)
+
+    return in_request_order(track_ids, tracks)
+
+
+@tracks_router.get(
+    "/tracks/listing",
+    response_model=TrackListingPageSchema,
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_tracks_listing(
+    limit: Annotated[int, Query(ge=1, le=settings.TRACK_LISTING_MAX_LIMIT)] = 50,
+    cursor: str | None = None,
+) -> TrackListingPageSchema:
+    """Треки по названию с именами исполнителя, жанра и альбома; следующая страница — по next_cursor."""
+    after = _decode_cursor(cursor) if cursor else None
+    # Лишняя строка показывает, есть ли следующая страница.
+    tracks = await database.read(track_listing_repo.get_page, limit=limit + 1, after=after)
+
+    next_cursor = None
+    if len(tracks) > limit:
+        tracks = tracks[:limit]
+        next_cursor = _encode_cursor(tracks[-1].track_name, tracks[-1].id)
+
+    return TrackListingPageSchema(items=tracks, next_cursor=next_cursor)
+
+
 @tracks_router.get(
     "/track/{id}",
     response_model=TrackSchema,
     status_code=status.HTTP_200_OK,
 )
-async def get_track_by_id(track_id: int) -> TrackSchema:
+async def get_track_by_id(track_id: int, request: Request, response: Response) -> TrackSchema:
     try:
-        async with database.session() as session:
-            track = await tracks_repo.get_track_by_id(session=session, track_id=track_id)
+        if has_conditions(request):
+            version = await database.read(tracks_repo.get_version, entity_id=track_id)
+            etag = make_etag("track", track_id, version)
+            if is_not_modified(request, etag, version):
+                return not_modified_response(etag, version)
+        track = await database.read(tracks_repo.get_by_id, entity_id=track_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
+    response.headers.update(validator_headers(make_etag("track", track.id, track.updated_at), track.updated_at))
     return track
 
 
+@tracks_router.get(
+    "/track/{track_id}/requests_count",
+    response_model=TrackRequestsCountSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_track_requests_count(track_id: int) -> TrackRequestsCountSchema:
+    # Отдельно от /track/{id}: счётчик меняется с каждой заявкой и не входит в версию трека.
+    try:
+        requests_count = await database.read(tracks_repo.get_requests_count, track_id=track_id)
+    except NotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    return requests_count
+
+
+@tracks_router.get(
+    "/track/{track_id}/similar",
+    response_model=list[SimilarTrackSchema],
+    status_code=status.HTTP_200_OK,
+)
+@with_deadline()
+async def get_similar_tracks(
+    track_id: int,
+    limit: Annotated[int, Query(ge=1, le=settings.TRACK_NEIGHBOURS_TOP_K)] = 10,
+) -> list[SimilarTrackSchema]:
+    try:
+        similar = await database.read(track_neighbours_repo.get_similar, track_id=track_id, limit=limit)
+    except NotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+
+    return similar
+
+
 @tracks_router.post(
     "/add_track",
     response_model=TrackSchema,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_track(track_dto: TrackCreateUpdateSchema):
+async def add_track(track_dto: TrackCreateUpdateSchema, idempotency_key: IdempotencyKeyHeader = None):
     try:
         async with database.session() as session:
-            new_track = await tracks_repo.create_track(session=session, track=track_dto)
+            new_track = await create_once(
+                session=session,
+                key=idempotency_key,
+                scope="add_track",
+                dto=track_dto,
+                create=tracks_repo.create,
+            )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-    except Error as error:
+    except (Error, AlreadyExists) as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except IdempotencyKeyReused as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error.message)
 
     return new_track
 
@@ -55,19 +176,31 @@ async def add_track(track_dto: TrackCreateUpdateSchema):
     response_model=TrackSchema,
     status_code=status.HTTP_200_OK,
 )
-async def update_track(track_id: int, track_dto: TrackCreateUpdateSchema):
+async def update_track(
+    track_id: int,
+    track_dto: TrackCreateUpdateSchema,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
+):
     try:
+        expected_version = parse_if_match(if_match, "track", track_id)
         async with database.session() as session:
-            updated_track = await tracks_repo.update_track(
+            updated_track = await tracks_repo.update(
                 session=session,
-                track_id=track_id,
-                track=track_dto,
+                entity_id=track_id,
+                dto=track_dto,
+                expected_version=expected_version,
             )
     except ForeignKeyViolationError as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except PreconditionFailed as error:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=error.message)
 
+    response.headers.update(
+        validator_headers(make_etag("track", updated_track.id, updated_track.updated_at), updated_track.updated_at)
+    )
     return updated_track
 
 
@@ -78,7 +211,7 @@ async def update_track(track_id: int, track_dto: TrackCreateUpdateSchema):
 async def delete_track(track_id: int):
     try:
         async with database.session() as session:
-            track = await tracks_repo.delete_track(session=session, track_id=track_id)
+            track = await tracks_repo.delete(session=session, entity_id=track_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -4,7 +4,8 @@ from project.schemas.user import UserSchema, UserCreateUpdateSchema
 
 from project.core.exceptions import NotFound, AlreadyExists
 from project.api.depends import database, user_repo, get_current_user, check_for_admin_access
-from project.resource.auth import get_password_hash
+from project.resource.auth import get_password_hash_async
+from project.core.deadline import with_deadline
 
 
 user_router = APIRouter()
@@ -16,9 +17,9 @@ user_router = APIRouter()
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_current_user)],
 )
+@with_deadline()
 async def get_all_users() -> list[UserSchema]:
-    async with database.session() as session:
-        all_users = await user_repo.get_all_users(session=session)
+    all_users = await database.read(user_repo.get_all)
 
     return all_users
 
@@ -33,8 +34,7 @@ async def get_user_by_id(
     user_id: int,
 ) -> UserSchema:
     try:
-        async with database.session() as session:
-            user = await user_repo.get_user_by_id(session=session, user_id=user_id)
+        user = await database.read(user_repo.get_by_id, entity_id=user_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
@@ -52,9 +52,9 @@ async def add_user(
 ) -> UserSchema:
     # check_for_admin_access(user=current_user)
     try:
+        user_dto.password = await get_password_hash_async(password=user_dto.password)
         async with database.session() as session:
-            user_dto.password = get_password_hash(password=user_dto.password)
-            new_user = await user_repo.create_user(session=session, user=user_dto)
+            new_user = await user_repo.create(session=session, dto=user_dto)
     except AlreadyExists as error:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
 
@@ -73,12 +73,12 @@ async def update_user(
 ) -> UserSchema:
     check_for_admin_access(user=current_user)
     try:
+        user_dto.password = await get_password_hash_async(password=user_dto.password)
         async with database.session() as session:
-            user_dto.password = get_password_hash(password=user_dto.password)
-            updated_user = await user_repo.update_user(
+            updated_user = await user_repo.update(
                 session=session,
-                user_id=user_id,
-                user=user_dto,
+                entity_id=user_id,
+                dto=user_dto,
             )
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -97,7 +97,7 @@ async def delete_user(
     check_for_admin_access(user=current_user)
     try:
         async with database.session() as session:
-            user = await user_repo.delete_user(session=session, user_id=user_id)
+            user = await user_repo.delete(session=session, entity_id=user_id)
     except NotFound as error:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
 
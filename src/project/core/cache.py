@@ -0,0 +1,47 @@
+import time
+from typing import Generic, Hashable, TypeVar
+
+from project.core.metrics import Counter
+from project.core.station import station_schema
+
+
+T = TypeVar("T")
+
+cache_requests = Counter(
+    "cache_requests_total",
+    "In-process cache lookups",
+    labelnames=("cache", "result"),
+)
+
+
+class ExpiringCache(Generic[T]):
+    """Кэш в памяти воркера, где каждая запись живёт до своего собственного срока.
+
+    Ключи отдельные для каждой станции; clear() сбрасывает записи всех станций.
+    Поколение растёт при каждом clear(): значение, загруженное до сброса, не попадёт в кэш после него.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.generation = 0
+        self._entries: dict[Hashable, tuple[T, float]] = {}
+
+    def get(self, key: Hashable) -> T | None:
+        entry = self._entries.get((station_schema(), key))
+        if entry is None or entry[1] <= time.monotonic():
+            cache_requests.inc(self.name, "miss")
+            return None
+
+        cache_requests.inc(self.name, "hit")
+        return entry[0]
+
+    def set(self, key: Hashable, value: T, ttl_sec: float, generation: int | None = None) -> None:
+        """generation — поколение на момент начала загрузки; если кэш с тех пор сбрасывали, запись пропускается."""
+        if generation is not None and generation != self.generation:
+            return
+        if ttl_sec > 0:
+            self._entries[(station_schema(), key)] = (value, time.monotonic() + ttl_sec)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
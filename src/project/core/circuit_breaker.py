@@ -0,0 +1,64 @@
+import time
+
+from project.core.exceptions import CircuitOpenError
+from project.core.metrics import Counter, Gauge
+
+
+circuit_open = Gauge(
+    "circuit_breaker_open",
+    "1 while the circuit breaker rejects calls",
+    labelnames=("name",),
+)
+circuit_rejections = Counter(
+    "circuit_breaker_rejections_total",
+    "Calls rejected without reaching the backend",
+    labelnames=("name",),
+)
+
+
+class CircuitBreaker:
+    """Размыкается после failure_threshold сбоев подряд и отклоняет вызовы reset_timeout_sec.
+
+    Затем пропускает один пробный вызов: успех замыкает автомат, сбой снова размыкает.
+    before_call() сообщает вызову, пробный ли он; флаг пробы снимает только release() этого вызова.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_sec: float) -> None:
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_sec = reset_timeout_sec
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+        circuit_open.set(0, name)
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> bool:
+        """Пропускает или отклоняет вызов; True — вызов пробный, его нужно передать в release()."""
+        if self._opened_at is None:
+            return False
+        if self._probe_in_flight or time.monotonic() - self._opened_at < self._reset_timeout_sec:
+            circuit_rejections.inc(self.name)
+            raise CircuitOpenError(message=f"{self.name} circuit breaker is open")
+        self._probe_in_flight = True
+        return True
+
+    def release(self, probe: bool) -> None:
+        """Завершает вызов; флаг пробы снимает только сам пробный вызов, а не запросы, начатые до размыкания."""
+        if probe:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._opened_at is not None:
+            self._opened_at = None
+            circuit_open.set(0, self.name)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+            circuit_open.set(1, self.name)
@@ -0,0 +1,238 @@
+import zlib
+from typing import Final
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - опциональная зависимость
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - опциональная зависимость
+    zstandard = None
+
+
+GZIP: Final[str] = "gzip"
+BROTLI: Final[str] = "br"
+ZSTD: Final[str] = "zstd"
+
+EXCLUDED_MEDIA_TYPES: Final[tuple[str, ...]] = ("text/event-stream",)
+COMPRESSIBLE_MEDIA_TYPES: Final[tuple[str, ...]] = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def supported_encodings(preferred: str) -> tuple[str, ...]:
+    """Кодировки из настроек, для которых установлен компрессор, в порядке предпочтения."""
+    installed = {GZIP: True, BROTLI: brotli is not None, ZSTD: zstandard is not None}
+    encodings = (encoding.strip() for encoding in preferred.split(","))
+    return tuple(encoding for encoding in encodings if installed.get(encoding))
+
+
+def choose_encoding(accept_encoding: str, encodings: tuple[str, ...]) -> str | None:
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=level)
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress(body)
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class _StreamCompressor:
+    """Инкрементальный компрессор для потоковых ответов."""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        self._encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(quality=level)
+        elif encoding == ZSTD:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, *, final: bool) -> bytes:
+        if self._encoding == BROTLI:
+            data = self._compressor.process(chunk)
+            return data + (self._compressor.finish() if final else self._compressor.flush())
+        if self._encoding == ZSTD:
+            data = self._compressor.compress(chunk)
+            return data + (self._compressor.flush() if final else self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class PrecompressedBody:
+    """Тело ответа для кэшей: сжатые варианты считаются один раз и переиспользуются на каждом попадании."""
+
+    __slots__ = ("raw", "media_type", "_encoded")
+
+    def __init__(self, raw: bytes, media_type: str = "application/json") -> None:
+        self.raw = raw
+        self.media_type = media_type
+        self._encoded: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str, level: int) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.raw, encoding, level)
+        return body
+
+    def to_response(
+        self,
+        request: Request,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        from project.core.config import settings
+
+        response_headers = {"Vary": "Accept-Encoding", **(headers or {})}
+        encoding = None
+        if len(self.raw) >= settings.COMPRESSION_MINIMUM_SIZE:
+            encoding = choose_encoding(
+                accept_encoding=request.headers.get("accept-encoding", ""),
+                encodings=supported_encodings(settings.COMPRESSION_ENCODINGS),
+            )
+
+        if encoding is None:
+            return Response(self.raw, status_code=status_code, headers=response_headers, media_type=self.media_type)
+
+        response_headers["Content-Encoding"] = encoding
+        return Response(
+            self.encoded(encoding=encoding, level=settings.compression_levels[encoding]),
+            status_code=status_code,
+            headers=response_headers,
+            media_type=self.media_type,
+        )
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip/br/zstd (что доступно) начиная с minimum_size байт.
+
+    levels — уровень сжатия для каждой кодировки; у gzip, br и zstd шкалы разные.
+
+    Ответы, у которых уже выставлен Content-Encoding (например, отданные из кэша
+    через PrecompressedBody), пропускаются без повторного сжатия.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        levels: dict[str, int] | None = None,
+        encodings: str = "br,zstd,gzip",
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {GZIP: 6, BROTLI: 4, ZSTD: 3, **(levels or {})}
+        self.encodings = supported_encodings(encodings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, encoding)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send: Send | None = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: _StreamCompressor | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.middleware.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or media_type.startswith(EXCLUDED_MEDIA_TYPES)
+                or not media_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            await self._start()
+            await self.send(message)
+            return
+
+        if self.compressor is not None:
+            message["body"] = self.compressor.compress(body, final=not more_body)
+            await self.send(message)
+            return
+
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            if len(body) >= self.middleware.minimum_size:
+                message["body"] = compress(body, self.encoding, self.middleware.levels[self.encoding])
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(message["body"]))
+            await self._start()
+            await self.send(message)
+            return
+
+        self.compressor = _StreamCompressor(self.encoding, self.middleware.levels[self.encoding])
+        headers["Content-Encoding"] = self.encoding
+        del headers["Content-Length"]
+        message["body"] = self.compressor.compress(body, final=False)
+        await self._start()
+        await self.send(message)
+
+    async def _start(self) -> None:
+        if not self.started:
+            self.started = True
+            await self.send(self.initial_message)
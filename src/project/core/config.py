@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from pydantic import SecretStr
+from pydantic import Field, SecretStr
 
 
 class Settings(BaseSettings):
@@ -15,15 +15,81 @@ class Settings(BaseSettings):
     POSTGRES_USER: SecretStr
     POSTGRES_PASSWORD: SecretStr
     POSTGRES_RECONNECT_INTERVAL_SEC: int
+    # Станция → схема; запросы без станции идут в POSTGRES_SCHEMA.
+    STATIONS: dict[str, str] = {}
+    STATION_HEADER: str = "X-Station"
+    DB_READ_RETRY_ATTEMPTS: int = 3
+    DB_READ_RETRY_MAX_WAIT_SEC: float = 1.0
+    DB_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000
+
+    ROUTE_DEADLINE_SEC: float = 15.0
+    ROUTE_DEADLINES_SEC: dict[str, float] = {"get_all_requests": 5.0}
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     SECRET_AUTH_KEY: SecretStr
     AUTH_ALGORITHM: str
 
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # Шкалы уровней у кодеков разные: gzip 1–9, brotli 0–11, zstd 1–22.
+    COMPRESSION_LEVEL_GZIP: int = Field(default=6, ge=1, le=9)
+    COMPRESSION_LEVEL_BR: int = Field(default=4, ge=0, le=11)
+    COMPRESSION_LEVEL_ZSTD: int = Field(default=3, ge=1, le=22)
+    COMPRESSION_ENCODINGS: str = "br,zstd,gzip"
+
+    CHANGE_FEED_QUEUE_SIZE: int = 256
+    CHANGE_FEED_HEARTBEAT_SEC: int = 15
+
+    MULTI_GET_MAX_IDS: int = 500
+    TRACK_LISTING_MAX_LIMIT: int = 200
+
+    SCHEDULE_CACHE_MAX_SEC: int = 300
+    PLAYLIST_ENFORCE_DURATION: bool = False
+
+    JOBS_ENABLED: bool = True
+    JOBS_CONCURRENCY: int = 2
+    JOBS_POLL_INTERVAL_SEC: float = 1.0
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_STALE_AFTER_SEC: int = 300
+    JOBS_HEARTBEAT_INTERVAL_SEC: int = 60
+
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MAINTENANCE_INTERVAL_SEC: int = 3600
+    SONG_REQUESTS_PARTITIONS_AHEAD: int = 3
+    SONG_REQUESTS_RETENTION_MONTHS: int = 0
+
+    IDEMPOTENCY_KEY_TTL_SEC: int = 86400
+    IDEMPOTENCY_CLEANUP_INTERVAL_SEC: int = 3600
+
+    REFERENCE_SNAPSHOT_ENABLED: bool = True
+    REFERENCE_SNAPSHOT_REFRESH_INTERVAL_SEC: int = 300
+
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_INTERVAL_MS: int = 100
+    LOOP_WATCHDOG_THRESHOLD_MS: int = 250
+
+    TRACK_NEIGHBOURS_ENABLED: bool = True
+    TRACK_NEIGHBOURS_REFRESH_INTERVAL_SEC: int = 300
+    TRACK_NEIGHBOURS_TOP_K: int = 20
+    TRACK_NEIGHBOURS_BATCH_BASKETS: int = 500
+
+    @property
+    def compression_levels(self) -> dict[str, int]:
+        return {
+            "gzip": self.COMPRESSION_LEVEL_GZIP,
+            "br": self.COMPRESSION_LEVEL_BR,
+            "zstd": self.COMPRESSION_LEVEL_ZSTD,
+        }
+
     @property
     def postgres_url(self) -> str:
         creds = f"{self.POSTGRES_USER.get_secret_value()}:{self.POSTGRES_PASSWORD.get_secret_value()}"
         return f"postgresql+asyncpg://{creds}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def postgres_dsn(self) -> str:
+        creds = f"{self.POSTGRES_USER.get_secret_value()}:{self.POSTGRES_PASSWORD.get_secret_value()}"
+        return f"postgresql://{creds}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from project.core.config import settings
+from project.core.exceptions import DeadlineExceeded
+from project.core.metrics import Counter
+
+
+T = TypeVar("T")
+
+# Запас, за который Postgres успевает сам отменить запрос по statement_timeout
+# раньше, чем asyncio оборвёт ожидание ответа посреди протокола.
+CANCEL_GRACE_SEC = 0.25
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+deadlines_exceeded = Counter(
+    "route_deadlines_exceeded_total",
+    "Requests aborted with 504 after exceeding their deadline",
+    labelnames=("route",),
+)
+requests_cancelled = Counter(
+    "requests_cancelled_on_disconnect_total",
+    "Requests cancelled because the client disconnected",
+)
+
+
+def remaining_sec() -> float | None:
+    """Сколько осталось до срока текущего запроса; None, если срок не задан."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def route_deadline_sec(name: str, seconds: float | None = None) -> float:
+    if name in settings.ROUTE_DEADLINES_SEC:
+        return settings.ROUTE_DEADLINES_SEC[name]
+    return seconds if seconds is not None else settings.ROUTE_DEADLINE_SEC
+
+
+def with_deadline(
+    seconds: float | None = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Ограничивает время работы маршрута.
+
+    Срок берётся из ROUTE_DEADLINES_SEC по имени функции, иначе seconds, иначе ROUTE_DEADLINE_SEC.
+    Сессии, открытые внутри, получают statement_timeout по оставшемуся времени.
+    """
+
+    def decorator(endpoint: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        name = endpoint.__name__
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            budget = route_deadline_sec(name, seconds)
+            token = _deadline.set(time.monotonic() + budget)
+            timeout = asyncio.timeout(budget + CANCEL_GRACE_SEC)
+            try:
+                async with timeout:
+                    return await endpoint(*args, **kwargs)
+            except DeadlineExceeded:
+                deadlines_exceeded.inc(name)
+                raise
+            except TimeoutError:
+                if not timeout.expired():
+                    raise
+                deadlines_exceeded.inc(name)
+                raise DeadlineExceeded(message=f"{name} exceeded its {budget:g}s deadline")
+            finally:
+                _deadline.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+class CancelOnDisconnectMiddleware:
+    """Отменяет обработку запроса, если клиент закрыл соединение, не дождавшись ответа.
+
+    Сообщения клиента читает только middleware и передаёт приложению через очередь,
+    поэтому приложение и наблюдатель не конкурируют за receive().
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def pump() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        async def app_receive() -> Message:
+            if disconnected.is_set() and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        # Имя задачи с маршрутом видно в логах LoopWatchdog и в отладчике.
+        handler = asyncio.create_task(
+            self.app(scope, app_receive, send),
+            name=f"{scope['method']} {scope['path']}",
+        )
+        watcher = asyncio.create_task(pump())
+        disconnect = asyncio.create_task(disconnected.wait())
+        try:
+            await asyncio.wait((handler, disconnect), return_when=asyncio.FIRST_COMPLETED)
+            if not handler.done():
+                requests_cancelled.inc()
+                handler.cancel()
+            try:
+                await handler
+            except asyncio.CancelledError:
+                if not disconnected.is_set():
+                    raise
+        finally:
+            for task in (watcher, disconnect, handler):
+                task.cancel()
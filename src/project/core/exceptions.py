@@ -3,7 +3,7 @@ from typing import Final
 from fastapi import HTTPException, status
 
 
-class DatabaseError(BaseException):
+class DatabaseError(Exception):
     _ERROR_MESSAGE_TEMPLATE: Final[str] = "Произошла ошибка в базе данных: {message}"
 
     def __init__(self, message: str) -> None:
@@ -11,6 +11,22 @@ class DatabaseError(BaseException):
         super().__init__(self.message)
 
 
+class DatabaseUnavailable(DatabaseError):
+    """Временная недоступность базы: обрыв соединения, отказ в подключении, переполненный пул."""
+    _ERROR_MESSAGE_TEMPLATE: Final[str] = "База данных временно недоступна: {message}"
+
+
+class CircuitOpenError(DatabaseUnavailable):
+    """Запрос отклонён без обращения к базе: автомат разомкнут после серии сбоев."""
+
+
+class DeadlineExceeded(Exception):
+    """Запрос не уложился в отведённый маршруту срок; запрос к базе отменён."""
+    def __init__(self, message: str = "Deadline exceeded") -> None:
+        self.message = message
+        super().__init__(message)
+
+
 class CredentialsException(HTTPException):
     def __init__(self, detail: str) -> None:
         self.detail = detail
@@ -47,4 +63,18 @@ class AlreadyExists(BaseException):
     """Исключение, вызываемое, если программа уже существует."""
     def __init__(self, message: str = "Already exists"):
         self.message = message
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+
+class PreconditionFailed(BaseException):
+    """Исключение, вызываемое, если версия записи не совпала с If-Match."""
+    def __init__(self, message: str = "Precondition failed"):
+        self.message = message
+        super().__init__(message)
+
+
+class IdempotencyKeyReused(BaseException):
+    """Исключение, вызываемое, если Idempotency-Key уже использован для другого запроса."""
+    def __init__(self, message: str = "Idempotency key reused"):
+        self.message = message
+        super().__init__(message)
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from project.core.metrics import Counter, Gauge
+
+
+logger = logging.getLogger(__name__)
+
+loop_lag = Gauge("event_loop_lag_seconds", "Delay of the last event loop heartbeat beyond its interval")
+loop_stalls = Counter("event_loop_stalls_total", "Event loop stalls longer than the watchdog threshold")
+loop_stall_seconds = Counter("event_loop_stall_seconds_total", "Total time the event loop spent stalled")
+
+
+class LoopWatchdog:
+    """Следит за задержкой event loop и логирует стек, на котором loop завис.
+
+    Задача в loop раз в interval отмечает пульс и меряет опоздание. Отдельный поток
+    замечает, что пульса нет дольше threshold, и снимает стек потока loop прямо во время зависания,
+    пока блокирующий код ещё выполняется.
+    """
+
+    def __init__(self, interval_sec: float, threshold_sec: float) -> None:
+        self._interval_sec = interval_sec
+        self._threshold_sec = threshold_sec
+        self._last_beat = time.monotonic()
+        self._heartbeat: asyncio.Task | None = None
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+
+    async def start(self) -> None:
+        if self._heartbeat is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat = asyncio.create_task(self._beat(), name="loop-watchdog")
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watcher.start()
+
+    async def stop(self) -> None:
+        if self._heartbeat is None:
+            return
+        self._stop.set()
+        self._heartbeat.cancel()
+        try:
+            await self._heartbeat
+        except asyncio.CancelledError:
+            pass
+        await asyncio.to_thread(self._watcher.join)
+        self._heartbeat = None
+        self._watcher = None
+
+    async def _beat(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self._interval_sec)
+            self._last_beat = time.monotonic()
+            lag = max(0.0, self._last_beat - started - self._interval_sec)
+            loop_lag.set(lag)
+            if lag >= self._threshold_sec:
+                loop_stalls.inc()
+                loop_stall_seconds.inc(amount=lag)
+                logger.warning("Event loop was blocked for %.0f ms", lag * 1000)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self._threshold_sec / 2):
+            last_beat = self._last_beat
+            stalled_for = time.monotonic() - last_beat - self._interval_sec
+            # Одно зависание — одна запись со стеком, пока loop не отметит новый пульс.
+            if stalled_for < self._threshold_sec or last_beat == reported_beat:
+                continue
+            reported_beat = last_beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            task = self._current_task()
+            logger.warning(
+                "Event loop blocked for %.0f ms so far in task %s:\n%s",
+                stalled_for * 1000,
+                task.get_name() if task is not None else "<no task>",
+                "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>",
+            )
+
+    def _current_task(self) -> asyncio.Task | None:
+        """Задача, занявшая loop, — только для подписи в логе.
+
+        asyncio.current_task() из другого потока не вызвать, поэтому читается внутренний словарь CPython;
+        если его нет, задача не называется. Чтение не согласовано со снятым стеком: при зависании
+        loop стоит на месте и они совпадают, но в момент его оживления подпись может оказаться чужой.
+        """
+        current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+        if not isinstance(current_tasks, dict):
+            return None
+        return current_tasks.get(self._loop)
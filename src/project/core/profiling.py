@@ -0,0 +1,175 @@
+import asyncio
+import random
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from types import FrameType
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+ALLOCATION_FRAMES = 25
+
+
+def fold_stack(frame: FrameType | None) -> str:
+    """Стек в формате folded (flamegraph.pl, speedscope): от корня к листу через «;»."""
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class RouteProfiler:
+    """Сэмплирующий профилировщик для одного маршрута, включается и выключается без перезапуска.
+
+    Фоновый поток раз в interval снимает стек потока event loop и засчитывает его запросу,
+    чей кадр ProfilingMiddleware есть в этом стеке, — конкурентные запросы других маршрутов в профиль не попадают.
+    Состояние своё у каждого процесса: при нескольких воркерах профилируется тот, кто принял запрос.
+    """
+
+    def __init__(self) -> None:
+        self.endpoint: str | None = None
+        self.sample_rate = 0.0
+        self.interval_sec = 0.005
+        self.profiled_requests = 0
+        self._stacks: Counter[str] = Counter()
+        self._active: dict[FrameType, Counter[str]] = {}
+        self._lock = threading.Lock()
+        self._toggle_lock = asyncio.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._loop_thread_id: int | None = None
+        self._allocations_baseline: tracemalloc.Snapshot | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.endpoint is not None
+
+    @property
+    def samples(self) -> int:
+        return sum(self._stacks.values())
+
+    @property
+    def traces_allocations(self) -> bool:
+        return self._allocations_baseline is not None
+
+    async def enable(self, endpoint: str, sample_rate: float, interval_ms: float, trace_allocations: bool) -> None:
+        """Предыдущие результаты сбрасываются."""
+        async with self._toggle_lock:
+            await self._disable()
+            self._start(endpoint, sample_rate, interval_ms, trace_allocations)
+
+    async def disable(self) -> None:
+        async with self._toggle_lock:
+            await self._disable()
+
+    def _start(self, endpoint: str, sample_rate: float, interval_ms: float, trace_allocations: bool) -> None:
+        self._stacks.clear()
+        self.profiled_requests = 0
+        self.sample_rate = sample_rate
+        self.interval_sec = interval_ms / 1000
+        self._loop_thread_id = threading.get_ident()
+        if trace_allocations:
+            tracemalloc.start(ALLOCATION_FRAMES)
+            self._allocations_baseline = tracemalloc.take_snapshot()
+
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="route-profiler", daemon=True)
+        self._sampler.start()
+        self.endpoint = endpoint
+
+    async def _disable(self) -> None:
+        self.endpoint = None
+        if self._sampler is not None:
+            self._stop.set()
+            # Поток может быть посреди сэмпла: ждать его в event loop нельзя.
+            await asyncio.to_thread(self._sampler.join)
+            self._sampler = None
+        if self._allocations_baseline is not None:
+            self._allocations_baseline = None
+            tracemalloc.stop()
+
+    def should_profile(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+    def start_request(self, frame: FrameType) -> Counter[str]:
+        """frame — кадр корутины, обслуживающей запрос; он есть в стеке всё время, пока запрос выполняется."""
+        stacks: Counter[str] = Counter()
+        with self._lock:
+            self._active[frame] = stacks
+        return stacks
+
+    def finish_request(self, frame: FrameType, endpoint: str | None) -> None:
+        with self._lock:
+            stacks = self._active.pop(frame, None)
+            # Маршрут известен только после роутинга: чужие запросы отбрасываются здесь.
+            if stacks is not None and endpoint == self.endpoint:
+                self._stacks.update(stacks)
+                self.profiled_requests += 1
+
+    def folded_stacks(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def folded_allocations(self) -> str:
+        """Прирост памяти с момента включения по стекам выделения, в байтах, в формате folded."""
+        if self._allocations_baseline is None:
+            return ""
+        # Выделения самого профилировщика в отчёт не попадают.
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        lines = []
+        for stat in snapshot.compare_to(self._allocations_baseline, "traceback"):
+            if stat.size_diff <= 0:
+                continue
+            stack = ";".join(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback)
+            lines.append(f"{stack} {stat.size_diff}\n")
+        return "".join(lines)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            with self._lock:
+                if not self._active:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stacks = self._request_stacks(frame)
+                if stacks is None:
+                    continue
+                stacks[fold_stack(frame)] += 1
+
+    def _request_stacks(self, frame: FrameType | None) -> Counter[str] | None:
+        # Запрос определяется по самому снятому стеку, а не отдельным чтением текущей задачи:
+        # между двумя чтениями loop мог переключиться на другой запрос.
+        while frame is not None:
+            stacks = self._active.get(frame)
+            if stacks is not None:
+                return stacks
+            frame = frame.f_back
+        return None
+
+
+route_profiler = RouteProfiler()
+
+
+class ProfilingMiddleware:
+    """Пока профилирование выключено, стоит одной проверки атрибута на запрос."""
+
+    def __init__(self, app: ASGIApp, profiler: RouteProfiler = route_profiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.profiler.should_profile():
+            await self.app(scope, receive, send)
+            return
+
+        frame = sys._getframe()
+        self.profiler.start_request(frame)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            endpoint = scope.get("endpoint")
+            self.profiler.finish_request(frame, getattr(endpoint, "__name__", None))
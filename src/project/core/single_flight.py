@@ -0,0 +1,45 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from project.core.metrics import Counter
+from project.core.station import station_schema
+
+
+T = TypeVar("T")
+
+coalesced_requests = Counter(
+    "coalesced_requests_total",
+    "Reads served by joining an identical in-flight query",
+    labelnames=("entity",),
+)
+
+
+class SingleFlight:
+    """Объединяет одинаковые параллельные чтения в один запрос к БД.
+
+    Результат ничего не кэширует: как только запрос завершился, следующий вызов
+    с тем же ключом снова идёт в базу, поэтому устаревших данных не бывает.
+    Чтения разных станций не объединяются: станция входит в ключ.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: tuple[str, Hashable], fn: Callable[[], Awaitable[T]]) -> T:
+        flight_key = (station_schema(), key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            # Запрос выполняется отдельной задачей: отмена первого клиента не должна ронять остальных.
+            task = asyncio.ensure_future(fn())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._forget(flight_key, done))
+        else:
+            coalesced_requests.inc(key[0])
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,118 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator
+
+from starlette._utils import get_route_path
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+
+from project.core.config import settings
+from project.core.exceptions import DatabaseError
+
+
+logger = logging.getLogger(__name__)
+
+STATION_PATH_PREFIX = "/stations/"
+
+_schema: ContextVar[str | None] = ContextVar("station_schema", default=None)
+
+
+def station_schema() -> str:
+    """Схема станции текущего запроса или фоновой задачи; без станции — POSTGRES_SCHEMA."""
+    return _schema.get() or settings.POSTGRES_SCHEMA
+
+
+def station_schemas() -> list[str]:
+    """Все схемы, которые обслуживает процесс: схема по умолчанию и схемы из STATIONS."""
+    return list(dict.fromkeys([settings.POSTGRES_SCHEMA, *settings.STATIONS.values()]))
+
+
+@contextmanager
+def use_station(schema: str) -> Iterator[None]:
+    token = _schema.set(schema)
+    try:
+        yield
+    finally:
+        _schema.reset(token)
+
+
+def every_station(action: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Оборачивает фоновое действие так, что оно выполняется для каждой станции по очереди.
+
+    Сбой базы одной станции не мешает обработать остальные.
+    """
+
+    async def run() -> None:
+        for schema in station_schemas():
+            with use_station(schema):
+                try:
+                    await action()
+                except DatabaseError as error:
+                    logger.warning("Background task failed for schema %s: %s", schema, error.message)
+
+    return run
+
+
+def split_station_path(route_path: str) -> tuple[str | None, str]:
+    """«/stations/<имя>/all_genres» → («<имя>», «/all_genres»)."""
+    if not route_path.startswith(STATION_PATH_PREFIX):
+        return None, route_path
+    station, _, rest = route_path[len(STATION_PATH_PREFIX):].partition("/")
+    return station or None, "/" + rest
+
+
+def strip_station_raw_path(raw_path: bytes, root_path: str) -> bytes | None:
+    """Срезает /stations/<имя> из raw_path как есть, не перекодируя остальной путь; None, если префикса нет."""
+    prefix = STATION_PATH_PREFIX.encode()
+    # Процентное кодирование только удлиняет путь, поэтому префикс ищется не раньше длины root_path.
+    start = raw_path.find(prefix, len(root_path.encode()))
+    if start < 0:
+        return None
+    end = raw_path.find(b"/", start + len(prefix))
+    return raw_path[:start] + (raw_path[end:] if end >= 0 else b"/")
+
+
+class StationMiddleware:
+    """Определяет станцию запроса по префиксу пути /stations/<имя> или заголовку STATION_HEADER.
+
+    Запрос без станции обслуживается схемой POSTGRES_SCHEMA, как до появления станций.
+    Префикс срезается из пути, поэтому маршруты объявлены один раз для всех станций.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        route_path = get_route_path(scope)
+        station, rest = split_station_path(route_path)
+        if station is not None:
+            path = scope["path"][: len(scope["path"]) - len(route_path)] + rest
+            raw_path = scope.get("raw_path")
+            if raw_path is not None:
+                raw_path = strip_station_raw_path(raw_path, scope.get("root_path", ""))
+            scope = {**scope, "path": path, "raw_path": raw_path or path.encode()}
+        else:
+            station = Headers(scope=scope).get(settings.STATION_HEADER)
+
+        if station is None:
+            await self.app(scope, receive, send)
+            return
+
+        schema = settings.STATIONS.get(station)
+        if schema is None:
+            detail = f"Unknown station {station}"
+            if scope["type"] == "websocket":
+                await WebSocketClose(code=4404, reason=detail)(scope, receive, send)
+            else:
+                await JSONResponse({"detail": detail}, status_code=404)(scope, receive, send)
+            return
+
+        with use_station(schema):
+            await self.app(scope, receive, send)
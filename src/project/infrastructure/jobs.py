@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from project.core.config import settings
+from project.core.exceptions import AlreadyExists, DatabaseError, DatabaseUnavailable, Error, ForeignKeyViolationError, NotFound
+from project.core.station import station_schemas, use_station
+from project.infrastructure.postgres.database import PostgresDatabase
+from project.infrastructure.postgres.repository.jobs_repo import JobsRepository
+from project.schemas.models import JobSchema
+
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, dict], Awaitable[dict | None]]
+
+# Повторяется только недоступность базы; ошибки обработчика и данных повторно не исправятся.
+_RETRYABLE_ERRORS = (DatabaseUnavailable,)
+_JOB_ERRORS = (Exception, DatabaseError, Error, NotFound, ForeignKeyViolationError, AlreadyExists)
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Регистрирует обработчик задачи; обработчик получает свою сессию и payload задачи."""
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+
+    return decorator
+
+
+class JobWorker:
+    def __init__(self, database: PostgresDatabase, repository: JobsRepository) -> None:
+        self._database = database
+        self._repository = repository
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def wake(self) -> None:
+        """Будит воркеры сразу после постановки задачи, не дожидаясь следующего опроса."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"job-worker-{number}")
+            for number in range(settings.JOBS_CONCURRENCY)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while True:
+            # Очереди задач у каждой станции свои, воркер обходит их по кругу.
+            executed = False
+            for schema in station_schemas():
+                with use_station(schema):
+                    executed |= await self._run_one()
+
+            if not executed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOBS_POLL_INTERVAL_SEC)
+                except TimeoutError:
+                    pass
+
+    async def _run_one(self) -> bool:
+        """Захватывает и выполняет одну задачу станции; False, если очередь пуста."""
+        try:
+            async with self._database.session() as session:
+                job = await self._repository.claim_job(
+                    session=session,
+                    stale_after=timedelta(seconds=settings.JOBS_STALE_AFTER_SEC),
+                )
+        except DatabaseError as error:
+            logger.warning("Failed to claim job: %s", error.message)
+            return False
+
+        if job is None:
+            return False
+
+        heartbeat = asyncio.create_task(self._heartbeat(job), name=f"job-heartbeat-{job.id}")
+        try:
+            await self._execute(job)
+        except DatabaseError as error:
+            logger.warning("Failed to record result of job %s: %s", job.id, error.message)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+        return True
+
+    async def _heartbeat(self, job: JobSchema) -> None:
+        """Пока задача выполняется, продлевает locked_at, чтобы её не забрали как зависшую."""
+        while True:
+            await asyncio.sleep(settings.JOBS_HEARTBEAT_INTERVAL_SEC)
+            try:
+                async with self._database.session() as session:
+                    owned = await self._repository.touch_job(session=session, job_id=job.id, attempts=job.attempts)
+            except DatabaseError as error:
+                logger.warning("Failed to extend lock of job %s: %s", job.id, error.message)
+                continue
+            if not owned:
+                logger.warning("Job %s was reclaimed by another worker", job.id)
+                return
+
+    async def _execute(self, job: JobSchema) -> None:
+        handler = _handlers.get(job.kind)
+        if handler is None:
+            await self._finish(job, error=f"No handler registered for job kind {job.kind!r}")
+            return
+
+        # attempts растёт при каждом захвате: задача, раз за разом роняющая воркер, не должна крутиться вечно.
+        if job.attempts > settings.JOBS_MAX_ATTEMPTS:
+            await self._finish(job, error=f"Job abandoned after {job.attempts - 1} interrupted runs")
+            return
+
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(settings.JOBS_MAX_ATTEMPTS),
+                wait=wait_exponential_jitter(initial=0.5, max=30),
+                retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+                reraise=True,
+            ):
+                with attempt:
+                    async with self._database.session() as session:
+                        result = await handler(session, job.payload)
+        except _JOB_ERRORS as error:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            message = getattr(error, "message", None) or repr(error)
+            await self._finish(job, error=message)
+            return
+
+        await self._finish(job, result=result)
+
+    async def _finish(
+        self,
+        job: JobSchema,
+        result: dict | None = None,
+        error: str | None = None,
+    ) -> None:
+        async with self._database.session() as session:
+            if error is None:
+                owned = await self._repository.complete_job(
+                    session=session, job_id=job.id, attempts=job.attempts, result=result,
+                )
+            else:
+                owned = await self._repository.fail_job(
+                    session=session, job_id=job.id, attempts=job.attempts, error=error,
+                )
+        if not owned:
+            logger.warning("Result of job %s discarded: the job was reclaimed by another worker", job.id)
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from project.core.exceptions import AlreadyExists, DatabaseError, Error, ForeignKeyViolationError, NotFound
+
+
+logger = logging.getLogger(__name__)
+
+# Ошибки предметной области наследуют BaseException, поэтому перечислены отдельно от Exception.
+_TASK_ERRORS = (Exception, Error, NotFound, ForeignKeyViolationError, AlreadyExists)
+
+
+class PeriodicTask:
+    """Фоновая задача воркера, выполняющая action раз в interval_sec."""
+
+    def __init__(self, name: str, interval_sec: float, action: Callable[[], Awaitable[None]]) -> None:
+        self.name = name
+        self._interval_sec = interval_sec
+        self._action = action
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._action()
+            except DatabaseError as error:
+                logger.warning("Periodic task %s failed: %s", self.name, error.message)
+            except _TASK_ERRORS:
+                # Цикл завершает только отмена: иначе задача молча умерла бы до конца жизни процесса.
+                logger.exception("Periodic task %s failed", self.name)
+            await asyncio.sleep(self._interval_sec)
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, AsyncIterator
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+
+# Сколько кусков COPY может ждать отправки клиенту, прежде чем чтение из базы приостановится.
+COPY_BUFFER_CHUNKS = 16
+
+
+def compile_for_copy(connection: AsyncConnection, query: Select) -> tuple[str, list[Any]]:
+    """Компилирует запрос в SQL с $1, $2… для asyncpg, учитывая schema_translate_map соединения."""
+    schema_translate_map = connection.get_execution_options().get("schema_translate_map")
+    # render_schema_translate подставляет схемы прямо в текст запроса, как это делает сам execute().
+    # Параметр не описан в документации, поэтому версия SQLAlchemy в pyproject ограничена 2.0.x.
+    compiled = query.compile(
+        dialect=connection.dialect,
+        schema_translate_map=schema_translate_map,
+        render_schema_translate=bool(schema_translate_map),
+    )
+    params = [compiled.params[name] for name in compiled.positiontup or ()]
+    return compiled.string, params
+
+
+async def copy_to_csv(session: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Отдаёт результат запроса в CSV через COPY ... TO STDOUT.
+
+    Куски идут от Postgres к клиенту как есть, без объектов на каждую строку;
+    очередь ограничена, поэтому медленный клиент притормаживает чтение, а не копит его в памяти.
+    """
+    connection = await session.connection()
+    sql, params = compile_for_copy(connection, query)
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    chunks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=COPY_BUFFER_CHUNKS)
+
+    async def copy() -> None:
+        try:
+            await driver_connection.copy_from_query(sql, *params, output=chunks.put, format="csv", header=True)
+        except asyncio.CancelledError:
+            # Отменяет только ушедший потребитель: место в полной очереди под маркер конца никто не освободит.
+            raise
+        except Exception:
+            await chunks.put(None)
+            raise
+        await chunks.put(None)
+
+    task = asyncio.create_task(copy())
+    try:
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+        # Соединение возвращается в пул только после того, как COPY на нём действительно остановлен.
+        await asyncio.gather(task, return_exceptions=True)
@@ -1,35 +1,165 @@
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, TypeVar
 
-from sqlalchemy import JSON, MetaData, String
-from sqlalchemy.exc import PendingRollbackError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import JSON, MetaData, String, func, select
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, PendingRollbackError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
+from ...core.circuit_breaker import CircuitBreaker
 from ...core.config import settings
-from ...core.exceptions import DatabaseError
+from ...core.deadline import remaining_sec
+from ...core.exceptions import CircuitOpenError, DatabaseError, DatabaseUnavailable, DeadlineExceeded
+from ...core.station import station_schema
+
+
+T = TypeVar("T")
+
+# SQLSTATE классов 08 (соединение) и 57P (сервер останавливается/перезапускается), 53300 — нет свободных слотов.
+TRANSIENT_SQLSTATES = frozenset({"08000", "08001", "08003", "08004", "08006", "57P01", "57P02", "57P03", "53300"})
+# 57014 — запрос отменён по statement_timeout, 25P03 — сессия закрыта по idle_in_transaction_session_timeout.
+DEADLINE_SQLSTATES = frozenset({"57014", "25P03"})
+
+
+def is_transient(error: BaseException) -> bool:
+    """Ошибка связана с доступностью базы, а не с самим запросом."""
+    if isinstance(error, DBAPIError):
+        if error.connection_invalidated:
+            return True
+        if getattr(error.orig, "sqlstate", None) in TRANSIENT_SQLSTATES:
+            return True
+    return isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError, OSError, TimeoutError))
+
+
+def is_deadline_exceeded(error: BaseException) -> bool:
+    return isinstance(error, DBAPIError) and getattr(error.orig, "sqlstate", None) in DEADLINE_SQLSTATES
 
 
 class PostgresDatabase:
+    """Движок создаётся в connect() из lifespan или при первой сессии, а не при импорте модуля.
+
+    Один пул соединений обслуживает все станции: сессия станции получает тот же движок
+    с schema_translate_map, а функции и триггеры в базе — search_path на время транзакции.
+    """
+
     def __init__(self) -> None:
-        self._engine = create_async_engine(settings.postgres_url)
-        self._session_factory = async_sessionmaker(
-            bind=self._engine,
-            autocommit=False,
-            autoflush=False,
-            expire_on_commit=False,
-            class_=AsyncSession,
+        self._engine: AsyncEngine | None = None
+        self._session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+        self._breaker = CircuitBreaker(
+            name="postgres",
+            failure_threshold=settings.DB_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout_sec=settings.POSTGRES_RECONNECT_INTERVAL_SEC,
         )
 
+    def connect(self) -> None:
+        if self._engine is not None:
+            return
+        self._engine = create_async_engine(
+            settings.postgres_url,
+            connect_args={
+                "server_settings": {
+                    "idle_in_transaction_session_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+                },
+            },
+        )
+
+    async def dispose(self) -> None:
+        if self._engine is None:
+            return
+        await self._engine.dispose()
+        self._engine = None
+        self._session_factories.clear()
+
+    def _session_factory(self, schema: str) -> async_sessionmaker[AsyncSession]:
+        factory = self._session_factories.get(schema)
+        if factory is None:
+            if self._engine is None:
+                self.connect()
+            engine = self._engine
+            if schema != settings.POSTGRES_SCHEMA:
+                engine = engine.execution_options(schema_translate_map={settings.POSTGRES_SCHEMA: schema})
+            factory = self._session_factories[schema] = async_sessionmaker(
+                bind=engine,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                class_=AsyncSession,
+            )
+        return factory
+
     @asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
-        async with self._session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except (Exception, PendingRollbackError) as error:
-                await session.rollback()
-                raise DatabaseError(message=repr(error))
+        remaining = remaining_sec()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(message="Deadline exceeded before the database was queried")
+        schema = station_schema()
+        probe = self._breaker.before_call()
+        try:
+            async with self._session_factory(schema)() as session:
+                try:
+                    await self._configure(session, schema=schema, deadline=remaining is not None)
+                    yield session
+                    await session.commit()
+                except (DatabaseError, DeadlineExceeded):
+                    await self._rollback(session)
+                    raise
+                except (Exception, PendingRollbackError) as error:
+                    await self._rollback(session)
+                    if is_deadline_exceeded(error):
+                        raise DeadlineExceeded(message=f"Query cancelled by deadline: {error.orig!r}")
+                    if is_transient(error):
+                        self._breaker.record_failure()
+                        raise DatabaseUnavailable(message=repr(error))
+                    raise DatabaseError(message=repr(error))
+                else:
+                    self._breaker.record_success()
+        finally:
+            self._breaker.release(probe)
+
+    async def read(self, query: Callable[..., Awaitable[T]], **kwargs: Any) -> T:
+        """Выполняет идемпотентное чтение query(session=..., **kwargs) в своей сессии.
+
+        При обрыве соединения чтение повторяется с экспоненциальной задержкой и джиттером;
+        разомкнутый автомат не повторяется, а сразу отдаётся вызывающему.
+        """
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(settings.DB_READ_RETRY_ATTEMPTS),
+            wait=wait_exponential_jitter(initial=0.05, max=settings.DB_READ_RETRY_MAX_WAIT_SEC),
+            retry=retry_if_exception_type(DatabaseUnavailable) & retry_if_not_exception_type(CircuitOpenError),
+            reraise=True,
+        ):
+            with attempt:
+                async with self.session() as session:
+                    return await query(session=session, **kwargs)
+
+    async def _configure(self, session: AsyncSession, schema: str, deadline: bool) -> None:
+        # set_config(..., true) действует как SET LOCAL: до конца транзакции, после неё соединение
+        # возвращается в пул с прежними настройками. Всё выставляется одним запросом.
+        options = []
+        if schema != settings.POSTGRES_SCHEMA:
+            quoted = self._engine.dialect.identifier_preparer.quote_schema(schema)
+            options.append(func.set_config("search_path", quoted, True))
+        if deadline:
+            timeout_ms = str(max(1, int(remaining_sec() * 1000)))
+            options.append(func.set_config("statement_timeout", timeout_ms, True))
+            options.append(func.set_config("idle_in_transaction_session_timeout", timeout_ms, True))
+        if options:
+            await session.execute(select(*options))
+
+    @staticmethod
+    async def _rollback(session: AsyncSession) -> None:
+        # На оборванном соединении откат тоже падает; исходная ошибка важнее.
+        try:
+            await session.rollback()
+        except (Exception, PendingRollbackError):
+            pass
 
 
 database = PostgresDatabase()
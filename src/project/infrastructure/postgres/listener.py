@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Callable, Iterator
+from contextlib import contextmanager
+
+from ...core.config import settings
+from ...core.station import station_schema
+from ...schemas.models import ChangeEventSchema
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHANNEL = "catalog_changes"
+
+
+class ChangeEvent:
+    """Событие из NOTIFY: разбирается и сериализуется один раз для всех подписчиков."""
+
+    __slots__ = ("change", "data", "sse")
+
+    def __init__(self, payload: str) -> None:
+        self.change = ChangeEventSchema.model_validate_json(payload)
+        self.data = self.change.model_dump_json(by_alias=True)
+        self.sse = f"event: {self.change.table}\ndata: {self.data}\n\n".encode()
+
+
+class Subscription:
+    def __init__(
+        self,
+        schema: str,
+        program_id: int | None = None,
+        tables: frozenset[str] | None = None,
+        maxsize: int = 256,
+    ) -> None:
+        self.schema = schema
+        self.program_id = program_id
+        self.tables = tables
+        self.dropped = 0
+        self._queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=maxsize)
+
+    def matches(self, event: ChangeEvent) -> bool:
+        # Все станции шлют события в один канал; подписчик видит только свою.
+        if event.change.schema_name != self.schema:
+            return False
+        if self.tables is not None and event.change.table not in self.tables:
+            return False
+        return self.program_id is None or event.change.program_id == self.program_id
+
+    def offer(self, event: ChangeEvent) -> None:
+        # Медленный подписчик не должен тормозить остальных: теряем самое старое событие.
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self) -> ChangeEvent:
+        return await self._queue.get()
+
+
+class ChangeFeed:
+    """Одно LISTEN-соединение на воркер, события раздаются всем подписчикам в памяти."""
+
+    def __init__(self, channel: str = CHANGE_CHANNEL) -> None:
+        self._channel = channel
+        self._subscriptions: set[Subscription] = set()
+        self._callbacks: list[Callable[[ChangeEvent], None]] = []
+        self._connection: "asyncpg.Connection | None" = None
+        self._supervisor: asyncio.Task | None = None
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self._subscriptions)
+
+    def add_callback(self, callback: Callable[[ChangeEvent], None]) -> None:
+        self._callbacks.append(callback)
+
+    @contextmanager
+    def subscribe(
+        self,
+        program_id: int | None = None,
+        tables: frozenset[str] | None = None,
+    ) -> Iterator[Subscription]:
+        subscription = Subscription(
+            schema=station_schema(),
+            program_id=program_id,
+            tables=tables,
+            maxsize=settings.CHANGE_FEED_QUEUE_SIZE,
+        )
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    async def start(self) -> None:
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _listen_forever(self) -> None:
+        import asyncpg
+
+        while True:
+            terminated = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(dsn=settings.postgres_dsn)
+                self._connection.add_termination_listener(lambda _: terminated.set())
+                await self._connection.add_listener(self._channel, self._on_notify)
+                await terminated.wait()
+                logger.warning("LISTEN connection to %s lost, reconnecting", self._channel)
+            except (OSError, asyncpg.PostgresError) as error:
+                logger.warning("LISTEN on %s failed: %r", self._channel, error)
+            except Exception:
+                # Цикл завершает только отмена: любая другая ошибка лишь откладывает переподключение.
+                logger.exception("LISTEN on %s failed unexpectedly", self._channel)
+
+            await asyncio.sleep(settings.POSTGRES_RECONNECT_INTERVAL_SEC)
+
+    def _on_notify(self, connection: "asyncpg.Connection", pid: int, channel: str, payload: str) -> None:
+        try:
+            event = ChangeEvent(payload)
+        except ValueError:
+            logger.warning("Malformed change notification: %s", payload)
+            return
+
+        for callback in self._callbacks:
+            callback(event)
+
+        for subscription in self._subscriptions:
+            if subscription.matches(event):
+                subscription.offer(event)
+
+
+change_feed = ChangeFeed()
+
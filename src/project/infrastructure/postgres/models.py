@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Time, Date, false
+from sqlalchemy import Column, Index, UniqueConstraint, BigInteger, Float, Integer, SmallInteger, String, Text, ForeignKey, Time, Date, DateTime, false, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -22,14 +23,16 @@ class Programs(Base):
     program_name = Column(String(255), nullable=False)
     duration = Column(Time, nullable=False)
     program_ratings = Column(Integer, nullable=False)
+    playlists_count = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
 
 class HostProgramPair(Base):
     __tablename__ = "host_program_pair"
 
     id = Column(Integer, primary_key=True)
-    program_id = Column(Integer, ForeignKey('programs.id'), nullable=False)
-    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False)
+    program_id = Column(Integer, ForeignKey('programs.id'), nullable=False, index=True)
+    host_id = Column(Integer, ForeignKey('hosts.id'), nullable=False, index=True)
 
 
 class Genres(Base):
@@ -47,7 +50,8 @@ class Artists(Base):
     artist_name = Column(String(255), nullable=False)
     country_name = Column(String(100), nullable=False)
     birthdate = Column(Date, nullable=False)
-    genre_id = Column(Integer, ForeignKey('genres.id'), nullable=False)
+    genre_id = Column(Integer, ForeignKey('genres.id'), nullable=False, index=True)
+    tracks_count = Column(Integer, nullable=False, server_default="0")
 
 
 class Tracks(Base):
@@ -57,8 +61,17 @@ class Tracks(Base):
     track_name = Column(String(255), nullable=False)
     release_date = Column(Date, nullable=False)
     duration = Column(Time, nullable=False)
-    artist_id = Column(Integer, ForeignKey('artists.id'))
-    genre_id = Column(Integer, ForeignKey('genres.id'))
+    artist_id = Column(Integer, ForeignKey('artists.id'), index=True)
+    genre_id = Column(Integer, ForeignKey('genres.id'), index=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class TrackRequestCounts(Base):
+    """Число заявок на трек; вынесено из tracks, чтобы каждая заявка не меняла версию (ETag) трека."""
+    __tablename__ = "track_request_counts"
+
+    track_id = Column(Integer, ForeignKey('tracks.id', ondelete="CASCADE"), primary_key=True)
+    requests_count = Column(Integer, nullable=False, server_default="0")
 
 
 class Album(Base):
@@ -66,36 +79,47 @@ class Album(Base):
 
     id = Column(Integer, primary_key=True)
     album_name = Column(String(255), nullable=False)
-    artist_id = Column(Integer, ForeignKey('artists.id'), nullable=False)
-    track_id = Column(Integer, ForeignKey('tracks.id'), nullable=False)
+    artist_id = Column(Integer, ForeignKey('artists.id'), nullable=False, index=True)
+    track_id = Column(Integer, ForeignKey('tracks.id'), nullable=False, index=True)
     year_of_release = Column(Integer, nullable=False)
 
 
 class SongRequests(Base):
     __tablename__ = "song_requests"
+    # Помесячные секции по request_date, ключ секционирования входит в первичный ключ.
+    __table_args__ = {"postgresql_partition_by": "RANGE (request_date)"}
 
-    id = Column(Integer, primary_key=True)
-    program_id = Column(Integer, ForeignKey('programs.id'), nullable=False)
-    track_id = Column(Integer, ForeignKey('tracks.id'), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    program_id = Column(Integer, ForeignKey('programs.id'), nullable=False, index=True)
+    track_id = Column(Integer, ForeignKey('tracks.id'), nullable=False, index=True)
     request_time = Column(Time, nullable=False)
-    request_date = Column(Date, nullable=False)
+    request_date = Column(Date, primary_key=True, index=True)
 
 
 class Playlists(Base):
     __tablename__ = "playlists"
+    __table_args__ = (
+        Index("ix_playlists_playlist_date_airtime", "playlist_date", "airtime"),
+    )
 
     id = Column(Integer, primary_key=True)
-    program_id = Column(Integer, ForeignKey('programs.id'), nullable=False)
+    program_id = Column(Integer, ForeignKey('programs.id'), nullable=False, index=True)
     airtime = Column(Time, nullable=False)
     playlist_date = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
 
 class PlaylistAndTrackPair(Base):
     __tablename__ = "playlist_and_track_pair"
+    __table_args__ = (
+        UniqueConstraint("playlist_id", "track_id", name="uq_playlist_and_track_pair_playlist_id_track_id"),
+        Index("ix_playlist_and_track_pair_playlist_id_position", "playlist_id", "position"),
+    )
 
     id = Column(Integer, primary_key=True)
     playlist_id = Column(Integer, ForeignKey('playlists.id'), nullable=False)
-    track_id = Column(Integer, ForeignKey('tracks.id'), nullable=False)
+    track_id = Column(Integer, ForeignKey('tracks.id'), nullable=False, index=True)
+    position = Column(BigInteger, nullable=False)
 
 
 class User(Base):
@@ -106,3 +130,81 @@ class User(Base):
     password: Mapped[str] = mapped_column(nullable=False)
     is_admin: Mapped[bool] = mapped_column(default=False, server_default=false())
 
+
+
+
+class Jobs(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    status = Column(String(20), nullable=False, server_default="queued")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    result = Column(JSONB)
+    last_error = Column(Text)
+    locked_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class IdempotencyKeys(Base):
+    __tablename__ = "idempotency_keys"
+
+    scope = Column(String(100), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response = Column(JSONB)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+
+class TrackNeighbours(Base):
+    """Топ-K похожих треков по совместному появлению в эфире; заполняет refresh_track_neighbours()."""
+    __tablename__ = "track_neighbours"
+
+    track_id = Column(Integer, ForeignKey('tracks.id', ondelete="CASCADE"), primary_key=True)
+    rank = Column(SmallInteger, primary_key=True)
+    neighbour_id = Column(Integer, ForeignKey('tracks.id', ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+
+
+class TrackNeighboursDirty(Base):
+    """Корзины (программа, день), соседей треков которых нужно пересчитать."""
+    __tablename__ = "track_neighbours_dirty"
+
+    program_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+
+
+class TrackNeighboursDirtyTracks(Base):
+    """Треки, убранные из корзин: в самих корзинах их уже нет, поэтому они помечаются отдельно."""
+    __tablename__ = "track_neighbours_dirty_tracks"
+
+    track_id = Column(Integer, primary_key=True)
+
+
+class TrackListing(Base):
+    """Трек с именами исполнителя, жанра и альбома для списков; поддерживается триггерами sync_track_listing()."""
+    __tablename__ = "track_listing"
+    __table_args__ = (
+        Index(
+            "ix_track_listing_track_name_track_id",
+            "track_name",
+            "track_id",
+            postgresql_include=[
+                "release_date", "duration", "artist_id", "artist_name", "genre_id", "genre_name", "album_id", "album_name",
+            ],
+        ),
+    )
+
+    track_id = Column(Integer, ForeignKey('tracks.id', ondelete="CASCADE"), primary_key=True)
+    track_name = Column(String(255), nullable=False)
+    release_date = Column(Date, nullable=False)
+    duration = Column(Time, nullable=False)
+    artist_id = Column(Integer)
+    artist_name = Column(String(255))
+    genre_id = Column(Integer)
+    genre_name = Column(String(255))
+    album_id = Column(Integer)
+    album_name = Column(String(255))
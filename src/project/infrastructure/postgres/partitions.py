@@ -0,0 +1,29 @@
+import logging
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import PostgresDatabase
+from project.infrastructure.postgres.repository.song_request_repo import SongRequestsRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_song_requests_partitions(
+    database: PostgresDatabase,
+    repository: SongRequestsRepository,
+) -> None:
+    """Создаёт будущие секции song_requests и удаляет вышедшие за срок хранения."""
+    async with database.session() as session:
+        created = await repository.ensure_partitions(
+            session=session,
+            months_ahead=settings.SONG_REQUESTS_PARTITIONS_AHEAD,
+        )
+        dropped = 0
+        if settings.SONG_REQUESTS_RETENTION_MONTHS > 0:
+            dropped = await repository.drop_expired_partitions(
+                session=session,
+                keep_months=settings.SONG_REQUESTS_RETENTION_MONTHS,
+            )
+
+    if created or dropped:
+        logger.info("song_requests partitions: %s created, %s dropped", created, dropped)
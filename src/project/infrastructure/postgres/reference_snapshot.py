@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import sys
+import time
+from collections import defaultdict
+from typing import Sequence
+
+from project.core.compression import PrecompressedBody
+from project.core.exceptions import DatabaseError, NotFound
+from project.core.metrics import Counter, Gauge
+from project.core.station import station_schema, station_schemas, use_station
+from project.infrastructure.postgres.database import PostgresDatabase
+from project.infrastructure.postgres.repository.base import BaseRepository
+
+
+logger = logging.getLogger(__name__)
+
+snapshot_rows = Gauge(
+    "reference_snapshot_rows",
+    "Rows held in the in-memory reference snapshot",
+    labelnames=("schema", "table"),
+)
+snapshot_bytes = Gauge(
+    "reference_snapshot_bytes",
+    "Approximate memory used by the in-memory reference snapshot",
+    labelnames=("schema", "table"),
+)
+snapshot_refresh_seconds = Gauge(
+    "reference_snapshot_refresh_seconds",
+    "Duration of the last reference snapshot refresh",
+    labelnames=("schema", "table"),
+)
+snapshot_refreshes = Counter(
+    "reference_snapshot_refreshes_total",
+    "Reference snapshot refreshes",
+    labelnames=("schema", "table", "result"),
+)
+
+
+class SnapshotTable:
+    """Неизменяемый снимок справочника: готовый JSON каждой строки и всего списка."""
+
+    __slots__ = ("entity_name", "by_id", "all")
+
+    def __init__(self, entity_name: str, rows: Sequence[tuple[int, bytes]]) -> None:
+        self.entity_name = entity_name
+        self.by_id: dict[int, bytes] = dict(rows)
+        self.all = PrecompressedBody(b"[" + b",".join(row for _, row in rows) + b"]")
+
+    @property
+    def size_bytes(self) -> int:
+        return (
+            sys.getsizeof(self.by_id)
+            + sum(sys.getsizeof(entity_id) + sys.getsizeof(row) for entity_id, row in self.by_id.items())
+            + sys.getsizeof(self.all.raw)
+        )
+
+    def get(self, entity_id: int) -> bytes:
+        row = self.by_id.get(entity_id)
+        if row is None:
+            raise NotFound(message=f"{self.entity_name} with id {entity_id} not found")
+        return row
+
+    def get_many(self, ids: Sequence[int]) -> bytes:
+        """Тело MultiGetSchema в порядке ids, собранное из готовых строк."""
+        items = b",".join(self.by_id[entity_id] for entity_id in ids if entity_id in self.by_id)
+        missing = ",".join(str(entity_id) for entity_id in ids if entity_id not in self.by_id)
+        return b'{"items":[' + items + b'],"missing":[' + missing.encode() + b"]}"
+
+
+class ReferenceSnapshot:
+    """Снимки маленьких, почти не меняющихся таблиц в памяти воркера.
+
+    Пока снимок таблицы не загружен, get() возвращает None и маршруты читают из базы.
+    Запись через роутер обновляет снимок сразу, запись из других воркеров и импорта — по NOTIFY.
+    Снимки отдельные для каждой станции, get() и refresh() работают со станцией текущего запроса.
+    """
+
+    def __init__(self, database: PostgresDatabase, repositories: dict[str, BaseRepository]) -> None:
+        self._database = database
+        self._repositories = repositories
+        self._tables: dict[tuple[str, str], SnapshotTable] = {}
+        self._locks: defaultdict[tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._stale: set[tuple[str, str]] = set()
+        self._refresher: asyncio.Task | None = None
+
+    def get(self, table: str) -> SnapshotTable | None:
+        return self._tables.get((station_schema(), table))
+
+    async def refresh(self, table: str) -> None:
+        """Перечитывает таблицу целиком; при ошибке снимок сбрасывается и маршруты идут в базу."""
+        repository = self._repositories[table]
+        schema = station_schema()
+        key = (schema, table)
+        # Под замком загрузка, начатая позже, и применяется позже: старые данные не перетрут новые.
+        async with self._locks[key]:
+            started = time.perf_counter()
+            try:
+                rows = await self._database.read(repository.get_all)
+            except DatabaseError as error:
+                self._tables.pop(key, None)
+                snapshot_refreshes.inc(schema, table, "error")
+                logger.warning("Reference snapshot %s.%s refresh failed: %s", schema, table, error.message)
+                return
+
+            snapshot = SnapshotTable(
+                entity_name=repository._entity_name,
+                rows=[(row.id, row.model_dump_json().encode()) for row in sorted(rows, key=lambda row: row.id)],
+            )
+            self._tables[key] = snapshot
+
+        snapshot_refresh_seconds.set(time.perf_counter() - started, schema, table)
+        snapshot_rows.set(len(snapshot.by_id), schema, table)
+        snapshot_bytes.set(snapshot.size_bytes, schema, table)
+        snapshot_refreshes.inc(schema, table, "ok")
+
+    async def refresh_all(self) -> None:
+        for schema in station_schemas():
+            with use_station(schema):
+                for table in self._repositories:
+                    await self.refresh(table)
+
+    def invalidate(self, schema: str, table: str) -> None:
+        """Планирует фоновое обновление; события, пришедшие во время обновления, склеиваются."""
+        if table not in self._repositories or schema not in station_schemas():
+            return
+        self._stale.add((schema, table))
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_stale(), name="reference-snapshot-refresh")
+
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+
+    async def _refresh_stale(self) -> None:
+        while self._stale:
+            schema, table = self._stale.pop()
+            with use_station(schema):
+                await self.refresh(table)
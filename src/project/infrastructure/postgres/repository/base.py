@@ -0,0 +1,230 @@
+from datetime import datetime
+from typing import AsyncIterator, Generic, Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, any_, bindparam, select, insert, update, delete, true
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError, InterfaceError
+
+from project.infrastructure.postgres.database import Base
+from project.core.exceptions import AlreadyExists, Error, ForeignKeyViolationError, NotFound, PreconditionFailed
+
+
+ModelT = TypeVar("ModelT", bound=Base)
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+class BaseRepository(Generic[ModelT, SchemaT]):
+    """Общий CRUD для сущностей с целочисленным id.
+
+    Наследник задаёт модель, схему ответа, имя сущности для сообщений об ошибках
+    и внешние ключи, которые нужно проверить перед записью.
+    """
+
+    _collection: Type[ModelT]
+    _schema: Type[SchemaT]
+    _entity_name: str
+    _foreign_keys: dict[str, tuple[Type[Base], str]] = {}
+
+    async def check_connection(
+        self,
+        session: AsyncSession,
+    ) -> bool:
+        query = select(true())
+
+        try:
+            return await session.scalar(query)
+        except (Exception, InterfaceError):
+            return False
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+    ) -> list[SchemaT]:
+        query = select(self._collection)
+
+        rows = await session.scalars(query)
+
+        return [self._schema.model_validate(obj=row) for row in rows.all()]
+
+    async def stream_all(
+        self,
+        session: AsyncSession,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[SchemaT]:
+        """Построчно читает таблицу через серверный курсор, не держа всю выборку в памяти."""
+        query = (
+            select(self._collection)
+            .order_by(self._collection.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        rows = await session.stream_scalars(query)
+
+        async for row in rows:
+            yield self._schema.model_validate(obj=row)
+
+    async def get_all_projected(
+        self,
+        session: AsyncSession,
+        columns: Sequence[str],
+    ) -> list[dict]:
+        table_columns = self._collection.__table__.columns
+        unknown = [column for column in columns if column not in table_columns]
+        if unknown:
+            raise Error(message=f"Unknown {self._entity_name} columns: {', '.join(unknown)}")
+
+        query = select(*(table_columns[column] for column in columns))
+
+        rows = await session.execute(query)
+
+        return [dict(row) for row in rows.mappings().all()]
+
+    async def get_by_id(
+        self,
+        session: AsyncSession,
+        entity_id: int,
+    ) -> SchemaT:
+        query = (
+            select(self._collection)
+            .where(self._collection.id == entity_id)
+        )
+
+        row = await session.scalar(query)
+
+        if not row:
+            raise NotFound(message=f"{self._entity_name} with id {entity_id} not found")
+
+        return self._schema.model_validate(obj=row)
+
+    async def get_many_by_ids(
+        self,
+        session: AsyncSession,
+        ids: Sequence[int],
+    ) -> list[SchemaT]:
+        # Один параметр-массив вместо IN (...): план запроса не зависит от количества id.
+        query = (
+            select(self._collection)
+            .where(self._collection.id == any_(bindparam("ids", value=list(ids), type_=ARRAY(Integer))))
+        )
+
+        rows = await session.scalars(query)
+
+        return [self._schema.model_validate(obj=row) for row in rows.all()]
+
+    async def exists(
+        self,
+        session: AsyncSession,
+        entity_id: int,
+    ) -> bool:
+        query = select(select(self._collection.id).where(self._collection.id == entity_id).exists())
+
+        return await session.scalar(query)
+
+    async def get_version(
+        self,
+        session: AsyncSession,
+        entity_id: int,
+    ) -> datetime:
+        query = (
+            select(self._collection.updated_at)
+            .where(self._collection.id == entity_id)
+        )
+
+        version = await session.scalar(query)
+
+        if not version:
+            raise NotFound(message=f"{self._entity_name} with id {entity_id} not found")
+
+        return version
+
+    async def create(
+        self,
+        session: AsyncSession,
+        dto: BaseModel,
+    ) -> SchemaT:
+        query = (
+            insert(self._collection)
+            .values(self._insert_values(dto))
+            .returning(self._collection)
+        )
+
+        await self._check_foreign_keys(session=session, dto=dto)
+
+        try:
+            created = await session.scalar(query)
+            await session.flush()
+        except IntegrityError:
+            raise AlreadyExists(message=f"{self._entity_name} with the given details already exists")
+
+        return self._schema.model_validate(obj=created)
+
+    async def update(
+        self,
+        session: AsyncSession,
+        entity_id: int,
+        dto: BaseModel,
+        expected_version: datetime | None = None,
+    ) -> SchemaT:
+        query = (
+            update(self._collection)
+            .where(self._collection.id == entity_id)
+            .values(dto.model_dump())
+            .returning(self._collection)
+        )
+        if expected_version is not None:
+            query = query.where(self._collection.updated_at == expected_version)
+
+        await self._check_foreign_keys(session=session, dto=dto)
+
+        try:
+            updated = await session.scalar(query)
+        except IntegrityError:
+            raise AlreadyExists(message=f"{self._entity_name} with the given details already exists")
+
+        if not updated:
+            if expected_version is not None:
+                await self.get_version(session=session, entity_id=entity_id)
+                raise PreconditionFailed(message=f"{self._entity_name} with id {entity_id} was modified")
+            raise NotFound(message=f"{self._entity_name} with id {entity_id} not found")
+
+        return self._schema.model_validate(obj=updated)
+
+    async def delete(
+        self,
+        session: AsyncSession,
+        entity_id: int,
+    ) -> None:
+        query = delete(self._collection).where(self._collection.id == entity_id)
+
+        result = await session.execute(query)
+
+        if not result.rowcount:
+            raise NotFound(message=f"{self._entity_name} with id {entity_id} not found")
+
+    def _insert_values(self, dto: BaseModel) -> dict:
+        """Значения для INSERT; наследник может дополнить их вычисляемыми столбцами."""
+        return dto.model_dump()
+
+    async def _check_foreign_keys(
+        self,
+        session: AsyncSession,
+        dto: BaseModel,
+    ) -> None:
+        checks = [
+            (getattr(dto, column), model, name)
+            for column, (model, name) in self._foreign_keys.items()
+            if getattr(dto, column) is not None
+        ]
+        if not checks:
+            return
+
+        # Все ссылки проверяются одним запросом из нескольких EXISTS.
+        query = select(*(select(model.id).where(model.id == value).exists() for value, model, _ in checks))
+
+        found = (await session.execute(query)).one()
+
+        for is_found, (value, _, name) in zip(found, checks):
+            if not is_found:
+                raise ForeignKeyViolationError(message=f"{name} with id {value} not found")
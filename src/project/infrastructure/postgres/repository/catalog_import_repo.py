@@ -0,0 +1,214 @@
+import json
+from datetime import date, time
+from typing import Any, AsyncIterable, AsyncIterator, Type
+
+from sqlalchemy import Column, Table, column, exists, func, or_, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.core.exceptions import Error, ForeignKeyViolationError
+from project.core.station import station_schema
+from project.infrastructure.postgres.copy_export import compile_for_copy
+from project.infrastructure.postgres.database import Base
+from project.infrastructure.postgres.models import Album, Artists, Genres, Tracks
+
+
+CSV = "csv"
+NDJSON = "ndjson"
+MISSING_SAMPLE_SIZE = 5
+
+_PARSERS = {date: date.fromisoformat, time: time.fromisoformat}
+
+
+def format_for_filename(filename: str | None) -> str:
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return NDJSON
+    return CSV
+
+
+class ImportSource:
+    """Содержимое одного файла импорта: CSV с заголовком или NDJSON, по кускам байтов."""
+
+    def __init__(self, chunks: AsyncIterable[bytes], data_format: str) -> None:
+        if data_format not in (CSV, NDJSON):
+            raise Error(message=f"Unsupported import format: {data_format}")
+        self.chunks = chunks
+        self.format = data_format
+
+
+class CatalogImportRepository:
+    """Массовая загрузка справочника через COPY во временные таблицы и слияние по id."""
+
+    # Порядок слияния: родительские таблицы раньше дочерних.
+    _entities: tuple[tuple[str, Type[Base]], ...] = (
+        ("genres", Genres),
+        ("artists", Artists),
+        ("tracks", Tracks),
+        ("albums", Album),
+    )
+
+    @property
+    def entity_names(self) -> tuple[str, ...]:
+        return tuple(name for name, _ in self._entities)
+
+    async def import_catalog(
+        self,
+        session: AsyncSession,
+        sources: dict[str, ImportSource],
+    ) -> dict[str, int]:
+        """Загружает переданные файлы и возвращает число слитых строк по сущностям.
+
+        Строки сопоставляются по id: повторный импорт тех же файлов ничего не меняет.
+        Всё выполняется в одной транзакции — при любой ошибке справочник остаётся прежним.
+        """
+        unknown = set(sources) - set(self.entity_names)
+        if unknown:
+            raise Error(message=f"Unknown import entities: {', '.join(sorted(unknown))}")
+
+        merged = {}
+        for name, model in self._entities:
+            source = sources.get(name)
+            if source is None:
+                continue
+            staging = await self._load_staging(session, name, model, source)
+            await self._validate(session, name, model, staging)
+            merged[name] = await self._merge(session, model, staging)
+            await self._sync_sequence(session, model)
+        return merged
+
+    @staticmethod
+    def _imported_columns(model: Type[Base]) -> list[Column]:
+        # Счётчики и updated_at заполняет база, их из файла не берём.
+        return [column for column in model.__table__.columns if column.server_default is None]
+
+    async def _load_staging(
+        self,
+        session: AsyncSession,
+        name: str,
+        model: Type[Base],
+        source: ImportSource,
+    ) -> Table:
+        columns = self._imported_columns(model)
+        staging_name = f"import_{model.__tablename__}"
+        connection = await session.connection()
+        select_sql, _ = compile_for_copy(connection, select(*columns))
+        await session.execute(text(f"CREATE TEMP TABLE {staging_name} ON COMMIT DROP AS {select_sql} WITH NO DATA"))
+
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        column_names = [column.name for column in columns]
+        try:
+            if source.format == CSV:
+                await driver_connection.copy_to_table(
+                    staging_name, source=source.chunks, columns=column_names, format="csv", header=True
+                )
+            else:
+                await driver_connection.copy_records_to_table(
+                    staging_name, records=self._parse_ndjson(source.chunks, columns), columns=column_names
+                )
+        except ValueError as error:
+            raise Error(message=f"Invalid {name} file: {error}")
+        except Exception as error:
+            # Ошибки данных из COPY (класс 22: формат, длина, NULL) — это ошибка файла, а не базы.
+            if str(getattr(error, "sqlstate", "")).startswith(("22", "23")):
+                raise Error(message=f"Invalid {name} file: {error}")
+            raise
+
+        await session.execute(text(f"ANALYZE {staging_name}"))
+        return table(staging_name, *(column(name) for name in column_names))
+
+    @staticmethod
+    async def _parse_ndjson(chunks: AsyncIterable[bytes], columns: list[Column]) -> AsyncIterator[tuple[Any, ...]]:
+        parsers = [(column.name, _PARSERS.get(column.type.python_type)) for column in columns]
+        tail = b""
+        async for chunk in chunks:
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield _parse_record(line, parsers)
+        if tail.strip():
+            yield _parse_record(tail, parsers)
+
+    @staticmethod
+    async def _validate(
+        session: AsyncSession,
+        name: str,
+        model: Type[Base],
+        staging: Table,
+    ) -> None:
+        """Проверяет обязательные поля и внешние ключи одним запросом на столбец, а не на строку."""
+        for column in model.__table__.columns:
+            if column.name not in staging.c:
+                continue
+            value = staging.c[column.name]
+            if not column.nullable:
+                empty = await session.scalar(select(func.count()).select_from(staging).where(value.is_(None)))
+                if empty:
+                    raise Error(message=f"Invalid {name} file: {empty} rows without {column.name}")
+            # Родители к этому моменту уже слиты, поэтому достаточно проверить основные таблицы.
+            for foreign_key in column.foreign_keys:
+                query = (
+                    select(value)
+                    .distinct()
+                    .where(value.is_not(None), ~exists().where(foreign_key.column == value))
+                    .limit(MISSING_SAMPLE_SIZE)
+                )
+                missing = (await session.scalars(query)).all()
+                if missing:
+                    raise ForeignKeyViolationError(
+                        message=f"{name}.{column.name} references missing "
+                        f"{foreign_key.column.table.name} ids: {', '.join(map(str, missing))}"
+                    )
+
+    async def _merge(
+        self,
+        session: AsyncSession,
+        model: Type[Base],
+        staging: Table,
+    ) -> int:
+        column_names = [column.name for column in self._imported_columns(model)]
+        updated_names = [name for name in column_names if name != "id"]
+        # DISTINCT ON (id): повтор id внутри файла иначе ломает ON CONFLICT DO UPDATE.
+        rows = select(*(staging.c[name] for name in column_names)).distinct(staging.c.id).order_by(staging.c.id)
+        query = insert(model).from_select(column_names, rows)
+        # Неизменившиеся строки не переписываются: повторный импорт не плодит версии строк и не будит триггеры.
+        assignments = {name: query.excluded[name] for name in updated_names}
+        if "updated_at" in model.__table__.c:
+            # onupdate срабатывает только в ORM; без него ETag обновлённых строк не изменился бы.
+            assignments["updated_at"] = func.now()
+        query = query.on_conflict_do_update(
+            index_elements=[model.id],
+            set_=assignments,
+            where=or_(*(model.__table__.c[name].is_distinct_from(query.excluded[name]) for name in updated_names)),
+        )
+
+        result = await session.execute(query)
+        return result.rowcount
+
+    @staticmethod
+    async def _sync_sequence(
+        session: AsyncSession,
+        model: Type[Base],
+    ) -> None:
+        # id пришли из файла, поэтому последовательность сдвигается за максимальный из них.
+        # Имя таблицы — строка, schema_translate_map её не видит: схема станции подставляется явно.
+        await session.execute(
+            select(
+                func.setval(
+                    func.pg_get_serial_sequence(f'"{station_schema()}".{model.__tablename__}', "id"),
+                    select(func.coalesce(func.max(model.id), 0) + 1).scalar_subquery(),
+                    False,
+                )
+            )
+        )
+
+
+def _parse_record(line: bytes, parsers: list[tuple[str, Any]]) -> tuple[Any, ...]:
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"malformed JSON line: {error}")
+    return tuple(
+        parser(data[name]) if parser is not None and data.get(name) is not None else data.get(name)
+        for name, parser in parsers
+    )
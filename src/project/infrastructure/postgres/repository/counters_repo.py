@@ -0,0 +1,67 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from project.infrastructure.postgres.models import Artists, Playlists, Programs, SongRequests, TrackRequestCounts, Tracks
+
+
+class CountersRepository:
+    """Денормализованные счётчики, которые поддерживают триггеры maintain_counter() и maintain_summary_counter()."""
+
+    # (родитель, столбец-счётчик, дочерняя таблица, внешний ключ в дочерней таблице)
+    _counters = (
+        (Artists, "tracks_count", Tracks, Tracks.artist_id),
+        (Programs, "playlists_count", Playlists, Playlists.program_id),
+    )
+
+    async def reconcile_counters(
+        self,
+        session: AsyncSession,
+    ) -> dict[str, int]:
+        """Пересчитывает счётчики по фактическим строкам и возвращает число исправленных записей."""
+        fixed = {}
+        for parent, counter, child, foreign_key in self._counters:
+            actual = (
+                select(func.count())
+                .select_from(child)
+                .where(foreign_key == parent.id)
+                .scalar_subquery()
+            )
+            query = (
+                update(parent)
+                .where(getattr(parent, counter) != actual)
+                .values({counter: actual})
+            )
+
+            result = await session.execute(query)
+            fixed[f"{parent.__tablename__}.{counter}"] = result.rowcount
+
+        fixed["track_request_counts.requests_count"] = await self._reconcile_track_request_counts(session=session)
+
+        return fixed
+
+    async def _reconcile_track_request_counts(
+        self,
+        session: AsyncSession,
+    ) -> int:
+        # В сводной таблице строки может не быть вовсе, поэтому расхождения исправляются вставкой с обновлением.
+        actual = (
+            select(Tracks.id.label("track_id"), func.count(SongRequests.id).label("requests_count"))
+            .outerjoin(SongRequests, SongRequests.track_id == Tracks.id)
+            .group_by(Tracks.id)
+            .subquery()
+        )
+        stored = func.coalesce(TrackRequestCounts.requests_count, 0)
+        wrong = (
+            select(actual.c.track_id, actual.c.requests_count)
+            .outerjoin(TrackRequestCounts, TrackRequestCounts.track_id == actual.c.track_id)
+            .where(stored != actual.c.requests_count)
+        )
+        query = insert(TrackRequestCounts).from_select(["track_id", "requests_count"], wrong)
+        query = query.on_conflict_do_update(
+            index_elements=[TrackRequestCounts.track_id],
+            set_={"requests_count": query.excluded.requests_count},
+        )
+
+        result = await session.execute(query)
+        return result.rowcount
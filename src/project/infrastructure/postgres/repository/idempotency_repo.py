@@ -0,0 +1,79 @@
+from datetime import timedelta
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from project.infrastructure.postgres.models import IdempotencyKeys
+from project.schemas.models import IdempotencyRecordSchema
+
+
+class IdempotencyRepository:
+    _collection: Type[IdempotencyKeys] = IdempotencyKeys
+
+    async def claim_key(
+        self,
+        session: AsyncSession,
+        scope: str,
+        key: str,
+        request_hash: str,
+        ttl: timedelta,
+    ) -> IdempotencyRecordSchema | None:
+        """Занимает ключ в текущей транзакции; если ключ уже занят, возвращает сохранённую запись.
+
+        Параллельный повтор с тем же ключом ждёт на уникальном индексе, пока первая
+        транзакция не завершится, и затем видит её результат. Просроченный ключ занимается заново.
+        """
+        query = (
+            insert(self._collection)
+            .values(scope=scope, key=key, request_hash=request_hash)
+            .on_conflict_do_update(
+                index_elements=[self._collection.scope, self._collection.key],
+                set_={
+                    "request_hash": request_hash,
+                    "status_code": None,
+                    "response": None,
+                    "created_at": func.now(),
+                },
+                where=self._collection.created_at < func.now() - ttl,
+            )
+            .returning(self._collection.key)
+        )
+
+        if await session.scalar(query) is not None:
+            return None
+
+        stored = await session.scalar(
+            select(self._collection)
+            .where(self._collection.scope == scope, self._collection.key == key)
+        )
+
+        return IdempotencyRecordSchema.model_validate(obj=stored)
+
+    async def save_response(
+        self,
+        session: AsyncSession,
+        scope: str,
+        key: str,
+        status_code: int,
+        response: dict,
+    ) -> None:
+        query = (
+            update(self._collection)
+            .where(self._collection.scope == scope, self._collection.key == key)
+            .values(status_code=status_code, response=response)
+        )
+
+        await session.execute(query)
+
+    async def purge_expired(
+        self,
+        session: AsyncSession,
+        ttl: timedelta,
+    ) -> int:
+        query = delete(self._collection).where(self._collection.created_at < func.now() - ttl)
+
+        result = await session.execute(query)
+
+        return result.rowcount
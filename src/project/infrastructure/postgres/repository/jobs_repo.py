@@ -0,0 +1,156 @@
+from datetime import timedelta
+from typing import Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, func, or_, and_
+
+from project.infrastructure.postgres.models import Jobs
+from project.schemas.models import JobSchema
+from project.core.exceptions import NotFound
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobsRepository:
+    _collection: Type[Jobs] = Jobs
+
+    async def enqueue_job(
+        self,
+        session: AsyncSession,
+        kind: str,
+        payload: dict | None = None,
+    ) -> JobSchema:
+        query = (
+            insert(self._collection)
+            .values(kind=kind, payload=payload or {})
+            .returning(self._collection)
+        )
+
+        job = await session.scalar(query)
+
+        return JobSchema.model_validate(obj=job)
+
+    async def get_job_by_id(
+        self,
+        session: AsyncSession,
+        job_id: int,
+    ) -> JobSchema:
+        job = await session.scalar(select(self._collection).where(self._collection.id == job_id))
+
+        if not job:
+            raise NotFound(message=f"Job with id {job_id} not found")
+
+        return JobSchema.model_validate(obj=job)
+
+    async def get_all_jobs(
+        self,
+        session: AsyncSession,
+        status: str | None = None,
+        limit: int = 100,
+    ) -> list[JobSchema]:
+        query = select(self._collection).order_by(self._collection.id.desc()).limit(limit)
+        if status is not None:
+            query = query.where(self._collection.status == status)
+
+        jobs = await session.scalars(query)
+
+        return [JobSchema.model_validate(obj=job) for job in jobs.all()]
+
+    async def claim_job(
+        self,
+        session: AsyncSession,
+        stale_after: timedelta,
+    ) -> JobSchema | None:
+        # SKIP LOCKED: параллельные воркеры не ждут друг друга и не берут одну задачу дважды.
+        # Задачи, зависшие в running дольше stale_after (упавший процесс), забираются повторно.
+        candidate = (
+            select(self._collection.id)
+            .where(
+                or_(
+                    self._collection.status == JOB_QUEUED,
+                    and_(
+                        self._collection.status == JOB_RUNNING,
+                        self._collection.locked_at < func.now() - stale_after,
+                    ),
+                )
+            )
+            .order_by(self._collection.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = (
+            update(self._collection)
+            .where(self._collection.id == candidate)
+            .values(
+                status=JOB_RUNNING,
+                attempts=self._collection.attempts + 1,
+                locked_at=func.now(),
+            )
+            .returning(self._collection)
+        )
+
+        job = await session.scalar(query)
+
+        return JobSchema.model_validate(obj=job) if job else None
+
+    async def touch_job(
+        self,
+        session: AsyncSession,
+        job_id: int,
+        attempts: int,
+    ) -> bool:
+        """Продлевает захват задачи; False, если задачу уже перехватил другой воркер."""
+        query = (
+            update(self._collection)
+            .where(self._owned_by(job_id, attempts))
+            .values(locked_at=func.now())
+            .returning(self._collection.id)
+        )
+
+        return await session.scalar(query) is not None
+
+    async def complete_job(
+        self,
+        session: AsyncSession,
+        job_id: int,
+        attempts: int,
+        result: dict | None = None,
+    ) -> bool:
+        query = (
+            update(self._collection)
+            .where(self._owned_by(job_id, attempts))
+            .values(status=JOB_DONE, result=result, last_error=None, locked_at=None)
+            .returning(self._collection.id)
+        )
+
+        return await session.scalar(query) is not None
+
+    async def fail_job(
+        self,
+        session: AsyncSession,
+        job_id: int,
+        attempts: int,
+        error: str,
+    ) -> bool:
+        query = (
+            update(self._collection)
+            .where(self._owned_by(job_id, attempts))
+            .values(status=JOB_FAILED, last_error=error, locked_at=None)
+            .returning(self._collection.id)
+        )
+
+        return await session.scalar(query) is not None
+
+    def _owned_by(self, job_id: int, attempts: int):
+        # attempts растёт при каждом захвате и служит токеном владения: воркер, у которого задачу
+        # перехватили как зависшую, не перезапишет результат нового владельца.
+        return and_(
+            self._collection.id == job_id,
+            self._collection.attempts == attempts,
+            self._collection.status == JOB_RUNNING,
+        )
@@ -1,109 +1,70 @@
 from typing import Type
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update, delete, true
-from sqlalchemy.exc import IntegrityError, InterfaceError
+from sqlalchemy import Integer, cast, func, select, delete
 
-from project.infrastructure.postgres.models import Playlists, Programs
-from project.schemas.models import PlaylistCreateUpdateSchema, PlaylistSchema
-from project.core.exceptions import ForeignKeyViolationError, NotFound, AlreadyExists
+from project.infrastructure.postgres.models import PlaylistAndTrackPair, Playlists, Programs, Tracks
+from project.infrastructure.postgres.repository.base import BaseRepository
+from project.schemas.models import PlaylistSchema, PlaylistStatsSchema
+from project.core.exceptions import NotFound
 
 
-class PlaylistsRepository:
+class PlaylistsRepository(BaseRepository[Playlists, PlaylistSchema]):
     _collection: Type[Playlists] = Playlists
+    _schema = PlaylistSchema
+    _entity_name = "Playlist"
+    _foreign_keys = {
+        "program_id": (Programs, "Program"),
+    }
 
-    async def check_connection(
-        self,
-        session: AsyncSession,
-    ) -> bool:
-        query = select(true())
-
-        try:
-            return await session.scalar(query)
-        except (Exception, InterfaceError):
-            return False
-
-    async def get_all_playlists(
-        self,
-        session: AsyncSession,
-    ):
-        query = select(self._collection)
-
-        playlists = await session.scalars(query)
-
-        return [PlaylistSchema.model_validate(obj=pl) for pl in playlists.all()]
-
-    async def get_playlist_by_id(
+    async def get_playlist_stats(
         self,
         session: AsyncSession,
         playlist_id: int,
-    ) -> PlaylistSchema:
+    ) -> PlaylistStatsSchema:
+        total = cast(func.coalesce(func.sum(func.extract("epoch", Tracks.duration)), 0), Integer)
+        slot = cast(func.extract("epoch", Programs.duration), Integer)
+
         query = (
-            select(self._collection)
+            select(
+                self._collection.id.label("playlist_id"),
+                func.count(Tracks.id).label("track_count"),
+                total.label("total_duration_sec"),
+                slot.label("slot_duration_sec"),
+                func.greatest(total - slot, 0).label("overrun_sec"),
+            )
+            .join(Programs, Programs.id == self._collection.program_id)
+            .outerjoin(PlaylistAndTrackPair, PlaylistAndTrackPair.playlist_id == self._collection.id)
+            .outerjoin(Tracks, Tracks.id == PlaylistAndTrackPair.track_id)
             .where(self._collection.id == playlist_id)
+            .group_by(self._collection.id, Programs.duration)
         )
 
-        playlist = await session.scalar(query)
+        row = (await session.execute(query)).mappings().one_or_none()
 
-        if not playlist:
+        if row is None:
             raise NotFound(message=f"Playlist with id {playlist_id} not found")
 
-        return PlaylistSchema.model_validate(obj=playlist)
-
-    async def create_playlist(
-        self,
-        session: AsyncSession,
-        playlist: PlaylistCreateUpdateSchema,
-    ) -> PlaylistSchema:
-        query = (
-            insert(self._collection)
-            .values(playlist.model_dump())
-            .returning(self._collection)
-        )
-
-        program = await session.scalar(select(Programs.id).where(self._collection.program_id == Programs.id))
-        if not program:
-            raise ForeignKeyViolationError(message=f"Program with id {playlist.program_id} not found")
-
-        try:
-            created_playlist = await session.scalar(query)
-            await session.flush()
-        except IntegrityError as error:
-            raise AlreadyExists(message="Playlist with the given details already exists")
+        return PlaylistStatsSchema.model_validate(dict(row))
 
-        return PlaylistSchema.model_validate(obj=created_playlist)
-
-    async def update_playlist(
+    async def delete_playlist_cascade(
         self,
         session: AsyncSession,
         playlist_id: int,
-        playlist: PlaylistCreateUpdateSchema,
-    ) -> PlaylistSchema:
-        query = (
-            update(self._collection)
+    ) -> dict[str, int]:
+        locked = await session.scalar(
+            select(self._collection.id)
             .where(self._collection.id == playlist_id)
-            .values(playlist.model_dump())
-            .returning(self._collection)
+            .with_for_update()
         )
-        
-        program = await session.scalar(select(Programs.id).where(self._collection.program_id == Programs.id))
-        if not program:
-            raise ForeignKeyViolationError(message=f"Program with id {playlist.program_id} not found")
-        
-        updated_playlist = await session.scalar(query)
-
-        if not updated_playlist:
+        if not locked:
             raise NotFound(message=f"Playlist with id {playlist_id} not found")
 
-        return PlaylistSchema.model_validate(obj=updated_playlist)
-
-    async def delete_playlist(
-        self,
-        session: AsyncSession,
-        playlist_id: int
-    ) -> None:
-        query = delete(self._collection).where(self._collection.id == playlist_id)
-
-        result = await session.execute(query)
+        pairs = await session.execute(
+            delete(PlaylistAndTrackPair).where(PlaylistAndTrackPair.playlist_id == playlist_id)
+        )
+        playlists = await session.execute(
+            delete(self._collection).where(self._collection.id == playlist_id)
+        )
 
-        if not result.rowcount:
-            raise NotFound(message=f"Playlist with id {playlist_id} not found")
+        return {"playlist_and_track_pair": pairs.rowcount, "playlists": playlists.rowcount}
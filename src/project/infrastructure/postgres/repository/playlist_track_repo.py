@@ -1,117 +1,306 @@
+from datetime import date, datetime, timedelta
 from typing import Type
+
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update, delete, true
-from sqlalchemy.exc import IntegrityError, InterfaceError
+from sqlalchemy import Interval, Select, cast, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+
+from project.core.config import settings
+from project.infrastructure.postgres.models import PlaylistAndTrackPair, Playlists, Programs, Tracks
+from project.infrastructure.postgres.repository.base import BaseRepository
+from project.schemas.models import PlaylistAndTrackPairSchema
+from project.core.exceptions import AlreadyExists, Error, NotFound
+
 
-from project.infrastructure.postgres.models import PlaylistAndTrackPair, Playlists, Tracks
-from project.schemas.models import PlaylistAndTrackPairCreateUpdateSchema, PlaylistAndTrackPairSchema
-from project.core.exceptions import ForeignKeyViolationError, NotFound, AlreadyExists
+# Шаг между соседними позициями: около десяти перемещений в одно и то же место
+# обходятся обновлением одной строки, затем плейлист перенумеровывается.
+POSITION_GAP = 1024
 
 
-class PlaylistAndTrackPairRepository:
+class PlaylistAndTrackPairRepository(BaseRepository[PlaylistAndTrackPair, PlaylistAndTrackPairSchema]):
     _collection: Type[PlaylistAndTrackPair] = PlaylistAndTrackPair
+    _schema = PlaylistAndTrackPairSchema
+    _entity_name = "Pair"
+    _foreign_keys = {
+        "playlist_id": (Playlists, "Playlist"),
+        "track_id": (Tracks, "Track"),
+    }
+
+    def _insert_values(self, dto: BaseModel) -> dict:
+        # Новая пара встаёт в конец плейлиста.
+        last_position = (
+            select(func.coalesce(func.max(self._collection.position), 0))
+            .where(self._collection.playlist_id == dto.playlist_id)
+            .scalar_subquery()
+        )
+        return {**dto.model_dump(), "position": last_position + POSITION_GAP}
 
-    async def check_connection(
+    async def create(
         self,
         session: AsyncSession,
-    ) -> bool:
-        query = select(true())
+        dto: BaseModel,
+    ) -> PlaylistAndTrackPairSchema:
+        # Без блокировки параллельные добавления видят одну и ту же длительность и позицию конца плейлиста
+        # и вместе переполняют слот. Отсутствующий плейлист отвергнет проверка внешних ключей.
+        await self._lock_playlist(session=session, playlist_id=dto.playlist_id)
+
+        if not settings.PLAYLIST_ENFORCE_DURATION:
+            return await super().create(session=session, dto=dto)
+
+        # Проверка длительности встроена в сам INSERT ... SELECT ... WHERE: лишнего запроса нет.
+        playlist_duration = (
+            select(func.coalesce(func.sum(cast(Tracks.duration, Interval)), literal(timedelta(0), Interval)))
+            .join(self._collection, self._collection.track_id == Tracks.id)
+            .where(self._collection.playlist_id == dto.playlist_id)
+            .scalar_subquery()
+        )
+        track_duration = select(cast(Tracks.duration, Interval)).where(Tracks.id == dto.track_id).scalar_subquery()
+        slot_duration = (
+            select(cast(Programs.duration, Interval))
+            .join(Playlists, Playlists.program_id == Programs.id)
+            .where(Playlists.id == dto.playlist_id)
+            .scalar_subquery()
+        )
+
+        values = self._insert_values(dto)
+        query = (
+            insert(self._collection)
+            .from_select(
+                list(values),
+                select(*(value if key == "position" else literal(value) for key, value in values.items()))
+                .where(playlist_duration + track_duration <= slot_duration),
+            )
+            .returning(self._collection)
+        )
+
+        await self._check_foreign_keys(session=session, dto=dto)
 
         try:
-            return await session.scalar(query)
-        except (Exception, InterfaceError):
-            return False
+            created = await session.scalar(query)
+            await session.flush()
+        except IntegrityError:
+            raise AlreadyExists(message=f"{self._entity_name} with the given details already exists")
+
+        if created is None:
+            raise Error(
+                message=f"Track with id {dto.track_id} does not fit into the program slot of playlist {dto.playlist_id}"
+            )
 
-    async def get_all_pairs(
+        return self._schema.model_validate(obj=created)
+
+    async def update(
         self,
         session: AsyncSession,
-    ):
-        query = select(self._collection)
+        entity_id: int,
+        dto: BaseModel,
+        expected_version: datetime | None = None,
+    ) -> PlaylistAndTrackPairSchema:
+        source_playlist_id = await session.scalar(
+            select(self._collection.playlist_id).where(self._collection.id == entity_id)
+        )
+        # Плейлисты блокируются по возрастанию id: встречные переносы не взаимоблокируются.
+        for playlist_id in sorted({dto.playlist_id, source_playlist_id or dto.playlist_id}):
+            await self._lock_playlist(session=session, playlist_id=playlist_id)
+
+        updated = await super().update(
+            session=session,
+            entity_id=entity_id,
+            dto=dto,
+            expected_version=expected_version,
+        )
+
+        # Перенесённая пара, как и новая, встаёт в конец плейлиста: старая позиция там ничего не значит.
+        if source_playlist_id != dto.playlist_id:
+            last_position = (
+                select(func.coalesce(func.max(self._collection.position), 0))
+                .where(self._collection.playlist_id == dto.playlist_id, self._collection.id != entity_id)
+                .scalar_subquery()
+            )
+            moved = await session.scalar(
+                update(self._collection)
+                .where(self._collection.id == entity_id)
+                .values(position=last_position + POSITION_GAP)
+                .returning(self._collection)
+            )
+            updated = self._schema.model_validate(obj=moved)
 
-        pairs = await session.scalars(query)
+        # Замена трека или перенос в другой плейлист может переполнить слот так же, как добавление;
+        # проверяется уже изменённый плейлист, при ошибке транзакция откатывается.
+        if settings.PLAYLIST_ENFORCE_DURATION:
+            if not await self._fits_slot(session=session, playlist_id=dto.playlist_id):
+                raise Error(
+                    message=f"Track with id {dto.track_id} does not fit into the program slot of playlist {dto.playlist_id}"
+                )
 
-        return [PlaylistAndTrackPairSchema.model_validate(obj=pair) for pair in pairs.all()]
+        return updated
 
-    async def get_pair_by_id(
+    async def get_playlist_order(
         self,
         session: AsyncSession,
-        pair_id: int,
-    ) -> PlaylistAndTrackPairSchema:
+        playlist_id: int,
+    ) -> list[PlaylistAndTrackPairSchema]:
         query = (
             select(self._collection)
-            .where(self._collection.id == pair_id)
+            .where(self._collection.playlist_id == playlist_id)
+            .order_by(self._collection.position, self._collection.id)
         )
 
-        pair = await session.scalar(query)
+        rows = await session.scalars(query)
 
-        if not pair:
-            raise NotFound(message=f"Pair with id {pair_id} not found")
+        return [self._schema.model_validate(obj=row) for row in rows.all()]
 
-        return PlaylistAndTrackPairSchema.model_validate(obj=pair)
+    def export_query(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Select:
+        """Пары вместе с датой и программой плейлиста, в порядке воспроизведения."""
+        query = (
+            select(
+                *self._collection.__table__.columns,
+                Playlists.program_id,
+                Playlists.playlist_date,
+                Playlists.airtime,
+            )
+            .join(Playlists, Playlists.id == self._collection.playlist_id)
+            .order_by(Playlists.playlist_date, Playlists.airtime, self._collection.playlist_id, self._collection.position)
+        )
+        if date_from is not None:
+            query = query.where(Playlists.playlist_date >= date_from)
+        if date_to is not None:
+            query = query.where(Playlists.playlist_date <= date_to)
+        return query
 
-    async def create_pair(
+    async def move_pair(
         self,
         session: AsyncSession,
-        pair: PlaylistAndTrackPairCreateUpdateSchema,
-    ) -> PlaylistAndTrackPairSchema:
-        query = (
-            insert(self._collection)
-            .values(pair.model_dump())
-            .returning(self._collection)
+        playlist_id: int,
+        pair_id: int,
+        after_pair_id: int | None,
+    ) -> list[PlaylistAndTrackPairSchema]:
+        """Ставит пару сразу после after_pair_id (в начало, если он не задан)."""
+        # Блокировка плейлиста упорядочивает параллельные перестановки в нём.
+        if not await self._lock_playlist(session=session, playlist_id=playlist_id):
+            raise NotFound(message=f"Playlist with id {playlist_id} not found")
+
+        await self._get_position(session=session, playlist_id=playlist_id, pair_id=pair_id)
+
+        if after_pair_id != pair_id:
+            position = await self._position_after(session, playlist_id, pair_id, after_pair_id)
+            if position is None:
+                await self._renumber(session=session, playlist_id=playlist_id)
+                position = await self._position_after(session, playlist_id, pair_id, after_pair_id)
+
+            await session.execute(
+                update(self._collection)
+                .where(self._collection.id == pair_id)
+                .values(position=position)
+            )
+
+        return await self.get_playlist_order(session=session, playlist_id=playlist_id)
+
+    async def _lock_playlist(
+        self,
+        session: AsyncSession,
+        playlist_id: int,
+    ) -> bool:
+        """Блокирует строку плейлиста до конца транзакции; False, если плейлиста нет."""
+        locked = await session.scalar(
+            select(Playlists.id)
+            .where(Playlists.id == playlist_id)
+            .with_for_update()
         )
 
-        playlist = await session.scalar(select(Playlists.id).where(self._collection.playlist_id == Playlists.id))
-        if not playlist:
-            raise ForeignKeyViolationError(message=f"Playlist with id {pair.playlist_id} not found")
-        
-        track = await session.scalar(select(Tracks.id).where(self._collection.track_id == Tracks.id))
-        if not track:
-            raise ForeignKeyViolationError(message=f"Track with id {pair.track_id} not found")
+        return locked is not None
 
-        try:
-            created_pair = await session.scalar(query)
-            await session.flush()
-        except IntegrityError as error:
-            raise AlreadyExists(message="Pair with the given details already exists")
+    async def _fits_slot(
+        self,
+        session: AsyncSession,
+        playlist_id: int,
+    ) -> bool:
+        playlist_duration = (
+            select(func.coalesce(func.sum(cast(Tracks.duration, Interval)), literal(timedelta(0), Interval)))
+            .join(self._collection, self._collection.track_id == Tracks.id)
+            .where(self._collection.playlist_id == playlist_id)
+            .scalar_subquery()
+        )
+        query = (
+            select(playlist_duration <= cast(Programs.duration, Interval))
+            .join(Playlists, Playlists.program_id == Programs.id)
+            .where(Playlists.id == playlist_id)
+        )
 
-        return PlaylistAndTrackPairSchema.model_validate(obj=created_pair)
+        return bool(await session.scalar(query))
 
-    async def update_pair(
+    async def _get_position(
         self,
         session: AsyncSession,
+        playlist_id: int,
         pair_id: int,
-        pair: PlaylistAndTrackPairCreateUpdateSchema,
-    ) -> PlaylistAndTrackPairSchema:
-        query = (
-            update(self._collection)
-            .where(self._collection.id == pair_id)
-            .values(pair.model_dump())
-            .returning(self._collection)
+    ) -> int:
+        position = await session.scalar(
+            select(self._collection.position)
+            .where(self._collection.id == pair_id, self._collection.playlist_id == playlist_id)
         )
 
-        playlist = await session.scalar(select(Playlists.id).where(self._collection.playlist_id == Playlists.id))
-        if not playlist:
-            raise ForeignKeyViolationError(message=f"Playlist with id {pair.playlist_id} not found")
-        
-        track = await session.scalar(select(Tracks.id).where(self._collection.track_id == Tracks.id))
-        if not track:
-            raise ForeignKeyViolationError(message=f"Track with id {pair.track_id} not found")
+        if position is None:
+            raise NotFound(message=f"Pair with id {pair_id} not found in playlist {playlist_id}")
 
-        updated_pair = await session.scalar(query)
+        return position
+
+    async def _position_after(
+        self,
+        session: AsyncSession,
+        playlist_id: int,
+        pair_id: int,
+        after_pair_id: int | None,
+    ) -> int | None:
+        """Свободная позиция между after_pair_id и следующей парой; None, если промежутка не осталось."""
+        lower = None
+        if after_pair_id is not None:
+            lower = await self._get_position(session=session, playlist_id=playlist_id, pair_id=after_pair_id)
 
-        if not updated_pair:
-            raise NotFound(message=f"Pair with id {pair_id} not found")
+        # Соседи с той же позицией тоже считаются: равные позиции не дают места для вставки.
+        upper_query = (
+            select(func.min(self._collection.position))
+            .where(
+                self._collection.playlist_id == playlist_id,
+                self._collection.id.not_in([pair_id, after_pair_id or pair_id]),
+            )
+        )
+        if lower is not None:
+            upper_query = upper_query.where(self._collection.position >= lower)
+        upper = await session.scalar(upper_query)
 
-        return PlaylistAndTrackPairSchema.model_validate(obj=updated_pair)
+        if lower is None and upper is None:
+            return POSITION_GAP
+        if lower is None:
+            return upper - POSITION_GAP
+        if upper is None:
+            return lower + POSITION_GAP
+        if upper - lower < 2:
+            return None
+        return (lower + upper) // 2
 
-    async def delete_pair(
+    async def _renumber(
         self,
         session: AsyncSession,
-        pair_id: int
+        playlist_id: int,
     ) -> None:
-        query = delete(self._collection).where(self._collection.id == pair_id)
-
-        result = await session.execute(query)
+        ordered = (
+            select(
+                self._collection.id,
+                (func.row_number().over(order_by=(self._collection.position, self._collection.id)) * POSITION_GAP)
+                .label("position"),
+            )
+            .where(self._collection.playlist_id == playlist_id)
+            .subquery()
+        )
+        query = (
+            update(self._collection)
+            .where(self._collection.id == ordered.c.id)
+            .values(position=ordered.c.position)
+        )
 
-        if not result.rowcount:
-            raise NotFound(message=f"Pair with id {pair_id} not found")
+        await session.execute(query)
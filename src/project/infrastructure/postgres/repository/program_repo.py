@@ -1,104 +1,51 @@
 from typing import Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, select, insert, update, delete, true
-from sqlalchemy.exc import IntegrityError, PendingRollbackError, InterfaceError
+from sqlalchemy import select, delete
 
-from project.infrastructure.postgres.models import Programs
-from project.schemas.models import ProgramCreateUpdateSchema, ProgramSchema
+from project.infrastructure.postgres.models import (
+    HostProgramPair,
+    PlaylistAndTrackPair,
+    Playlists,
+    Programs,
+    SongRequests,
+)
+from project.infrastructure.postgres.repository.base import BaseRepository
+from project.schemas.models import ProgramSchema
+from project.core.exceptions import NotFound
 
-from project.core.exceptions import NotFound, AlreadyExists, Error
 
-
-class ProgramsRepository:
+class ProgramsRepository(BaseRepository[Programs, ProgramSchema]):
     _collection: Type[Programs] = Programs
+    _schema = ProgramSchema
+    _entity_name = "Program"
 
-    async def check_connection(
-        self,
-        session: AsyncSession,
-    ) -> bool:
-        query = select(true())
-
-        try:
-            return await session.scalar(query)
-        except (Exception, InterfaceError):
-            return False
-
-    async def get_all_programs(
-        self,
-        session: AsyncSession,
-    ):
-        query = select(self._collection)
-
-        programs = await session.scalars(query)
-
-        return [ProgramSchema.model_validate(obj=prog) for prog in programs.all()]
-
-    async def get_program_by_id(
+    async def delete_program_cascade(
         self,
         session: AsyncSession,
         program_id: int,
-    ) -> ProgramSchema:
-        query = (
-            select(self._collection)
+    ) -> dict[str, int]:
+        # Блокируем программу, чтобы параллельные вставки дочерних строк не проскочили между DELETE.
+        locked = await session.scalar(
+            select(self._collection.id)
             .where(self._collection.id == program_id)
+            .with_for_update()
         )
-
-        program = await session.scalar(query)
-
-        if not program:
-            raise NotFound(_id=program_id)
-
-        return ProgramSchema.model_validate(obj=program)
-
-    async def create_program(
-        self,
-        session: AsyncSession,
-        program: ProgramCreateUpdateSchema,
-    ) -> ProgramSchema:
-        query = (
-            insert(self._collection)
-            .values(program.model_dump())
-            .returning(self._collection)
-        )
-
-        try:
-            created_program = await session.scalar(query)
-            await session.flush()
-        except IntegrityError as error:
-            raise Error(message=repr(error))
-
-        return ProgramSchema.model_validate(obj=created_program)
-
-    async def update_program(
-        self,
-        session: AsyncSession,
-        program_id: int,
-        program: ProgramCreateUpdateSchema,
-    ) -> ProgramSchema:
-        query = (
-            update(self._collection)
-            .where(self._collection.id == program_id)
-            .values(program.model_dump())
-            .returning(self._collection)
+        if not locked:
+            raise NotFound(message=f"Program with id {program_id} not found")
+
+        program_playlists = select(Playlists.id).where(Playlists.program_id == program_id)
+        statements = (
+            ("playlist_and_track_pair", delete(PlaylistAndTrackPair).where(PlaylistAndTrackPair.playlist_id.in_(program_playlists))),
+            ("song_requests", delete(SongRequests).where(SongRequests.program_id == program_id)),
+            ("playlists", delete(Playlists).where(Playlists.program_id == program_id)),
+            ("host_program_pair", delete(HostProgramPair).where(HostProgramPair.program_id == program_id)),
+            ("programs", delete(self._collection).where(self._collection.id == program_id)),
         )
 
-        updated_program = await session.scalar(query)
-
-        if not updated_program:
-            raise NotFound(_id=program_id)
-
-        return ProgramSchema.model_validate(obj=updated_program)
-
-    async def delete_program(
-        self,
-        session: AsyncSession,
-        program_id: int
-    ) -> None:
-        query = delete(self._collection).where(self._collection.id == program_id)
-
-        result = await session.execute(query)
+        deleted = {}
+        for table, query in statements:
+            result = await session.execute(query)
+            deleted[table] = result.rowcount
 
-        if not result.rowcount:
-            raise NotFound(_id=program_id)
-        
\ No newline at end of file
+        return deleted
@@ -0,0 +1,40 @@
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import DateTime, Interval, cast, func, select
+
+from project.infrastructure.postgres.models import HostProgramPair, Hosts, Playlists, Programs
+from project.schemas.models import ScheduleSlotSchema
+
+
+class ScheduleRepository:
+    async def get_slots(
+        self,
+        session: AsyncSession,
+        date_from: date,
+        date_to: date,
+    ) -> list[ScheduleSlotSchema]:
+        """Эфирные слоты за [date_from, date_to] одним запросом по индексу (playlist_date, airtime)."""
+        starts_at = cast(Playlists.playlist_date, DateTime) + cast(Playlists.airtime, Interval)
+        hosts = func.array_remove(func.array_agg(Hosts.host_name.distinct()), None)
+
+        query = (
+            select(
+                Playlists.id.label("playlist_id"),
+                Programs.id.label("program_id"),
+                Programs.program_name,
+                starts_at.label("starts_at"),
+                (starts_at + cast(Programs.duration, Interval)).label("ends_at"),
+                hosts.label("hosts"),
+            )
+            .join(Programs, Programs.id == Playlists.program_id)
+            .outerjoin(HostProgramPair, HostProgramPair.program_id == Programs.id)
+            .outerjoin(Hosts, Hosts.id == HostProgramPair.host_id)
+            .where(Playlists.playlist_date.between(date_from, date_to))
+            .group_by(Playlists.id, Programs.id)
+            .order_by(Playlists.playlist_date, Playlists.airtime)
+        )
+
+        rows = await session.execute(query)
+
+        return [ScheduleSlotSchema.model_validate(dict(row)) for row in rows.mappings().all()]
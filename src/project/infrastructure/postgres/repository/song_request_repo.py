@@ -1,117 +1,71 @@
+from datetime import date
 from typing import Type
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update, delete, true
-from sqlalchemy.exc import IntegrityError, InterfaceError
+from sqlalchemy import Date, Select, cast, func, select
 
 from project.infrastructure.postgres.models import Programs, SongRequests, Tracks
-from project.schemas.models import SongRequestCreateUpdateSchema, SongRequestSchema
-from project.core.exceptions import ForeignKeyViolationError, NotFound, AlreadyExists
+from project.infrastructure.postgres.repository.base import BaseRepository
+from project.schemas.models import SongRequestSchema
 
 
-class SongRequestsRepository:
+class SongRequestsRepository(BaseRepository[SongRequests, SongRequestSchema]):
     _collection: Type[SongRequests] = SongRequests
-
-    async def check_connection(
-        self,
-        session: AsyncSession,
-    ) -> bool:
-        query = select(true())
-
-        try:
-            return await session.scalar(query)
-        except (Exception, InterfaceError):
-            return False
-
-    async def get_all_song_requests(
+    _schema = SongRequestSchema
+    _entity_name = "SongRequest"
+    _foreign_keys = {
+        "program_id": (Programs, "Program"),
+        "track_id": (Tracks, "Track"),
+    }
+
+    async def get_all(
         self,
         session: AsyncSession,
-    ):
-        query = select(self._collection)
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[SongRequestSchema]:
+        query = select(self._collection).order_by(self._collection.request_date, self._collection.request_time)
 
-        song_requests = await session.scalars(query)
+        rows = await session.scalars(self._filter_dates(query, date_from, date_to))
 
-        return [SongRequestSchema.model_validate(obj=sr) for sr in song_requests.all()]
+        return [self._schema.model_validate(obj=row) for row in rows.all()]
 
-    async def get_song_request_by_id(
+    def export_query(
         self,
-        session: AsyncSession,
-        song_request_id: int,
-    ) -> SongRequestSchema:
-        query = (
-            select(self._collection)
-            .where(self._collection.id == song_request_id)
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Select:
+        query = select(*self._collection.__table__.columns).order_by(
+            self._collection.request_date,
+            self._collection.request_time,
         )
+        return self._filter_dates(query, date_from, date_to)
 
-        song_request = await session.scalar(query)
-
-        if not song_request:
-            raise NotFound(message=f"SongRequest with id {song_request_id} not found")
+    def _filter_dates(self, query: Select, date_from: date | None, date_to: date | None) -> Select:
+        # Условие по request_date позволяет планировщику читать только нужные месячные секции.
+        if date_from is not None:
+            query = query.where(self._collection.request_date >= date_from)
+        if date_to is not None:
+            query = query.where(self._collection.request_date <= date_to)
+        return query
 
-        return SongRequestSchema.model_validate(obj=song_request)
-
-    async def create_song_request(
+    async def get_current_month(
         self,
         session: AsyncSession,
-        song_request: SongRequestCreateUpdateSchema,
-    ) -> SongRequestSchema:
-        query = (
-            insert(self._collection)
-            .values(song_request.model_dump())
-            .returning(self._collection)
-        )
+    ) -> date:
+        """Первое число текущего месяца по часам базы — тем же, по которым нарезаются секции."""
+        return await session.scalar(select(cast(func.date_trunc("month", func.current_date()), Date)))
 
-        program = await session.scalar(select(Programs.id).where(self._collection.program_id == Programs.id))
-        if not program:
-            raise ForeignKeyViolationError(message=f"Program with id {song_request.program_id} not found")
-        
-        track = await session.scalar(select(Tracks.id).where(self._collection.track_id == Tracks.id))
-        if not track:
-            raise ForeignKeyViolationError(message=f"Track with id {song_request.track_id} not found")
-
-        try:
-            created_song_request = await session.scalar(query)
-            await session.flush()
-        except IntegrityError as error:
-            raise AlreadyExists(message="SongRequest with the given details already exists")
-
-        return SongRequestSchema.model_validate(obj=created_song_request)
-
-    async def update_song_request(
+    async def ensure_partitions(
         self,
         session: AsyncSession,
-        song_request_id: int,
-        song_request: SongRequestCreateUpdateSchema,
-    ) -> SongRequestSchema:
-        query = (
-            update(self._collection)
-            .where(self._collection.id == song_request_id)
-            .values(song_request.model_dump())
-            .returning(self._collection)
-        )
-
-        program = await session.scalar(select(Programs.id).where(self._collection.program_id == Programs.id))
-        if not program:
-            raise ForeignKeyViolationError(message=f"Program with id {song_request.program_id} not found")
-        
-        track = await session.scalar(select(Tracks.id).where(self._collection.track_id == Tracks.id))
-        if not track:
-            raise ForeignKeyViolationError(message=f"Track with id {song_request.track_id} not found")
+        months_ahead: int,
+    ) -> int:
+        return await session.scalar(select(func.ensure_song_requests_partitions(months_ahead)))
 
-        updated_song_request = await session.scalar(query)
-
-        if not updated_song_request:
-            raise NotFound(message=f"SongRequest with id {song_request_id} not found")
-
-        return SongRequestSchema.model_validate(obj=updated_song_request)
-
-    async def delete_song_request(
+    async def drop_expired_partitions(
         self,
         session: AsyncSession,
-        song_request_id: int
-    ) -> None:
-        query = delete(self._collection).where(self._collection.id == song_request_id)
-
-        result = await session.execute(query)
-
-        if not result.rowcount:
-            raise NotFound(message=f"SongRequest with id {song_request_id} not found")
+        keep_months: int,
+    ) -> int:
+        return await session.scalar(select(func.drop_song_requests_partitions(keep_months)))
@@ -0,0 +1,39 @@
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.infrastructure.postgres.models import TrackListing
+from project.schemas.models import TrackListingSchema
+
+
+class TrackListingRepository:
+    """Денормализованный список треков: таблицу track_listing ведут триггеры на tracks, artists, genres и album."""
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        limit: int,
+        after: tuple[str, int] | None = None,
+    ) -> list[TrackListingSchema]:
+        """Страница по (track_name, id) после ключа after: index-only проход по покрывающему индексу."""
+        query = (
+            select(
+                TrackListing.track_id.label("id"),
+                TrackListing.track_name,
+                TrackListing.release_date,
+                TrackListing.duration,
+                TrackListing.artist_id,
+                TrackListing.artist_name,
+                TrackListing.genre_id,
+                TrackListing.genre_name,
+                TrackListing.album_id,
+                TrackListing.album_name,
+            )
+            .order_by(TrackListing.track_name, TrackListing.track_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(TrackListing.track_name, TrackListing.track_id) > tuple_(*after))
+
+        rows = (await session.execute(query)).all()
+
+        return [TrackListingSchema.model_validate(obj=row) for row in rows]
@@ -0,0 +1,44 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, func, select
+
+from project.core.exceptions import NotFound
+from project.infrastructure.postgres.models import TrackNeighbours, Tracks
+from project.schemas.models import SimilarTrackSchema
+
+
+class TrackNeighboursRepository:
+    """Похожие треки: таблицу track_neighbours пересчитывает функция refresh_track_neighbours()."""
+
+    async def get_similar(
+        self,
+        session: AsyncSession,
+        track_id: int,
+        limit: int,
+    ) -> list[SimilarTrackSchema]:
+        # Соседи лежат подряд в первичном ключе (track_id, rank): один проход по индексу.
+        query = (
+            select(Tracks.id, Tracks.track_name, Tracks.artist_id, TrackNeighbours.score)
+            .join(Tracks, Tracks.id == TrackNeighbours.neighbour_id)
+            .where(TrackNeighbours.track_id == track_id)
+            .order_by(TrackNeighbours.rank)
+            .limit(limit)
+        )
+
+        rows = (await session.execute(query)).all()
+        if not rows and not await session.scalar(select(exists().where(Tracks.id == track_id))):
+            raise NotFound(message=f"Track with id {track_id} not found")
+
+        return [SimilarTrackSchema.model_validate(obj=row) for row in rows]
+
+    async def refresh(
+        self,
+        session: AsyncSession,
+        top_k: int,
+        max_baskets: int,
+        rebuild: bool = False,
+    ) -> int:
+        """Пересчитывает соседей треков из max_baskets помеченных корзин и max_baskets помеченных треков.
+
+        Возвращает число взятых корзин и треков.
+        """
+        return await session.scalar(select(func.refresh_track_neighbours(top_k, max_baskets, rebuild)))
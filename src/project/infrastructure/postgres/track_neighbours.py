@@ -0,0 +1,29 @@
+import logging
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import PostgresDatabase
+from project.infrastructure.postgres.repository.track_neighbours_repo import TrackNeighboursRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_track_neighbours(
+    database: PostgresDatabase,
+    repository: TrackNeighboursRepository,
+) -> None:
+    """Разбирает очереди изменённых корзин и треков пачками, каждая пачка — в своей транзакции."""
+    total = 0
+    while True:
+        async with database.session() as session:
+            claimed = await repository.refresh(
+                session=session,
+                top_k=settings.TRACK_NEIGHBOURS_TOP_K,
+                max_baskets=settings.TRACK_NEIGHBOURS_BATCH_BASKETS,
+            )
+        total += claimed
+        if claimed < settings.TRACK_NEIGHBOURS_BATCH_BASKETS:
+            break
+
+    if total:
+        logger.info("track neighbours: %s baskets and tracks refreshed", total)
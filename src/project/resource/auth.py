@@ -1,14 +1,39 @@
+import asyncio
+from functools import cache
+from typing import TYPE_CHECKING
+
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
+@cache
+def get_password_context() -> "CryptContext":
+    """CryptContext и проба бэкенда bcrypt откладываются до lifespan или первого обращения."""
+    from passlib.context import CryptContext
+
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    context.handler("bcrypt").get_backend()
+    return context
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_password_context().hash(password)
+
+
+# bcrypt занимает сотни миллисекунд CPU: в обработчиках хеширование уходит в пул потоков,
+# чтобы не останавливать event loop.
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.to_thread(get_password_hash, password)
@@ -1,5 +1,10 @@
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import time, date
+from datetime import time, date, datetime
+
+
+ItemT = TypeVar("ItemT")
 
 
 class ProgramCreateUpdateSchema(BaseModel):
@@ -11,6 +16,8 @@ class ProgramCreateUpdateSchema(BaseModel):
 class ProgramSchema(ProgramCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
     id: int
+    playlists_count: int | None = None
+    updated_at: datetime | None = None
 
 class HostCreateUpdateSchema(BaseModel):
     host_name: str
@@ -54,6 +61,7 @@ class ArtistCreateUpdateSchema(BaseModel):
 class ArtistSchema(ArtistCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
     id: int
+    tracks_count: int | None = None
 
 
 class TrackCreateUpdateSchema(BaseModel):
@@ -67,6 +75,40 @@ class TrackCreateUpdateSchema(BaseModel):
 class TrackSchema(TrackCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
     id: int
+    updated_at: datetime | None = None
+
+
+class TrackRequestsCountSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    track_id: int
+    requests_count: int
+
+
+class SimilarTrackSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    track_name: str
+    artist_id: int | None = None
+    score: float
+
+
+class TrackListingSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    track_name: str
+    release_date: date
+    duration: time
+    artist_id: int | None = None
+    artist_name: str | None = None
+    genre_id: int | None = None
+    genre_name: str | None = None
+    album_id: int | None = None
+    album_name: str | None = None
+
+
+class TrackListingPageSchema(BaseModel):
+    items: list[TrackListingSchema]
+    next_cursor: str | None = None
 
 
 class AlbumCreateUpdateSchema(BaseModel):
@@ -101,6 +143,15 @@ class PlaylistCreateUpdateSchema(BaseModel):
 class PlaylistSchema(PlaylistCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
     id: int
+    updated_at: datetime | None = None
+
+
+class PlaylistStatsSchema(BaseModel):
+    playlist_id: int
+    track_count: int
+    total_duration_sec: int
+    slot_duration_sec: int
+    overrun_sec: int
 
 
 class PlaylistAndTrackPairCreateUpdateSchema(BaseModel):
@@ -110,4 +161,88 @@ class PlaylistAndTrackPairCreateUpdateSchema(BaseModel):
 
 class PlaylistAndTrackPairSchema(PlaylistAndTrackPairCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
-    id: int
\ No newline at end of file
+    id: int
+    position: int | None = None
+
+
+class PlaylistTrackMoveSchema(BaseModel):
+    pair_id: int
+    after_pair_id: int | None = None
+
+
+class ChangeEventSchema(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    schema_name: str = Field(alias="schema")
+    table: str
+    op: str
+    id: int | None = None
+    program_id: int | None = None
+
+
+
+class JobSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: str
+    payload: dict
+    attempts: int
+    result: dict | None = None
+    last_error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+
+class CascadeDeleteSchema(BaseModel):
+    deleted: dict[str, int]
+
+
+class CatalogImportSchema(BaseModel):
+    merged: dict[str, int]
+
+
+class ProfilingConfigSchema(BaseModel):
+    endpoint: str
+    sample_rate: float = Field(default=0.1, gt=0, le=1)
+    interval_ms: float = Field(default=5.0, ge=1, le=1000)
+    trace_allocations: bool = False
+
+
+class ProfilingStatusSchema(BaseModel):
+    endpoint: str | None
+    sample_rate: float
+    interval_ms: float
+    trace_allocations: bool
+    profiled_requests: int
+    samples: int
+
+
+
+class MultiGetSchema(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    missing: list[int]
+
+
+
+class ScheduleSlotSchema(BaseModel):
+    playlist_id: int
+    program_id: int
+    program_name: str
+    starts_at: datetime
+    ends_at: datetime
+    hosts: list[str]
+
+
+class ScheduleNowSchema(BaseModel):
+    current: ScheduleSlotSchema | None = None
+    next: ScheduleSlotSchema | None = None
+
+
+class IdempotencyRecordSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    request_hash: str
+    status_code: int | None = None
+    response: dict | None = None